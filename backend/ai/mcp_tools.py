@@ -2,7 +2,11 @@
 
 import os
 import json
+import time
+import uuid
 import logging
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Optional
 from datetime import datetime, timezone
 from langchain_core.tools import tool
@@ -17,6 +21,7 @@ try:
     # Add parent directory to path to allow imports
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from mcp_handlers import JiraHandler, FreshserviceHandler, RefreshHandler
+    from mcp_handlers import shared_datasets
     from logger_config import setup_logging
 except ImportError as e:
     print(f"Warning: MCP handlers not available ({e}). Tools will return mock data.")
@@ -29,21 +34,171 @@ logger = None
 jira_handler = None
 freshservice_handler = None
 refresh_handler = None
-
-def initialize_handlers():
-    """Initialize MCP handlers if not already initialized."""
-    global logger, jira_handler, freshservice_handler, refresh_handler
+refresher_election = None
+
+def _shared_datasets():
+    """Elect the refresher and describe both shared datasets (multi-worker mode only)."""
+    global refresher_election
+    from data.jira_issues import issues_table, issues_types_mapper
+    from freshservice import tickets_table
+    from mcp_handlers.rollups import FRESHSERVICE_ROLLUPS, JIRA_ROLLUPS
+
+    directory = shared_datasets.SHARED_DATASET_DIR
+    os.makedirs(directory, exist_ok=True)
+    refresher_election = shared_datasets.RefresherElection(directory)
+    refresher_election.try_acquire()
+    return (
+        shared_datasets.SharedDataset(
+            directory, "jira", refresher_election, issues_table, issues_types_mapper, rollups=JIRA_ROLLUPS
+        ),
+        shared_datasets.SharedDataset(
+            directory, "freshservice", refresher_election, tickets_table, rollups=FRESHSERVICE_ROLLUPS
+        ),
+    )
+
+
+def create_handlers(load_caches: bool = True):
+    """Create the data handlers if not already created.
+
+    With ``load_caches=False`` the handlers start empty and each one's
+    ``load_cache()`` is left to the caller (startup runs them concurrently).
+    """
+    global logger, jira_handler, freshservice_handler
 
     if logger is None and JiraHandler is not None:
         logger = setup_logging("tamkeen.tools", use_color=False)
-        jira_handler = JiraHandler(logger)
-        freshservice_handler = FreshserviceHandler(logger)
-        refresh_handler = RefreshHandler(
-            logger, jira_handler, freshservice_handler, queue_initial_load=True
-        )
+        jira_shared, freshservice_shared = _shared_datasets() if shared_datasets.shared_datasets_enabled() else (None, None)
+        jira_handler = JiraHandler(logger, load_cache=load_caches, shared=jira_shared)
+        freshservice_handler = FreshserviceHandler(logger, load_cache=load_caches, shared=freshservice_shared)
+
+
+def start_refresh_workers():
+    """Start the background refresh workers once the handlers exist.
+
+    With shared datasets only the elected refresher process runs them; the
+    coordinator stands in for the refresh handler in every worker.
+    """
+    global refresh_handler
+
+    if refresh_handler is None and jira_handler is not None:
+        if refresher_election is not None:
+            refresh_handler = shared_datasets.SharedRefreshCoordinator(
+                logger, jira_handler, freshservice_handler, refresher_election
+            )
+        else:
+            refresh_handler = RefreshHandler(
+                logger, jira_handler, freshservice_handler, queue_initial_load=True
+            )
 
-# Initialize on module import
-initialize_handlers()
+
+def initialize_handlers():
+    """Initialize MCP handlers if not already initialized."""
+    create_handlers()
+    start_refresh_workers()
+
+# Result shaping: budgets that keep query results small enough for the model's context
+TOOL_RESULT_MAX_ROWS = int(os.getenv("TOOL_RESULT_MAX_ROWS", "200"))
+TOOL_RESULT_MAX_BYTES = int(os.getenv("TOOL_RESULT_MAX_BYTES", "20000"))
+TOOL_RESULT_MAX_CELL_CHARS = int(os.getenv("TOOL_RESULT_MAX_CELL_CHARS", "500"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("TOOL_RESULT_CACHE_TTL", "900"))
+RESULT_CACHE_SIZE = 64
+
+# Full results of truncated queries, kept briefly so the model can page through them
+_result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _cache_result(result_df) -> str:
+    """Keep a full query result for paging and return its result id."""
+    result_id = uuid.uuid4().hex[:12]
+    now = time.monotonic()
+    with _result_cache_lock:
+        for key in [k for k, (expires, _) in _result_cache.items() if expires <= now]:
+            del _result_cache[key]
+        _result_cache[result_id] = (now + RESULT_CACHE_TTL_SECONDS, result_df)
+        while len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    return result_id
+
+
+def _cached_result(result_id: str):
+    """Return a cached query result, or None if it expired or never existed."""
+    with _result_cache_lock:
+        entry = _result_cache.get(result_id)
+        if entry is None or entry[0] <= time.monotonic():
+            _result_cache.pop(result_id, None)
+            return None
+        return entry[1]
+
+
+def _clip_cell(value: Any, max_chars: Optional[int] = None) -> Any:
+    """Shorten long text cells so a single row cannot exhaust the byte budget."""
+    max_chars = TOOL_RESULT_MAX_CELL_CHARS if max_chars is None else max_chars
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "…[truncated]"
+    return value
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def shape_result(result_df, offset: int = 0, result_id: Optional[str] = None) -> str:
+    """Encode one page of a query result within the row and byte budgets.
+
+    The page is returned as column names plus row arrays, with the total row
+    count. If rows remain, the full result is cached and the payload carries a
+    result_id and next_offset for fetch_query_results. A row too wide for the
+    byte budget on its own has its text cells cut down to an even share of
+    it; if that is still not enough, no rows are returned and the model is
+    told to select fewer columns.
+    """
+    total_rows = len(result_df)
+    columns = [str(col) for col in result_df.columns]
+    page = result_df.iloc[offset:offset + TOOL_RESULT_MAX_ROWS]
+    rows = json.loads(page.to_json(orient="values", date_format="iso"))
+
+    shaped_rows = []
+    size = _json_size(columns)
+    # Even share of the budget per cell, in characters (non-ASCII text takes several bytes)
+    wide_cell_chars = max(16, (TOOL_RESULT_MAX_BYTES - size) // max(1, len(columns)) // 3)
+    for row in rows:
+        row = [_clip_cell(value) for value in row]
+        row_size = _json_size(row) + 1
+        if not shaped_rows and size + row_size > TOOL_RESULT_MAX_BYTES:
+            row = [_clip_cell(value, wide_cell_chars) for value in row]
+            row_size = _json_size(row) + 1
+        if size + row_size > TOOL_RESULT_MAX_BYTES:
+            break
+        shaped_rows.append(row)
+        size += row_size
+
+    if rows and not shaped_rows:
+        return json.dumps({
+            "error": (
+                f"A single row of this result exceeds the {TOOL_RESULT_MAX_BYTES}-byte result budget. "
+                "Select fewer columns (use describe_dataset for column names) instead of SELECT *."
+            ),
+            "column_count": len(columns),
+            "total_rows": total_rows,
+        })
+
+    next_offset = offset + len(shaped_rows)
+    payload = {
+        "columns": columns,
+        "rows": shaped_rows,
+        "total_rows": total_rows,
+        "offset": offset,
+        "returned_rows": len(shaped_rows),
+    }
+    if next_offset < total_rows:
+        payload["result_id"] = result_id or _cache_result(result_df)
+        payload["next_offset"] = next_offset
+        payload["note"] = (
+            "Result truncated. Call fetch_query_results with this result_id and next_offset "
+            "for more rows, or refine the query (aggregate, filter, select fewer columns)."
+        )
+    return json.dumps(payload, ensure_ascii=False, default=str)
 
 @tool
 def force_refresh_fresh_service() -> str:
@@ -123,11 +278,127 @@ def get_single_ticket(ticket_id: str) -> Dict[str, Any]:
 
     return freshservice_handler.get_single_ticket(ticket_id)
 
+@tool
+def describe_dataset(dataset: str) -> str:
+    """Describe the columns of a dataset before writing SQL against it.
+
+    Lists every column of the 'df' table with its type (text, integer, real,
+    boolean, timestamp or list), null ratio and number of distinct values,
+    the most common values of low-cardinality columns, min/max of numeric and
+    timestamp columns and an example of free-text columns, plus notes on how
+    to query each type. Use it instead of exploratory SELECT * queries to get
+    exact column names and filter values.
+
+    Args:
+        dataset: "jira" (query_jira_demands) or "freshservice" (query_fresh_service_tickets)
+
+    Returns:
+        JSON object with rows, columns, empty_columns and notes
+    """
+    logger.info(f"[TOOL] describe_dataset called for {dataset}")
+
+    handlers = {"jira": jira_handler, "freshservice": freshservice_handler}
+    key = dataset.strip().lower()
+    if key not in handlers:
+        return json.dumps({"error": f"Unknown dataset {dataset!r}. Use one of: {', '.join(handlers)}."})
+    if handlers[key] is None:
+        return json.dumps({"error": f"{dataset} handler not available"})
+    return json.dumps(handlers[key].describe_dataset(), ensure_ascii=False, default=str)
+
+@tool
+def list_rollups(dataset: str) -> str:
+    """List the pre-aggregated rollup tables of a dataset.
+
+    Rollups are rebuilt with every refresh and hold row counts grouped by
+    common dimensions (status, priority, assignee/responder, department) and
+    by week or month. Query them by name with the same tool as the dataset
+    instead of 'df', e.g. SELECT week, SUM(tickets) FROM tickets_created_weekly
+    GROUP BY week. Sum the count column when aggregating over fewer
+    dimensions than the table has. Use df when a question needs a filter or
+    dimension a rollup does not have.
+
+    Args:
+        dataset: "jira" (query_jira_demands) or "freshservice" (query_fresh_service_tickets)
+
+    Returns:
+        JSON object with a rollups list of table, description, columns and rows
+    """
+    logger.info(f"[TOOL] list_rollups called for {dataset}")
+
+    handlers = {"jira": jira_handler, "freshservice": freshservice_handler}
+    key = dataset.strip().lower()
+    if key not in handlers:
+        return json.dumps({"error": f"Unknown dataset {dataset!r}. Use one of: {', '.join(handlers)}."})
+    if handlers[key] is None:
+        return json.dumps({"error": f"{dataset} handler not available"})
+    return json.dumps(handlers[key].list_rollups(), ensure_ascii=False)
+
+@tool
+def search_tickets(query: str, filters: Optional[Dict[str, Any]] = None, top_k: int = 10) -> str:
+    """Find Freshservice tickets about a topic with full-text search.
+
+    Ranks tickets by BM25 relevance of their subject and description to the
+    query words (any word may match; tickets matching more and rarer words
+    rank higher). Use it instead of LIKE '%word%' queries to find tickets
+    about a topic, then query_fresh_service_tickets for exact counts.
+
+    Args:
+        query: Free text, e.g. "vpn connection drops"
+        filters: Optional column -> value or list of values, matched case-insensitively,
+            e.g. {"status": ["Open", "Pending"], "department.name": "Finance"}
+        top_k: Number of tickets to return (default 10, at most 50)
+
+    Returns:
+        JSON object with total_matches and results (ticket_id, score, subject, status,
+        priority, responder and a snippet with matched words in [brackets])
+    """
+    logger.info(f"[TOOL] search_tickets called with query: {query!r}, filters: {filters}")
+
+    if freshservice_handler is None:
+        return json.dumps({"error": "Freshservice handler not available"})
+    try:
+        return json.dumps(freshservice_handler.search(query, filters, top_k), ensure_ascii=False, default=str)
+    except Exception as e:
+        logger.error(f"[TOOL] Freshservice search error: {e}")
+        return json.dumps({"error": str(e)})
+
+@tool
+def search_demands(query: str, filters: Optional[Dict[str, Any]] = None, top_k: int = 10) -> str:
+    """Find JIRA demands about a topic with full-text search.
+
+    Ranks demands by BM25 relevance of their summary and description to the
+    query words (any word may match; demands matching more and rarer words
+    rank higher). Use it instead of LIKE '%word%' queries to find demands
+    about a topic, then query_jira_demands for exact counts.
+
+    Args:
+        query: Free text, e.g. "payment gateway integration"
+        filters: Optional column (name or field id) -> value or list of values, matched
+            case-insensitively, e.g. {"status": "In Progress", "priority": ["High", "Highest"]}
+        top_k: Number of demands to return (default 10, at most 50)
+
+    Returns:
+        JSON object with total_matches and results (Jira key, score, summary, status,
+        priority, assignee and a snippet with matched words in [brackets])
+    """
+    logger.info(f"[TOOL] search_demands called with query: {query!r}, filters: {filters}")
+
+    if jira_handler is None:
+        return json.dumps({"error": "JIRA handler not available"})
+    try:
+        return json.dumps(jira_handler.search(query, filters, top_k), ensure_ascii=False, default=str)
+    except Exception as e:
+        logger.error(f"[TOOL] JIRA search error: {e}")
+        return json.dumps({"error": str(e)})
+
 @tool
 def query_fresh_service_tickets(excomai_sql: str) -> str:
     """Execute a SQL query on the Freshservice tickets dataframe.
 
-    IMPORTANT: The dataframe is referenced as 'df' in SQL queries.
+    IMPORTANT: The dataframe is referenced as 'df' in SQL queries. Call
+    describe_dataset("freshservice") first for exact column names and values.
+    Counts by status, responder, department or week are faster from the
+    rollup tables listed by list_rollups("freshservice").
 
     Example queries:
     - Count all tickets: SELECT COUNT(*) FROM df
@@ -135,11 +406,14 @@ def query_fresh_service_tickets(excomai_sql: str) -> str:
     - Filter by status: SELECT * FROM df WHERE status = 'Open'
     - Get specific columns: SELECT ticket_id, subject, status FROM df
 
+    Large results are truncated to a page; use the returned result_id with
+    fetch_query_results to read further rows.
+
     Args:
         excomai_sql: SQL query string using 'df' as the table name
 
     Returns:
-        JSON string containing query results
+        JSON object with columns, rows, total_rows and, if truncated, result_id and next_offset
     """
     logger.info(f"[TOOL] query_fresh_service_tickets called with SQL: {excomai_sql}")
 
@@ -148,7 +422,8 @@ def query_fresh_service_tickets(excomai_sql: str) -> str:
         return json.dumps({"error": "Freshservice handler not available"})
 
     try:
-        result = freshservice_handler.query_tickets(excomai_sql)
+        result_df = freshservice_handler.run_query(excomai_sql)
+        result = "[]" if result_df is None else shape_result(result_df)
         logger.info(f"[TOOL] Freshservice query returned {len(result)} chars")
         logger.debug(f"[TOOL] Result preview: {result[:200]}..." if len(result) > 200 else f"[TOOL] Result: {result}")
         return result
@@ -160,19 +435,25 @@ def query_fresh_service_tickets(excomai_sql: str) -> str:
 def query_jira_demands(excomai_sql: str) -> str:
     """Execute a SQL query on the JIRA demands dataframe.
 
-    IMPORTANT: The dataframe is referenced as 'df' in SQL queries.
+    IMPORTANT: The dataframe is referenced as 'df' in SQL queries. Columns are
+    named "Field name (field id)"; call describe_dataset("jira") first for
+    exact column names and values. Counts by status, priority, assignee or
+    month are faster from the rollup tables listed by list_rollups("jira").
 
     Example queries:
     - Count all demands: SELECT COUNT(*) FROM df
-    - Get recent demands: SELECT * FROM df ORDER BY created DESC LIMIT 10
-    - Filter by status: SELECT * FROM df WHERE status = 'In Progress'
-    - Get specific columns: SELECT key, summary, status, priority FROM df
+    - Get recent demands: SELECT Jira, "Summary (summary)" FROM df ORDER BY "Created (created)" DESC LIMIT 10
+    - Filter by status: SELECT Jira FROM df WHERE "Status (status)" = 'In Progress'
+    - Get specific columns: SELECT Jira, "Summary (summary)", "Status (status)", "Priority (priority)" FROM df
+
+    Large results are truncated to a page; use the returned result_id with
+    fetch_query_results to read further rows.
 
     Args:
         excomai_sql: SQL query string using 'df' as the table name
 
     Returns:
-        JSON string containing query results
+        JSON object with columns, rows, total_rows and, if truncated, result_id and next_offset
     """
     logger.info(f"[TOOL] query_jira_demands called with SQL: {excomai_sql}")
 
@@ -181,7 +462,8 @@ def query_jira_demands(excomai_sql: str) -> str:
         return json.dumps({"error": "JIRA handler not available"})
 
     try:
-        result = jira_handler.query_demands(excomai_sql)
+        result_df = jira_handler.run_query(excomai_sql)
+        result = "[]" if result_df is None else shape_result(result_df)
         logger.info(f"[TOOL] JIRA query returned {len(result)} chars")
         logger.debug(f"[TOOL] Result preview: {result[:200]}..." if len(result) > 200 else f"[TOOL] Result: {result}")
         return result
@@ -189,6 +471,28 @@ def query_jira_demands(excomai_sql: str) -> str:
         logger.error(f"[TOOL] JIRA query error: {e}")
         return json.dumps({"error": str(e)})
 
+@tool
+def fetch_query_results(result_id: str, offset: int) -> str:
+    """Fetch more rows of a truncated query result.
+
+    Use the result_id and next_offset returned by query_fresh_service_tickets
+    or query_jira_demands. Results expire after a few minutes; re-run the
+    query if the result_id is no longer available.
+
+    Args:
+        result_id: Identifier returned with the truncated result
+        offset: Row offset to continue from (next_offset of the previous page)
+
+    Returns:
+        JSON object with the next page of rows, in the same format as the query tools
+    """
+    logger.info(f"[TOOL] fetch_query_results called for {result_id} at offset {offset}")
+
+    result_df = _cached_result(result_id)
+    if result_df is None:
+        return json.dumps({"error": f"Result {result_id} not found or expired. Re-run the query."})
+    return shape_result(result_df, offset=max(0, offset), result_id=result_id)
+
 @tool
 def get_current_time() -> str:
     """Retrieve the current Coordinated Universal Time (UTC).
@@ -209,7 +513,12 @@ def get_all_mcp_tools():
         force_refresh_jira,
         get_data_status,
         get_single_ticket,
+        describe_dataset,
+        list_rollups,
+        search_tickets,
+        search_demands,
         query_fresh_service_tickets,
         query_jira_demands,
+        fetch_query_results,
         get_current_time
     ]
\ No newline at end of file
@@ -4,7 +4,20 @@ from typing import List, Optional
 class ChatRequest(BaseModel):
     message: str
     conversation_history: Optional[List[dict]] = []
+    trace: Optional[bool] = False  # Return a timing trace of the request (also via the X-Trace header)
 
 class ChatResponse(BaseModel):
     response: str
-    timestamp: str
\ No newline at end of file
+    timestamp: str
+    trace: Optional[dict] = None
+
+class ChatServiceError(Exception):
+    """A chat request failed inside the AI service.
+
+    ``reply`` is the apology shown to the user in place of an answer; the
+    route still sends it, but records the request as failed.
+    """
+
+    def __init__(self, reply: str, error: str):
+        super().__init__(error)
+        self.reply = reply
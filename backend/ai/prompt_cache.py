@@ -0,0 +1,131 @@
+"""Anthropic prompt-caching breakpoints and cache usage accounting.
+
+A chat round re-sends the tool schemas, the system prompt and the whole
+conversation so far. Anthropic caches a request prefix up to each block marked
+with ``cache_control``, in the order tools -> system -> messages, so three
+breakpoints cover it: the last tool, the system prompt and the newest message.
+The message breakpoint moves forward every round; the next round then reads
+the previous round's prefix from the cache and only pays for what was added
+since (the model's tool calls and their results).
+
+Breakpoints are only ever applied to copies of the messages sent to the
+model, never to the conversation the service keeps.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_anthropic.chat_models import convert_to_anthropic_tool
+from langchain_core.messages import BaseMessage, SystemMessage, ToolMessage
+
+# Set PROMPT_CACHE=off to send requests without cache breakpoints
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def cached_system_message(text: str) -> SystemMessage:
+    """System message whose text block ends a cached prefix (tools + system prompt)."""
+    if not PROMPT_CACHE_ENABLED:
+        return SystemMessage(content=text)
+    return SystemMessage(content=[{"type": "text", "text": text, "cache_control": CACHE_CONTROL}])
+
+
+def cacheable_tools(tools: Sequence[Any]) -> List[Any]:
+    """Tool definitions for ``bind_tools``, with a breakpoint after the last schema."""
+    if not PROMPT_CACHE_ENABLED or not tools:
+        return list(tools)
+    schemas = [dict(convert_to_anthropic_tool(tool)) for tool in tools]
+    schemas[-1]["cache_control"] = CACHE_CONTROL
+    return schemas
+
+
+def _marked_content(message: BaseMessage) -> Optional[List[Dict[str, Any]]]:
+    """Content blocks of a message with a breakpoint on the last one, or None if it can't carry one."""
+    if isinstance(message, ToolMessage):
+        # Sent as the tool_result block itself so the marker lands on that block
+        return [{
+            "type": "tool_result",
+            "content": message.content,
+            "tool_use_id": message.tool_call_id,
+            "is_error": message.status == "error",
+            "cache_control": CACHE_CONTROL,
+        }]
+
+    content = message.content
+    if isinstance(content, str):
+        if not content.strip():
+            return None
+        return [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+
+    blocks = [{"type": "text", "text": block} if isinstance(block, str) else dict(block) for block in content]
+    # Empty text blocks are dropped before sending, so mark the last block that survives
+    for block in reversed(blocks):
+        if block.get("type") != "text" or block.get("text", "").strip():
+            block["cache_control"] = CACHE_CONTROL
+            return blocks
+    return None
+
+
+def with_cache_breakpoint(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """Copy of ``messages`` with a breakpoint at the end of the newest message that can carry one."""
+    messages = list(messages)
+    if not PROMPT_CACHE_ENABLED:
+        return messages
+
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], SystemMessage):
+            break  # Already covered by the system breakpoint
+        content = _marked_content(messages[i])
+        if content is not None:
+            messages[i] = messages[i].model_copy(update={"content": content})
+            break
+    return messages
+
+
+class CacheUsage:
+    """Token usage of one chat request, summed over its model calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def add(self, usage_metadata: Optional[Dict[str, Any]]):
+        """Add the ``usage_metadata`` of one model response (or streamed chunk)."""
+        if not usage_metadata:
+            return
+        details = usage_metadata.get("input_token_details") or {}
+        self.input_tokens += usage_metadata.get("input_tokens", 0)
+        self.output_tokens += usage_metadata.get("output_tokens", 0)
+        self.cache_read_tokens += details.get("cache_read") or 0
+        self.cache_creation_tokens += details.get("cache_creation") or 0
+
+    def add_message(self, message: Any):
+        """Add the usage of a complete model response."""
+        self.calls += 1
+        self.add(getattr(message, "usage_metadata", None))
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return self.input_tokens - self.cache_read_tokens - self.cache_creation_tokens
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "model_calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens,
+            "uncached_input_tokens": self.uncached_input_tokens,
+            "cache_hit_ratio": round(self.cache_read_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} model call(s), {self.input_tokens} input tokens "
+            f"({self.cache_read_tokens} cache hit, {self.cache_creation_tokens} cache write, "
+            f"{self.uncached_input_tokens} uncached), {self.output_tokens} output tokens"
+        )
@@ -1,13 +1,49 @@
 import asyncio
+import json
+import threading
+import time
 from datetime import datetime
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
 from fastapi.responses import StreamingResponse
-from ai.models import ChatRequest, ChatResponse
-from ai.service import AIService
+from ai.models import ChatRequest, ChatResponse, ChatServiceError
 from auth.azure_auth import get_current_user, optional_auth
+import tracing
+from metrics import CHAT_REQUESTS, CHAT_REQUEST_SECONDS, TIME_TO_FIRST_TOKEN_SECONDS
+
+# The AI service (LangChain client, tools, handlers) is built on first use or by startup,
+# so importing the routes stays cheap
+_ai_service = None
+_ai_service_lock = threading.Lock()
+
+
+def get_ai_service():
+    """Return the shared AI service, building it on first call (blocking; call from a thread)."""
+    global _ai_service
+    with _ai_service_lock:
+        if _ai_service is None:
+            from ai.service import AIService
+            _ai_service = AIService()
+        return _ai_service
+
+
+def _control_event(chunk: str) -> Optional[dict]:
+    """Return the payload of the service's ``done`` or ``error`` event, or None for any other frame."""
+    if '"done"' not in chunk and '"error"' not in chunk:
+        return None
+    try:
+        event = json.loads(chunk)
+    except ValueError:
+        return None
+    if isinstance(event, dict) and event.get("type") in ("done", "error"):
+        return event
+    return None
+
+
+async def _service():
+    """The AI service, without leaving the event loop once it has been built."""
+    return _ai_service or await asyncio.to_thread(get_ai_service)
 
-# Initialize AI service
-ai_service = AIService()
 
 # Create AI router
 ai_router = APIRouter(prefix="/api", tags=["AI"])
@@ -15,50 +51,135 @@ ai_router = APIRouter(prefix="/api", tags=["AI"])
 @ai_router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(
     request: ChatRequest,
-    current_user: dict = Depends(optional_auth)
+    current_user: dict = Depends(optional_auth),
+    x_trace: Optional[str] = Header(None)
 ):
     """Chat with AI assistant with MCP tools"""
     # Log user if authenticated
     if current_user:
         print(f"Chat request from user: {current_user.get('name', 'Unknown')}")
 
-    response_text = await ai_service.generate_response(
-        message=request.message,
-        conversation_history=request.conversation_history
-    )
+    started = time.perf_counter()
+    traced = tracing.trace_requested(request.trace, x_trace)
+    trace = tracing.start_trace("chat") if traced or tracing.TRACE_ALL else None
+    outcome = "error"
+    try:
+        ai_service = await _service()
+        response_text = await ai_service.generate_response(
+            message=request.message,
+            conversation_history=request.conversation_history
+        )
+        outcome = "ok"
+    except ChatServiceError as e:
+        # The user still gets the service's apology; the request counts as failed
+        response_text = e.reply
+        if trace is not None:
+            trace.root.set(error=str(e))
+    except Exception as e:
+        if trace is not None:
+            trace.root.set(error=str(e))
+            await asyncio.to_thread(tracing.finish_trace, trace)
+        raise
+    finally:
+        CHAT_REQUEST_SECONDS.labels(endpoint="chat").observe(time.perf_counter() - started)
+        CHAT_REQUESTS.labels(endpoint="chat", outcome=outcome).inc()
+    trace_payload = await asyncio.to_thread(tracing.finish_trace, trace) if trace is not None else None
 
     return ChatResponse(
         response=response_text,
-        timestamp=datetime.now().isoformat()
+        timestamp=datetime.now().isoformat(),
+        trace=trace_payload if traced else None
     )
 
 @ai_router.post("/chat/stream")
 async def chat_with_ai_stream(
     request: ChatRequest,
-    current_user: dict = Depends(optional_auth)
+    current_user: dict = Depends(optional_auth),
+    x_trace: Optional[str] = Header(None)
 ):
     """Stream chat response from AI assistant using Server-Sent Events"""
     # Log user if authenticated
     if current_user:
         print(f"Stream chat request from user: {current_user.get('name', 'Unknown')}")
-    import json
+    traced = tracing.trace_requested(request.trace, x_trace)
 
     async def generate():
+        started = time.perf_counter()
+        first_frame = True
+        outcome = "ok"
+        # Spans of the service, tools and handlers attach to this trace through the context
+        trace = tracing.start_trace("chat.stream") if traced or tracing.TRACE_ALL else None
+        sse_span = None
+        frames = sent_bytes = 0
+        send_seconds = 0.0
+        done_frame = None
+
+        def end_sse_span():
+            if sse_span is not None:
+                sse_span.set(frames=frames, bytes=sent_bytes, send_ms=round(send_seconds * 1000, 3))
+                sse_span.end()
+
         try:
+            ai_service = await _service()
             async for chunk in ai_service.stream_response(
                 message=request.message,
                 conversation_history=request.conversation_history
             ):
+                if first_frame:
+                    TIME_TO_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started)
+                    first_frame = False
+                    sse_span = tracing.start_span("sse")
                 # Chunk is already JSON string from service
-                yield f"data: {chunk}\n\n"
+                frame = f"data: {chunk}\n\n"
+                event = _control_event(chunk)
+                if event is not None:
+                    # The service reports failures in-band, after the user has seen an apology
+                    error = event.get("content") if event["type"] == "error" else event.get("error")
+                    if error:
+                        outcome = "error"
+                        if trace is not None:
+                            trace.root.set(error=str(error))
+                    if traced and event["type"] == "done":
+                        # Clients stop reading at done, so it is sent after the trace
+                        done_frame = frame
+                        continue
+                frames += 1
+                sent_bytes += len(frame.encode("utf-8"))
+                emit_started = time.perf_counter()
+                yield frame
                 # Force flush for immediate delivery
                 await asyncio.sleep(0)  # Yield control to ensure data is sent
+                send_seconds += time.perf_counter() - emit_started
+
+            if trace is not None:
+                end_sse_span()
+                trace_payload = await asyncio.to_thread(tracing.finish_trace, trace)
+                trace = None
+                if traced:
+                    yield f"data: {json.dumps({'type': 'trace', **trace_payload}, default=str)}\n\n"
+            if done_frame is not None:
+                yield done_frame
 
             # Send completion signal
             yield "data: [DONE]\n\n"
+        except (GeneratorExit, asyncio.CancelledError):
+            if trace is not None:
+                trace.root.set(disconnected=True)
+            raise
         except Exception as e:
+            outcome = "error"
+            if trace is not None:
+                trace.root.set(error=str(e))
             error_data = json.dumps({"type": "error", "content": str(e)})
             yield f"data: {error_data}\n\n"
+        finally:
+            # Errors and client disconnects finish the trace here; synchronously, as a
+            # cancelled request cannot await anything more
+            if trace is not None:
+                end_sse_span()
+                tracing.finish_trace(trace)
+            CHAT_REQUEST_SECONDS.labels(endpoint="stream").observe(time.perf_counter() - started)
+            CHAT_REQUESTS.labels(endpoint="stream", outcome=outcome).inc()
 
     return StreamingResponse(
         generate(),
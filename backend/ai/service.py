@@ -1,15 +1,23 @@
 """AI Chat Service with MCP Tools using Claude - Direct Tool Calling."""
 
 import os
+import time
 import logging
 import asyncio
 import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import AsyncIterator, List, Any
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
 # Import MCP tools
 from .mcp_tools import get_all_mcp_tools
+from .models import ChatServiceError
+from .prompt_cache import CacheUsage, cacheable_tools, cached_system_message, with_cache_breakpoint
+from .streaming import ContentCoalescer, StreamedRound, chunk_text, sse_event
+import tracing
+from metrics import LLM_ROUND_SECONDS, LLM_ROUNDS_PER_REQUEST, TOOL_RESULT_BYTES, TOOL_SECONDS
 
 # Configure logging with more detail
 logging.basicConfig(
@@ -26,6 +34,11 @@ import langchain
 
 langchain.debug = False  # Disable general debug to reduce noise
 
+# Per-tool time limit, and the pool that runs blocking (sync) tools off the event loop
+TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", "60"))
+TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "8"))
+_tool_executor = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS, thread_name_prefix="tool")
+
 
 class AIService:
     """AI chat service with MCP tools using direct tool calling."""
@@ -72,12 +85,24 @@ class AIService:
 
         IMPORTANT SQL QUERY INSTRUCTIONS:
         - When using query_fresh_service_tickets or query_jira_demands, the data is in a dataframe called 'df'
-        - Always use 'SELECT * FROM df' or 'SELECT column FROM df WHERE...' format
+        - Before the first query against a dataset, call describe_dataset ("jira" or "freshservice") to get
+          the exact column names, types and common values; do not run SELECT * ... LIMIT to discover columns
+        - For counts and breakdowns (by status, priority, assignee/responder, department, week or month), call
+          list_rollups first: its pre-aggregated tables are queried with the same tools (e.g.
+          SELECT status, SUM(tickets) FROM tickets_by_status GROUP BY status) and are much faster than df
+        - To find tickets or demands about a topic, use search_tickets or search_demands (ranked full-text
+          search over subjects, summaries and descriptions) instead of LIKE '%word%' queries
+        - Always name the table: 'SELECT column FROM df WHERE...' for the dataset, or
+          'SELECT column FROM <rollup> ...' for a table returned by list_rollups
         - Example queries:
           - Count records: SELECT COUNT(*) FROM df
           - Filter by status: SELECT * FROM df WHERE status = 'Open'
           - Get specific columns: SELECT id, summary, status FROM df LIMIT 10
-        - NEVER use just 'SELECT *' without 'FROM df'
+          - Count by status from a rollup: SELECT status, SUM(tickets) FROM tickets_by_status GROUP BY status
+        - NEVER use just 'SELECT *' without a FROM clause naming df or a rollup table
+        - Results come back as columns + rows with total_rows. Large results are truncated to a page;
+          prefer aggregates and explicit columns, and use fetch_query_results with the returned
+          result_id and next_offset only when you really need more rows
 
         When users ask about tickets, issues, or demands:
         1. Use the appropriate query tool with proper SQL syntax
@@ -109,69 +134,138 @@ class AIService:
 
         # Bind tools directly to LLM (no AgentExecutor)
         if self.tools:
-            self.llm_with_tools = self.llm.bind_tools(self.tools)
+            self.llm_with_tools = self.llm.bind_tools(cacheable_tools(self.tools))
             logger.info(f"AI Service initialized with {len(self.tools)} MCP tools")
         else:
             self.llm_with_tools = self.llm
             logger.warning("AI Service initialized without tools (fallback mode)")
 
-    async def _execute_tools_parallel(self, tool_calls: List[dict]) -> List[Any]:
+    async def _run_tool(self, tool_call: dict) -> str:
+        """Run one tool call under the per-tool timeout and return its result as text.
+
+        Tools with a native coroutine are awaited directly; blocking tools run on
+        the bounded tool pool so a slow query never stalls the event loop. On
+        timeout the caller stops waiting and the model gets an error result; a
+        worker thread that is already running finishes in the background and
+        its result is discarded.
+        """
+        tool_name = tool_call.get("name")
+        tool_args = tool_call.get("args", {})
+        tool = self.tool_map.get(tool_name)
+        if tool is None:
+            logger.warning(f"Tool {tool_name} not found")
+            return f"Error: Tool {tool_name} not found"
+
+        started = time.perf_counter()
+        outcome = "ok"
+        with tracing.span("tool", tool=tool_name, args_hash=tracing.args_hash(tool_args)) as span:
+            try:
+                if getattr(tool, "coroutine", None) is not None:
+                    call = tool.ainvoke(tool_args)
+                else:
+                    # The copied context carries the trace span, so handler spans nest under this tool
+                    context = contextvars.copy_context()
+                    call = asyncio.get_running_loop().run_in_executor(
+                        _tool_executor, context.run, tool.invoke, tool_args
+                    )
+                result = await asyncio.wait_for(call, TOOL_TIMEOUT_SECONDS)
+                result = str(result)
+                if _is_error_result(result):
+                    outcome = "error"
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                logger.error(f"⏱️ Tool {tool_name} timed out after {TOOL_TIMEOUT_SECONDS:g}s")
+                result = f"Error: Tool {tool_name} timed out after {TOOL_TIMEOUT_SECONDS:g}s"
+            except Exception as e:
+                outcome = "error"
+                logger.error(f"❌ Tool {tool_name} failed: {e}")
+                result = f"Error: {str(e)}"
+            if span is not None:
+                span.set(outcome=outcome, result_bytes=len(result.encode("utf-8")))
+
+        TOOL_SECONDS.labels(tool=tool_name, outcome=outcome).observe(time.perf_counter() - started)
+        TOOL_RESULT_BYTES.labels(tool=tool_name).observe(len(result.encode("utf-8")))
+        return result
+
+    async def _execute_tools_parallel(self, tool_calls: List[dict]) -> List[str]:
         """Execute multiple tools in parallel for efficiency."""
-        tasks = []
-        tool_info = []  # Track tool info for logging
-
-        for tool_call in tool_calls:
-            tool_name = tool_call.get("name")
-            tool_args = tool_call.get("args", {})
-            tool_info.append({"name": tool_name, "args": tool_args})
-
-            tool = self.tool_map.get(tool_name)
-            if tool:
-                # Create async task for each tool
-                tasks.append(tool.ainvoke(tool_args))
+        if not tool_calls:
+            return []
+
+        logger.info(f"\n⚡ Executing {len(tool_calls)} tool(s) in parallel...")
+        results = await asyncio.gather(*(self._run_tool(tc) for tc in tool_calls))
+
+        # Log results
+        for tool_call, result_str in zip(tool_calls, results):
+            logger.info(f"\n✅ Tool '{tool_call.get('name')}' completed:")
+            logger.info(f"   Args: {tool_call.get('args', {})}")
+            if len(result_str) > 300:
+                logger.info(f"   Result preview: {result_str[:300]}...")
+                logger.info(f"   Result size: {len(result_str)} chars")
             else:
-                logger.warning(f"Tool {tool_name} not found")
-                tasks.append(
-                    asyncio.create_task(
-                        self._return_error(f"Tool {tool_name} not found")
+                logger.info(f"   Result: {result_str}")
+
+        return results
+
+    async def _stream_tools(self, tool_calls: List[dict], round_num: int) -> AsyncIterator[Any]:
+        """Run a round's tool calls concurrently, reporting each one as it finishes.
+
+        Yields SSE frames: a start marker and ``tool_call`` event per tool up
+        front, then a ``tool_result`` event per tool in completion order. The
+        final item is the list of ``ToolMessage`` results in the original call
+        order, which is the order the model expects them back in. Tools still
+        running when the consumer goes away are cancelled.
+        """
+        tool_ids = [tc.get("id") or f"tool_{round_num}_{i}" for i, tc in enumerate(tool_calls)]
+        started = {}
+        tasks = {}
+        for i, (tc, tool_id) in enumerate(zip(tool_calls, tool_ids)):
+            tool_name = tc.get("name")
+            logger.info(f"  Tool: {tool_name} with args: {tc.get('args')}")
+
+            # Convert snake_case to Title Case
+            tool_display_name = ' '.join(word.capitalize() for word in tool_name.split('_'))
+
+            # Send tool call as inline HTML with styling, plus a structured event
+            tool_text = f'\n<span style="color: #666; font-style: italic; opacity: 0.8;">🔧 {tool_display_name}</span>\n'
+            yield sse_event("content", content=tool_text)
+            yield sse_event("tool_call", id=tool_id, name=tool_name, args=tc.get("args"))
+
+            started[i] = time.monotonic()
+            tasks[asyncio.create_task(self._run_tool(tc))] = i
+
+        results = [None] * len(tool_calls)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i = tasks[task]
+                    results[i] = task.result()
+                    yield sse_event(
+                        "tool_result",
+                        id=tool_ids[i],
+                        name=tool_calls[i].get("name"),
+                        is_error=_is_error_result(results[i]),
+                        size=len(results[i]),
+                        duration_ms=int((time.monotonic() - started[i]) * 1000),
                     )
-                )
-
-        # Execute all tools in parallel
-        if tasks:
-            logger.info(f"\n⚡ Executing {len(tasks)} tool(s) in parallel...")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Log results
-            for i, (result, info) in enumerate(zip(results, tool_info)):
-                if isinstance(result, Exception):
-                    logger.error(f"❌ Tool {info['name']} failed: {result}")
-                    results[i] = str(result)
-                else:
-                    # Log successful result
-                    result_str = str(result)
-                    logger.info(f"\n✅ Tool '{info['name']}' completed:")
-                    logger.info(f"   Args: {info['args']}")
-                    if len(result_str) > 300:
-                        logger.info(f"   Result preview: {result_str[:300]}...")
-                        logger.info(f"   Result size: {len(result_str)} chars")
-                    else:
-                        logger.info(f"   Result: {result_str}")
+        finally:
+            for task in pending:
+                task.cancel()
 
-            return results
-        return []
-
-    async def _return_error(self, message: str) -> str:
-        """Return error message."""
-        return f"Error: {message}"
+        yield [
+            ToolMessage(content=result_str, tool_call_id=tool_id)
+            for tool_id, result_str in zip(tool_ids, results)
+        ]
 
     async def generate_response(
         self, message: str, conversation_history: list = None
     ) -> str:
-        """Generate a response using direct tool calling."""
+        """Generate a complete response using direct tool calling, one model call per round."""
         try:
             # Build message list for direct tool calling
-            messages = [SystemMessage(content=self.system_prompt)]
+            messages = [cached_system_message(self.system_prompt)]
 
             if conversation_history:
                 for msg in conversation_history[-5:]:  # Reduced to last 5 messages for faster processing
@@ -185,6 +279,7 @@ class AIService:
             # Keep calling until we get a final answer
             max_rounds = 10  # Safety limit
             total_tools_called = 0
+            usage = CacheUsage()
 
             for round in range(max_rounds):
                 # Get LLM response with tool recommendations
@@ -192,8 +287,19 @@ class AIService:
                 logger.info(f"🤖 ROUND {round + 1} - Sending message to LLM")
                 logger.info(f"{'='*60}")
 
-                response = await self.llm_with_tools.ainvoke(messages)
+                round_stream = StreamedRound(ContentCoalescer())
+                round_span = tracing.start_span("llm.round", round=round + 1)
+                try:
+                    with LLM_ROUND_SECONDS.labels(endpoint="chat").time():
+                        async for _ in round_stream.run(self.llm_with_tools, with_cache_breakpoint(messages)):
+                            pass
+                finally:
+                    _end_round_span(round_span, round_stream)
+                response = round_stream.message
+                usage.add_message(response)
                 messages.append(response)
+                invalid_tool_messages = round_stream.invalid_tool_messages()
+                messages.extend(invalid_tool_messages)
 
                 # Check if LLM wants to call tools
                 if hasattr(response, "tool_calls") and response.tool_calls:
@@ -234,64 +340,38 @@ class AIService:
                         else:
                             logger.info(f"  Full result: {result_str}")
 
-                    # Small delay between rounds
-                    await asyncio.sleep(1.0)
+                elif invalid_tool_messages:
+                    # Only malformed tool calls: the model gets their errors and tries again
+                    logger.info(f"\n⚠️ {len(invalid_tool_messages)} tool call(s) with unparseable arguments, retrying")
+
                 else:
-                    # No more tools to call, now stream the final response
+                    # No more tools to call - this round's text is the final answer
                     logger.info(
                         f"✨ Complete after {round + 1} rounds with {total_tools_called} tool calls"
                     )
-
-                    # Now stream the final response using astream
-                    logger.info("Streaming final AI response...")
-
-                    # Create a new query for the final streaming response
-                    final_messages = messages[:-1]  # Remove the last AIMessage
-
-                    try:
-                        # Stream the response character by character
-                        async for chunk in self.llm_with_tools.astream(final_messages):
-                            if hasattr(chunk, 'content') and chunk.content:
-                                # Extract and stream text content
-                                if isinstance(chunk.content, str):
-                                    yield json.dumps({'type': 'content', 'content': chunk.content})
-                                elif isinstance(chunk.content, list):
-                                    for item in chunk.content:
-                                        if isinstance(item, dict) and item.get('type') == 'text':
-                                            yield json.dumps({'type': 'content', 'content': item.get('text', '')})
-                                        elif isinstance(item, str):
-                                            yield json.dumps({'type': 'content', 'content': item})
-                                await asyncio.sleep(0.005)  # Faster streaming  # Small delay for smooth streaming
-                    except AttributeError:
-                        # Fallback if astream not available
-                        output = response.content
-                        if isinstance(output, str):
-                            # Stream it in chunks
-                            for i in range(0, len(output), 10):
-                                chunk = output[i:i+10]
-                                yield json.dumps({'type': 'content', 'content': chunk})
-                                await asyncio.sleep(0.015)
-                        else:
-                            yield json.dumps({'type': 'content', 'content': str(output)})
-
-                    break
+                    logger.info(f"📦 Token usage: {usage.summary()}")
+                    LLM_ROUNDS_PER_REQUEST.labels(endpoint="chat").observe(usage.calls)
+                    tracing.annotate(usage=usage.as_dict())
+                    return round_stream.text
             else:
                 # Safety limit reached
                 logger.warning(f"Reached max rounds ({max_rounds})")
-                output = f"Analysis complete after processing {total_tools_called} operations."
-                yield json.dumps({'type': 'content', 'content': output})
+                logger.info(f"📦 Token usage: {usage.summary()}")
+                LLM_ROUNDS_PER_REQUEST.labels(endpoint="chat").observe(usage.calls)
+                tracing.annotate(usage=usage.as_dict())
+                return f"Analysis complete after processing {total_tools_called} operations."
 
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
-            yield json.dumps({'type': 'error', 'content': f"I encountered an error: {str(e)}"})
+            raise ChatServiceError(f"I encountered an error: {str(e)}", str(e)) from e
 
     async def stream_response(
         self, message: str, conversation_history: list = None
     ) -> AsyncIterator[str]:
-        """Stream response with tool support - processes tools then streams final answer."""
+        """Stream response with tool support - forwards model deltas from every round as they arrive."""
         try:
             # Build message list
-            messages = [SystemMessage(content=self.system_prompt)]
+            messages = [cached_system_message(self.system_prompt)]
 
             if conversation_history:
                 for msg in conversation_history[-10:]:
@@ -302,222 +382,56 @@ class AIService:
 
             messages.append(HumanMessage(content=message))
 
-            # Skip the analyzing message - removed for cleaner UI
-
-            # Process tool calls first (non-streaming)
             max_rounds = 10
             total_tools_called = 0
+            coalescer = ContentCoalescer()
+            usage = CacheUsage()
 
             for round in range(max_rounds):
                 logger.info(f"\n{'='*60}")
                 logger.info(f"🤖 STREAMING - ROUND {round + 1}")
                 logger.info(f"{'='*60}")
 
-                # Get initial response to check for tool calls
-                # Use non-streaming for tool detection phase
-                response = await self.llm_with_tools.with_config({"streaming": False}).ainvoke(messages)
+                # Single streamed call per round: text (including the AI's explanation before
+                # tools) is forwarded as it arrives while the tool calls accumulate
+                round_stream = StreamedRound(coalescer)
+                round_started = time.perf_counter()
+                round_span = tracing.start_span("llm.round", round=round + 1)
+                try:
+                    async for frame in round_stream.run(self.llm_with_tools, with_cache_breakpoint(messages)):
+                        yield frame
+                finally:
+                    _end_round_span(round_span, round_stream)
+                LLM_ROUND_SECONDS.labels(endpoint="stream").observe(time.perf_counter() - round_started)
+                response = round_stream.message
+                usage.add_message(response)
 
                 # Always append the response to maintain conversation flow
                 messages.append(response)
+                invalid_tool_messages = round_stream.invalid_tool_messages()
+                messages.extend(invalid_tool_messages)
 
-                # Only stream conversational content if there are tool calls coming
-                # This shows the AI's "thinking out loud" BEFORE using tools
-                if hasattr(response, "tool_calls") and response.tool_calls:
-                    # Check if there's also content (the AI's explanation before tools)
-                    if hasattr(response, 'content') and response.content:
-                        content = response.content
-                        if isinstance(content, str) and content.strip():
-                            # Stream the pre-tool explanation
-                            for i in range(0, len(content), 3):
-                                chunk = content[i:i+3]
-                                yield json.dumps({'type': 'content', 'content': chunk})
-                                await asyncio.sleep(0.005)  # Faster streaming
-                            # Don't add extra newlines - let natural formatting handle it
-                        elif isinstance(content, list):
-                            for item in content:
-                                if isinstance(item, dict) and item.get('type') == 'text':
-                                    text = item.get('text', '')
-                                    if text.strip():
-                                        for i in range(0, len(text), 3):
-                                            chunk = text[i:i+3]
-                                            yield json.dumps({'type': 'content', 'content': chunk})
-                                            await asyncio.sleep(0.005)  # Faster streaming
-                            # Don't add extra newlines - let the AI's natural formatting handle it
-                            # Small delay to ensure text appears before tool calls
-                            await asyncio.sleep(0.3)
-
-                    # Process tool calls
-                    num_tools = len(response.tool_calls)
-                    total_tools_called += num_tools
-
-                    # Send reasoning about what we're about to do
-                    tool_names = [tc.get('name') for tc in response.tool_calls]
-
-                    # Removed thinking steps per user request - only show tool calls
-
-                    # Removed transition messages per user request
-                    # Previously showed "Let me execute these queries now..." messages
-
-                    logger.info(f"\n🔧 Processing {num_tools} tool calls")
-
-                    # Process and stream each tool individually
-                    tool_results = []
-
-                    for tc in response.tool_calls:
-                        tool_name = tc.get('name')
-                        tool_args = tc.get('args')
-                        logger.info(f"  Tool: {tool_name} with args: {tool_args}")
-
-                        # Convert snake_case to Title Case
-                        tool_display_name = ' '.join(word.capitalize() for word in tool_name.split('_'))
-
-                        # Send tool call as inline HTML with styling
-                        tool_text = f'\n<span style="color: #666; font-style: italic; opacity: 0.8;">🔧 {tool_display_name}</span>\n'
-                        yield json.dumps({'type': 'content', 'content': tool_text})
-
-                        # Execute this specific tool
-                        try:
-                            tool_fn = self.tool_map.get(tool_name)
-                            if tool_fn:
-                                result = await tool_fn.ainvoke(tool_args)
-                            else:
-                                result = f"Tool {tool_name} not found"
-                        except Exception as e:
-                            result = f"Error: {str(e)}"
-
-                        tool_results.append(result)
-                        result_str = str(result)
-
-                        # Check if result is an error
-                        is_error = False
-                        try:
-                            result_json = json.loads(result_str) if isinstance(result_str, str) else result_str
-                            if isinstance(result_json, dict) and 'error' in result_json:
-                                is_error = True
-                        except:
-                            pass
-
-                        # Don't send tool_result as a separate item - results will be in the final response
-
-                        # Small delay between tools for better UX
-                        await asyncio.sleep(0.2)
-
-                    # Removed completion status per user request
-
-                    # Don't add any status text - just continue to next round
-
-                    # Add results to messages
-                    for tool_call, result in zip(response.tool_calls, tool_results):
-                        messages.append(
-                            ToolMessage(
-                                content=str(result),
-                                tool_call_id=tool_call.get("id", f"tool_{round}"),
-                            )
-                        )
-
-                    # Removed post-tool thinking per user request
-
-                    # Continue to next round to get the final response from LLM
-                    continue  # This will go back to the loop and get the final response
-                else:
-                    # No more tools - stream the final response
+                # Malformed tool calls also get another round, with their errors as results
+                if not response.tool_calls and not invalid_tool_messages:
                     logger.info(f"✨ Final response after {total_tools_called} tool calls")
+                    logger.info(f"📦 Token usage: {usage.summary()}")
+                    LLM_ROUNDS_PER_REQUEST.labels(endpoint="stream").observe(usage.calls)
+                    tracing.annotate(usage=usage.as_dict())
+                    yield sse_event("done", usage=usage.as_dict())
+                    break
 
-                    # First check if the current response already has content to stream
-                    if hasattr(response, 'content') and response.content:
-                        content = response.content
-
-                        # Stream existing content immediately without making another AI call
-                        if isinstance(content, str) and content.strip():
-                            logger.info("Streaming existing response content...")
-                            # Stream in larger chunks for faster output
-                            chunk_size = 20
-                            for i in range(0, len(content), chunk_size):
-                                chunk = content[i:i+chunk_size]
-                                yield json.dumps({'type': 'content', 'content': chunk})
-                                await asyncio.sleep(0.002)  # Faster streaming
-                            yield json.dumps({'type': 'done'})
-                            break
-                        elif isinstance(content, list):
-                            logger.info("Streaming existing response content from list...")
-                            for item in content:
-                                if isinstance(item, dict) and item.get('type') == 'text':
-                                    text = item.get('text', '')
-                                    if text.strip():
-                                        chunk_size = 20
-                                        for i in range(0, len(text), chunk_size):
-                                            chunk = text[i:i+chunk_size]
-                                            yield json.dumps({'type': 'content', 'content': chunk})
-                                            await asyncio.sleep(0.002)
-                            yield json.dumps({'type': 'done'})
-                            break
-
-                    # Only make a new AI call if no content exists
-                    logger.info("No existing content, making final AI call...")
-
-                    # Add a progress indicator
-                    yield json.dumps({'type': 'content', 'content': '\n\n'})
-
-                    # Limit context for faster response - only keep essential messages
-                    final_messages = [messages[0]]  # System prompt
-                    # Add only the last 2 exchanges plus current
-                    if len(messages) > 5:
-                        final_messages.extend(messages[-5:])
+                # Process tool calls
+                num_tools = len(response.tool_calls)
+                total_tools_called += num_tools
+                logger.info(f"\n🔧 Processing {num_tools} tool calls")
+
+                async for item in self._stream_tools(response.tool_calls, round):
+                    if isinstance(item, list):
+                        messages.extend(item)
                     else:
-                        final_messages.extend(messages[1:])
-
-                    try:
-                        # Use astream for real-time character-by-character streaming
-                        logger.info("Starting astream for final response...")
-                        async for chunk in self.llm_with_tools.astream(final_messages):
-                            if hasattr(chunk, 'content') and chunk.content:
-                                # Extract and stream text content
-                                if isinstance(chunk.content, str):
-                                    yield json.dumps({'type': 'content', 'content': chunk.content})
-                                elif isinstance(chunk.content, list):
-                                    for item in chunk.content:
-                                        if isinstance(item, dict):
-                                            if item.get('type') == 'text' and 'text' in item:
-                                                yield json.dumps({'type': 'content', 'content': item['text']})
-                                            elif 'partial_json' in item:
-                                                # Skip partial JSON during final response
-                                                continue
-                                        elif isinstance(item, str):
-                                            yield json.dumps({'type': 'content', 'content': item})
-                                # Reduced delay for faster streaming
-                                await asyncio.sleep(0.002)
-                    except (AttributeError, Exception) as e:
-                        logger.warning(f"astream not available or failed: {e}, falling back to chunked streaming")
-                        # Fallback to chunked streaming if astream not available
-                        final_content = response.content
-
-                        # Handle different content formats
-                        if isinstance(final_content, list):
-                            for block in final_content:
-                                if isinstance(block, dict) and block.get('type') == 'text':
-                                    text_content = block.get('text', '')
-                                    if text_content:
-                                        for i in range(0, len(text_content), 10):
-                                            chunk = text_content[i:i+10]
-                                            yield json.dumps({"type": "content", "content": chunk})
-                                            await asyncio.sleep(0.005)  # Faster streaming
-                                elif isinstance(block, str):
-                                    if block:
-                                        for i in range(0, len(block), 10):
-                                            chunk = block[i:i+10]
-                                            yield json.dumps({"type": "content", "content": chunk})
-                                            await asyncio.sleep(0.005)  # Faster streaming
-                        elif isinstance(final_content, str) and final_content:
-                            for i in range(0, len(final_content), 10):
-                                chunk = final_content[i:i+10]
-                                yield json.dumps({"type": "content", "content": chunk})
-                                await asyncio.sleep(0.005)  # Faster streaming
-                        else:
-                            yield json.dumps({"type": "content", "content": str(final_content)})
+                        yield item
 
-                    # Send completion signal
-                    yield json.dumps({'type': 'done'})
-                    break
+                # Continue to next round to get the final response from LLM
             else:
                 # Max rounds reached - get final response from LLM
                 logger.warning(f"Reached max rounds with {total_tools_called} tools - getting final response")
@@ -526,25 +440,68 @@ class AIService:
                 final_prompt = "Based on all the data gathered, please provide your final analysis and response."
                 messages.append(HumanMessage(content=final_prompt))
 
+                final_error = None
                 try:
-                    final_response = await self.llm.ainvoke(messages)
-                    final_content = final_response.content if hasattr(final_response, 'content') else str(final_response)
-
-                    # Stream the final content
-                    if isinstance(final_content, str):
-                        chunk_size = 20
-                        for i in range(0, len(final_content), chunk_size):
-                            chunk = final_content[i:i+chunk_size]
-                            yield json.dumps({"type": "content", "content": chunk})
-                            await asyncio.sleep(0.005)  # Faster streaming
-                    else:
-                        yield json.dumps({"type": "content", "content": str(final_content)})
+                    usage.calls += 1
+                    round_started = time.perf_counter()
+                    round_span = tracing.start_span("llm.round", round=max_rounds + 1, final=True)
+                    async for chunk in self.llm.astream(with_cache_breakpoint(messages)):
+                        usage.add(chunk.usage_metadata)
+                        frame = coalescer.add(chunk_text(chunk))
+                        if frame:
+                            yield frame
+                    frame = coalescer.flush()
+                    if frame:
+                        yield frame
+                    LLM_ROUND_SECONDS.labels(endpoint="stream").observe(time.perf_counter() - round_started)
                 except Exception as e:
                     logger.error(f"Failed to get final response: {e}")
-                    yield json.dumps({'type': 'content', 'content': 'Sorry, I encountered an error. Please try again.'})
-
-                yield json.dumps({'type': 'done'})
+                    final_error = str(e)
+                    yield sse_event("content", content="Sorry, I encountered an error. Please try again.")
+                finally:
+                    if round_span is not None:
+                        round_span.end()
+
+                logger.info(f"📦 Token usage: {usage.summary()}")
+                LLM_ROUNDS_PER_REQUEST.labels(endpoint="stream").observe(usage.calls)
+                tracing.annotate(usage=usage.as_dict())
+                if final_error is None:
+                    yield sse_event("done", usage=usage.as_dict())
+                else:
+                    # The user got an apology, but the request failed: the route counts it as an error
+                    yield sse_event("done", usage=usage.as_dict(), error=final_error)
 
         except Exception as e:
             logger.error(f"Streaming error: {str(e)}")
-            yield json.dumps({'type': 'error', 'error': str(e)})
+            yield sse_event("error", content=str(e))
+
+
+def _end_round_span(span, round_stream: StreamedRound):
+    """Close a model round's trace span with its first-chunk latency, tool calls and token counts."""
+    if span is None:
+        return
+    message = round_stream.message
+    if round_stream.first_chunk_at is not None:
+        span.set(first_chunk_ms=round((round_stream.first_chunk_at - span.started) * 1000, 3))
+    if message is None:  # The round failed or was cancelled before the model finished
+        span.set(completed=False)
+        span.end()
+        return
+    usage_metadata = getattr(message, "usage_metadata", None) or {}
+    span.set(
+        tool_calls=len(message.tool_calls),
+        input_tokens=usage_metadata.get("input_tokens"),
+        output_tokens=usage_metadata.get("output_tokens"),
+    )
+    span.end()
+
+
+def _is_error_result(result: str) -> bool:
+    """Return True if a tool result is an error payload."""
+    if result.startswith("Error:"):
+        return True
+    try:
+        parsed = json.loads(result)
+    except ValueError:
+        return False
+    return isinstance(parsed, dict) and "error" in parsed
@@ -0,0 +1,144 @@
+"""Helpers for turning model output into Server-Sent Event frames."""
+
+import os
+import json
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.messages.utils import message_chunk_to_message
+
+# Content frames are released once they hold this many characters...
+STREAM_FRAME_MAX_CHARS = int(os.getenv("STREAM_FRAME_MAX_CHARS", "96"))
+# ...or once their oldest text has waited this long
+STREAM_FRAME_MAX_DELAY = int(os.getenv("STREAM_FRAME_MAX_DELAY_MS", "40")) / 1000
+
+
+def sse_event(event_type: str, **fields: Any) -> str:
+    """Encode an event payload for the SSE stream."""
+    return json.dumps({"type": event_type, **fields}, default=str)
+
+
+def chunk_text(chunk: Any) -> str:
+    """Return the text carried by a streamed message chunk, ignoring tool-call deltas."""
+    content = getattr(chunk, "content", None)
+    if not content:
+        return ""
+    if isinstance(content, str):
+        return content
+
+    parts = []
+    for item in content:
+        if isinstance(item, str):
+            parts.append(item)
+        elif isinstance(item, dict) and item.get("type") == "text":
+            parts.append(item.get("text", ""))
+    return "".join(parts)
+
+
+class ContentCoalescer:
+    """Buffers text deltas and releases them as content frames by size or age.
+
+    The first delta of a response is released immediately so the client sees
+    text as early as possible; after that, bursts of small model deltas are
+    merged into frames of up to ``max_chars`` characters, never held longer
+    than ``max_delay`` seconds past the next chunk. ``flush`` releases whatever
+    is left, and must be called when the model pauses (tool calls, end of round).
+    """
+
+    def __init__(self, max_chars: int = STREAM_FRAME_MAX_CHARS, max_delay: float = STREAM_FRAME_MAX_DELAY):
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self.frames_sent = 0
+        self._buffer = []
+        self._size = 0
+        self._started = 0.0
+
+    def add(self, text: str) -> Optional[str]:
+        """Buffer a text delta, returning a frame if one is due.
+
+        Call it for every chunk, even those without text, so buffered text
+        is released on age while the model streams something else.
+        """
+        if text:
+            if not self._buffer:
+                self._started = time.monotonic()
+            self._buffer.append(text)
+            self._size += len(text)
+        if not self._buffer:
+            return None
+
+        if (
+            self.frames_sent == 0
+            or self._size >= self.max_chars
+            or time.monotonic() - self._started >= self.max_delay
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Release all buffered text as a frame, or None if nothing is buffered."""
+        if not self._buffer:
+            return None
+        frame = sse_event("content", content="".join(self._buffer))
+        self._buffer = []
+        self._size = 0
+        self.frames_sent += 1
+        return frame
+
+
+class StreamedRound:
+    """Runs one model round as a single streamed call.
+
+    Text deltas are forwarded as content frames while they arrive, and the
+    same chunks are merged into the complete ``AIMessage`` (tool-call argument
+    fragments included), which is available as ``message`` once ``run`` is
+    exhausted. No second call is needed to get either the text or the tools.
+    """
+
+    def __init__(self, coalescer: ContentCoalescer):
+        self.coalescer = coalescer
+        self.message: Optional[AIMessage] = None
+        self.text = ""
+        self.first_chunk_at: Optional[float] = None
+
+    async def run(self, llm: Any, messages: List[Any]) -> AsyncIterator[str]:
+        """Stream the round, yielding content frames."""
+        accumulated = None
+        text_parts = []
+        async for chunk in llm.astream(messages):
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.perf_counter()
+            accumulated = chunk if accumulated is None else accumulated + chunk
+            text = chunk_text(chunk)
+            if text:
+                text_parts.append(text)
+            frame = self.coalescer.add(text)
+            if frame:
+                yield frame
+            if getattr(chunk, "tool_call_chunks", None):
+                # Tool-call arguments stream without text; don't hold the text before them
+                frame = self.coalescer.flush()
+                if frame:
+                    yield frame
+
+        # The model pauses here (tool calls or end of answer), so release the tail
+        frame = self.coalescer.flush()
+        if frame:
+            yield frame
+
+        self.text = "".join(text_parts)
+        self.message = message_chunk_to_message(accumulated) if accumulated is not None else AIMessage(content="")
+
+    def invalid_tool_messages(self) -> List[ToolMessage]:
+        """Error results for tool calls whose arguments could not be parsed.
+
+        The model still has to receive a result for each of them.
+        """
+        return [
+            ToolMessage(
+                content=f"Error: could not parse arguments for tool {call.get('name')}: {call.get('error') or call.get('args')}",
+                tool_call_id=call.get("id") or "",
+            )
+            for call in getattr(self.message, "invalid_tool_calls", None) or []
+        ]
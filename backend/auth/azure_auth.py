@@ -1,12 +1,18 @@
 import os
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 import jwt
 import requests
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jwt import PyJWKClient
+from jwt import PyJWK, PyJWKSet
 from dotenv import load_dotenv
 import logging
+from metrics import JWT_VALIDATION_SECONDS
 
 load_dotenv()
 
@@ -21,26 +27,231 @@ AZURE_AUTHORITY = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}"
 AZURE_JWKS_URI = f"{AZURE_AUTHORITY}/discovery/v2.0/keys"
 AZURE_ISSUER = f"https://sts.windows.net/{AZURE_TENANT_ID}/"
 
+# Validated claims are cached per token until it expires, bounded to this many tokens
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+# Signing keys are refetched in the background this often, and on demand (at most once per
+# JWKS_MIN_REFRESH_SECONDS) when a token names a key id that is not known yet
+JWKS_REFRESH_SECONDS = int(os.getenv("JWKS_REFRESH_SECONDS", "3600"))
+JWKS_MIN_REFRESH_SECONDS = int(os.getenv("JWKS_MIN_REFRESH_SECONDS", "30"))
+JWKS_RETRY_SECONDS = 60
+JWKS_TIMEOUT_SECONDS = 10
+
 # Initialize the security scheme
 security = HTTPBearer(auto_error=False)
 
-# Cache for JWKS client
-jwks_client = None
 
-def get_jwks_client():
-    """Get or create JWKS client for token validation."""
-    global jwks_client
-    if jwks_client is None:
-        jwks_client = PyJWKClient(AZURE_JWKS_URI)
-    return jwks_client
+class ValidatedTokenCache:
+    """LRU cache of validated token claims, keyed by token hash and held until ``exp``.
+
+    Only tokens that passed full validation are stored; a hit skips the
+    signature check. The raw token is never kept, only its SHA-256.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached claims of a still-valid token, or None."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: dict):
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+class SigningKeyStore:
+    """Azure AD signing keys by key id, fetched off the request path.
+
+    The keys are prefetched at startup and refetched periodically by a
+    background thread. A token with an unknown key id (after a key rotation)
+    triggers a single-flight refresh: one caller fetches while concurrent
+    callers wait for that fetch instead of starting their own, and refreshes
+    are rate limited so tokens with bogus key ids cannot hammer the endpoint.
+    """
+
+    def __init__(self, uri: str, refresh_interval: int = JWKS_REFRESH_SECONDS, min_refresh_interval: int = JWKS_MIN_REFRESH_SECONDS):
+        self.uri = uri
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, PyJWK] = {}
+        self._refresh_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.fetched_at: Optional[float] = None
+        self.fetch_count = 0
+
+    def get(self, kid: str) -> Optional[PyJWK]:
+        """Return a known key without any I/O."""
+        return self._keys.get(kid)
+
+    def refresh(self):
+        """Fetch the key set and replace the known keys (blocking)."""
+        response = requests.get(self.uri, timeout=JWKS_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        jwk_set = PyJWKSet.from_dict(response.json())
+        keys = {
+            key.key_id: key for key in jwk_set.keys
+            if key.key_id and key.public_key_use in ("sig", None)
+        }
+        self._keys = keys
+        self.fetched_at = time.monotonic()
+        self.fetch_count += 1
+        logger.info(f"Fetched {len(keys)} Azure AD signing keys")
+
+    def get_or_refresh(self, kid: str) -> Optional[PyJWK]:
+        """Return the key for ``kid``, refreshing the key set once if it is unknown (blocking)."""
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        with self._refresh_lock:
+            # A refresh that finished while this caller waited may have brought the key
+            key = self._keys.get(kid)
+            if key is None and (
+                self.fetched_at is None or time.monotonic() - self.fetched_at >= self.min_refresh_interval
+            ):
+                self.refresh()
+                key = self._keys.get(kid)
+        return key
+
+    def _refresh_safely(self) -> bool:
+        try:
+            with self._refresh_lock:
+                self.refresh()
+            return True
+        except Exception as e:
+            logger.warning(f"Could not fetch Azure AD signing keys: {e}")
+            return False
+
+    def start(self):
+        """Prefetch the keys (blocking) and keep them fresh from a background thread."""
+        if self._thread is not None:
+            return
+        fetched = self._refresh_safely()
+        self._thread = threading.Thread(target=self._run, args=(fetched,), daemon=True, name="JWKS-Refresh")
+        self._thread.start()
+
+    def _run(self, fetched: bool):
+        while not self._stopping.wait(self.refresh_interval if fetched else JWKS_RETRY_SECONDS):
+            fetched = self._refresh_safely()
+
+    def stop(self):
+        self._stopping.set()
+
+
+token_cache = ValidatedTokenCache()
+signing_keys = SigningKeyStore(AZURE_JWKS_URI)
+
+
+def start_signing_key_refresh():
+    """Prefetch Azure AD signing keys and start refreshing them in the background (if configured)."""
+    if AZURE_TENANT_ID and AZURE_CLIENT_ID:
+        signing_keys.start()
+
+
+def _token_key_id(token: str) -> str:
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except jwt.InvalidTokenError as e:
+        logger.error(f"Invalid token: {str(e)}")
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not kid:
+        logger.error("Token has no key id")
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return kid
+
+
+def _unknown_key(kid: str) -> HTTPException:
+    logger.error(f"No Azure AD signing key matches key id {kid}")
+    return HTTPException(status_code=401, detail="Could not validate credentials")
+
+
+def _validated(token: str, signing_key: PyJWK, started: float) -> dict:
+    try:
+        claims = _decode_token(token, signing_key)
+    except HTTPException:
+        JWT_VALIDATION_SECONDS.labels(outcome="invalid").observe(time.perf_counter() - started)
+        raise
+    token_cache.put(token, claims)
+    JWT_VALIDATION_SECONDS.labels(outcome="ok").observe(time.perf_counter() - started)
+    return claims
+
 
 def validate_token(token: str) -> dict:
-    """Validate Azure AD token and return decoded claims."""
+    """Validate Azure AD token and return decoded claims (may block on a key fetch)."""
+    started = time.perf_counter()
+    claims = token_cache.get(token)
+    if claims is not None:
+        JWT_VALIDATION_SECONDS.labels(outcome="cached").observe(time.perf_counter() - started)
+        return claims
+
+    kid = _token_key_id(token)
     try:
-        # Get the signing key from Azure AD
-        client = get_jwks_client()
-        signing_key = client.get_signing_key_from_jwt(token)
+        signing_key = signing_keys.get_or_refresh(kid)
+    except Exception as e:
+        logger.error(f"Token validation error: {str(e)}")
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    if signing_key is None:
+        raise _unknown_key(kid)
+    return _validated(token, signing_key, started)
 
+
+async def validate_token_async(token: str) -> dict:
+    """Validate Azure AD token without blocking the event loop; key fetches run in a worker thread."""
+    started = time.perf_counter()
+    claims = token_cache.get(token)
+    if claims is not None:
+        JWT_VALIDATION_SECONDS.labels(outcome="cached").observe(time.perf_counter() - started)
+        return claims
+
+    kid = _token_key_id(token)
+    signing_key = signing_keys.get(kid)
+    if signing_key is None:
+        try:
+            signing_key = await asyncio.to_thread(signing_keys.get_or_refresh, kid)
+        except Exception as e:
+            logger.error(f"Token validation error: {str(e)}")
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+        if signing_key is None:
+            raise _unknown_key(kid)
+    return _validated(token, signing_key, started)
+
+
+def _decode_token(token: str, signing_key: PyJWK) -> dict:
+    """Verify the token's signature and claims against Azure AD, raising HTTP 401 on failure."""
+    try:
         # Decode and validate the token
         decoded_token = jwt.decode(
             token,
@@ -90,7 +301,7 @@ async def get_current_user(
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     token = credentials.credentials
-    user_info = validate_token(token)
+    user_info = await validate_token_async(token)
 
     # Extract user information from token claims
     return {
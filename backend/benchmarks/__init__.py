@@ -0,0 +1 @@
+"""Performance benchmarks for the data path (run from the backend directory)."""
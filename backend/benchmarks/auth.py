@@ -0,0 +1,156 @@
+"""Token validation timings against a local stand-in JWKS server.
+
+Signs tokens with locally generated RSA keys, serves the public keys from a
+JWKS endpoint on 127.0.0.1 (with an artificial delay standing in for the
+Azure round trip) and points ``auth.azure_auth`` at it. It then times
+repeated validation of the same token with and without the validated-token
+cache, and the event loop stall while keys are fetched. The behaviour is
+covered by ``tests/test_azure_auth.py``, which uses the same stand-in server.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.auth --iterations 2000 --jwks-delay-ms 150
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+CLIENT_ID = "bench-client"
+ISSUER = "https://sts.windows.net/bench-tenant/"
+
+
+class StandInJWKS:
+    """JWKS endpoint on a local port serving the public halves of the current keys."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.private_keys: Dict[str, rsa.RSAPrivateKey] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        jwks = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with jwks._lock:
+                    jwks.requests += 1
+                    body = json.dumps(jwks.key_set()).encode()
+                time.sleep(jwks.delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/discovery/v2.0/keys"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add_key(self, kid: str) -> rsa.RSAPrivateKey:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        with self._lock:
+            self.private_keys[kid] = key
+        return key
+
+    def key_set(self) -> dict:
+        keys = []
+        for kid, key in self.private_keys.items():
+            jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+            keys.append({**jwk, "kid": kid, "use": "sig", "alg": "RS256"})
+        return {"keys": keys}
+
+    def close(self):
+        self.server.shutdown()
+
+
+def make_token(key, kid: str, lifetime: float = 3600, **claims) -> str:
+    now = int(time.time())
+    payload = {"aud": CLIENT_ID, "iss": ISSUER, "iat": now, "exp": now + lifetime, "oid": "user-1", "name": "Bench User", **claims}
+    return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+
+def time_validation(azure_auth, token: str, iterations: int) -> Dict[str, float]:
+    def run(clear: bool) -> float:
+        samples = []
+        for _ in range(iterations):
+            if clear:
+                azure_auth.token_cache.clear()
+            started = time.perf_counter()
+            azure_auth.validate_token(token)
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        return statistics.median(samples)
+
+    uncached = run(clear=True)
+    cached = run(clear=False)
+    return {"uncached_us": round(uncached, 1), "cached_us": round(cached, 1), "speedup": round(uncached / cached, 1)}
+
+
+def time_loop_stall(azure_auth, jwks: StandInJWKS) -> Dict[str, float]:
+    """Largest event loop stall while a request with a new key id waits for the key fetch."""
+    key = jwks.add_key("key-stall")
+    token = make_token(key, "key-stall")
+    azure_auth.signing_keys.fetched_at = None
+
+    async def measure():
+        stalls = []
+        stop = asyncio.Event()
+
+        async def ticker():
+            while not stop.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                stalls.append(time.perf_counter() - started - 0.005)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0.02)
+        started = time.perf_counter()
+        await azure_auth.validate_token_async(token)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await task
+        return elapsed, max(stalls)
+
+    elapsed, stall = asyncio.run(measure())
+    return {"validation_with_fetch_ms": round(elapsed * 1000, 1), "max_loop_stall_ms": round(stall * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time token validation against a local JWKS server.")
+    parser.add_argument("--iterations", type=int, default=2000, help="Validations per timing run")
+    parser.add_argument("--jwks-delay-ms", type=float, default=150, help="Artificial JWKS response delay")
+    args = parser.parse_args()
+
+    jwks = StandInJWKS(args.jwks_delay_ms / 1000)
+    jwks.add_key("key-1")
+
+    from auth import azure_auth
+    logging.getLogger(azure_auth.__name__).setLevel(logging.CRITICAL)  # Rejections are expected here
+    azure_auth.AZURE_CLIENT_ID = CLIENT_ID
+    azure_auth.AZURE_ISSUER = ISSUER
+    azure_auth.signing_keys = azure_auth.SigningKeyStore(jwks.url)
+    azure_auth.token_cache.clear()
+
+    try:
+        timings = time_validation(azure_auth, make_token(jwks.private_keys["key-1"], "key-1"), args.iterations)
+        timings.update(time_loop_stall(azure_auth, jwks))
+    finally:
+        jwks.close()
+
+    print(json.dumps({"jwks_fetches": jwks.requests, **timings}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
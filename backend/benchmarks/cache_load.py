@@ -0,0 +1,124 @@
+"""Cold-start benchmark: load a dataset cache from Parquet vs the memory-mapped Arrow copy.
+
+Every measurement runs in a fresh interpreter, so it sees what a new worker
+sees at startup: the time to get the cached DataFrame and the resident memory
+that costs. The OS page cache is not dropped between runs; for disk-cold
+numbers, drop it first (``echo 3 > /proc/sys/vm/drop_caches``).
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.cache_load --cache jira_issues_cache.parquet --kind jira
+    python -m benchmarks.cache_load --cache fresh_service_tickets.parquet --kind tickets --runs 10
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+FORMATS = ("parquet", "arrow")
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _child(kind: str, cache_file: str):
+    """Load the cache once and print the measurement as JSON (runs in a fresh interpreter)."""
+    if kind == "jira":
+        from data.jira_issues import read_issues_cache as load
+    else:
+        from freshservice import read_tickets_cache as load
+
+    baseline = rss_mb()
+    started = time.perf_counter()
+    df = load(cache_file)
+    load_seconds = time.perf_counter() - started
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_delta_mb": rss_mb() - baseline,
+        "rows": len(df),
+        "columns": len(df.columns),
+    }))
+
+
+def _measure(cache_format: str, kind: str, cache_file: str) -> dict:
+    env = dict(os.environ, DATA_CACHE_FORMAT=cache_format)
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cache_load", "--child", kind, cache_file],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(cache_file: str, kind: str, runs: int) -> dict:
+    """Benchmark both formats on a copy of ``cache_file`` and return the report."""
+    workdir = tempfile.mkdtemp(prefix="cache_load_")
+    try:
+        parquet_path = os.path.join(workdir, os.path.basename(cache_file))
+        shutil.copyfile(cache_file, parquet_path)
+        # The first Arrow load writes the copy; keep it out of the measurements
+        _measure("arrow", kind, parquet_path)
+        arrow_path = os.path.splitext(parquet_path)[0] + ".arrow"
+
+        report = {
+            "cache_file": cache_file,
+            "kind": kind,
+            "runs": runs,
+            "file_mb": {
+                "parquet": round(os.path.getsize(parquet_path) / 2**20, 2),
+                "arrow": round(os.path.getsize(arrow_path) / 2**20, 2),
+            },
+            "formats": {},
+        }
+        for cache_format in FORMATS:
+            samples = [_measure(cache_format, kind, parquet_path) for _ in range(runs)]
+            report["rows"] = samples[0]["rows"]
+            report["formats"][cache_format] = {
+                "load_ms_median": round(statistics.median(s["load_seconds"] for s in samples) * 1000, 2),
+                "load_ms_min": round(min(s["load_seconds"] for s in samples) * 1000, 2),
+                "rss_delta_mb_median": round(statistics.median(s["rss_delta_mb"] for s in samples), 2),
+            }
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache", default="jira_issues_cache.parquet", help="Parquet cache to load")
+    parser.add_argument("--kind", choices=("jira", "tickets"), default="jira", help="Which loader to use")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter loads per format")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--child", nargs=2, metavar=("KIND", "CACHE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    report = run(args.cache, args.kind, args.runs)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
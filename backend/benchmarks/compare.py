@@ -0,0 +1,63 @@
+"""Compare two benchmark reports and flag regressions.
+
+A case regresses when its median is more than ``--threshold`` slower than in
+the baseline and the difference is above ``--min-delta-ms`` (so sub-millisecond
+noise never fails a comparison). The exit status is 1 if anything regressed.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.compare reports/before.json reports/after.json --threshold 0.15
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float, min_delta_ms: float) -> List[Tuple]:
+    """Return ``(case, size, base_ms, current_ms, ratio, regressed)`` for every case both reports share."""
+    rows = []
+    for case, sizes in sorted(current["results"].items()):
+        for size, timing in sizes.items():
+            base = baseline["results"].get(case, {}).get(size)
+            if base is None:
+                continue
+            base_ms, current_ms = base["median_ms"], timing["median_ms"]
+            ratio = current_ms / base_ms if base_ms else float("inf")
+            regressed = ratio > 1 + threshold and current_ms - base_ms > min_delta_ms
+            rows.append((case, size, base_ms, current_ms, ratio, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("baseline", help="Report of the reference commit")
+    parser.add_argument("current", help="Report of the commit under test")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown ratio (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    baseline, current = load_report(args.baseline), load_report(args.current)
+    print(f"baseline {baseline['meta'].get('commit')}  vs  current {current['meta'].get('commit')}")
+    rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+
+    width = max((len(case) for case, *_ in rows), default=10)
+    for case, size, base_ms, current_ms, ratio, regressed in rows:
+        marker = "❌ REGRESSION" if regressed else ("✅" if ratio < 1 - args.threshold else "")
+        print(f"{case:<{width}}  {size:>5}  {base_ms:>10.2f} ms  {current_ms:>10.2f} ms  {ratio:>6.2f}x  {marker}")
+
+    regressions = [row for row in rows if row[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
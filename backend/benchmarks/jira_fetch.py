@@ -0,0 +1,138 @@
+"""Sharded JIRA fetch timings against a stand-in JIRA with page latency.
+
+Serves the synthetic issues from an in-memory ``enhanced_jql`` that
+understands the ``created`` windows and ordering the shards use, answers
+``approximate_issue_count``, and sleeps for a fixed latency per request (the
+part of a real fetch that concurrency hides). It then times a full fetch
+serially and with 2, 4 and 8 workers. The behaviour is covered by
+``tests/test_jira_fetch.py``, which uses the same stand-in JIRA.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.jira_fetch --size 10k --page-latency-ms 150
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmarks import synthetic
+from benchmarks.jira_fields import StandInJira
+
+JQL = "project = DMD"
+
+
+class ShardableJira(StandInJira):
+    """Stand-in JIRA that filters by ``created`` windows and adds per-request latency."""
+
+    def __init__(self, issues: List[Dict[str, Any]], latency: float, count_latency: float):
+        super().__init__(issues, synthetic.jira_field_catalogue())
+        self.latency = latency
+        self.count_latency = count_latency
+        self.by_created = sorted(issues, key=lambda issue: created_minute(issue) + issue["fields"]["created"])
+        self.minutes = [created_minute(issue) for issue in self.by_created]
+        self.lock = threading.Lock()
+        self.requests: List[float] = []
+        self.counts = 0
+        self.fail_request: Optional[int] = None
+        self.retry_after = 0.0
+
+    def matching(self, jql: str) -> List[Dict[str, Any]]:
+        start = re.search(r'created >= "([^"]+)"', jql)
+        end = re.search(r'created < "([^"]+)"', jql)
+        lo = bisect.bisect_left(self.minutes, start.group(1)) if start else 0
+        hi = bisect.bisect_left(self.minutes, end.group(1)) if end else len(self.minutes)
+        issues = self.by_created[lo:hi]
+        return issues[::-1] if re.search(r"order by created desc", jql, re.IGNORECASE) else issues
+
+    def approximate_issue_count(self, jql: str):
+        with self.lock:
+            self.counts += 1
+        time.sleep(self.count_latency)
+        return {"count": len(self.matching(jql))}
+
+    def enhanced_jql(self, jql: str, fields: str = "*all", nextPageToken: Optional[str] = None, limit: int = 50):
+        with self.lock:
+            self.requests.append(time.monotonic())
+            number = len(self.requests)
+        time.sleep(self.latency)
+        if number == self.fail_request:
+            response = requests.Response()
+            response.status_code = 429
+            response.headers["Retry-After"] = str(self.retry_after)
+            raise requests.HTTPError("429 Too Many Requests", response=response)
+        start = int(nextPageToken or 0)
+        page = self.matching(jql)[start:start + limit]
+        if fields != "*all":
+            wanted = fields.split(",")
+            page = [{**issue, "fields": {f: issue["fields"].get(f) for f in wanted}} for issue in page]
+        end = start + len(page)
+        result = {"issues": page, "isLast": end >= len(self.matching(jql))}
+        if not result["isLast"]:
+            result["nextPageToken"] = str(end)
+        return result
+
+
+class NoCountJira(ShardableJira):
+    def approximate_issue_count(self, jql: str):
+        raise requests.HTTPError("404 Not Found")
+
+
+def created_minute(issue: Dict[str, Any]) -> str:
+    """The issue's ``created`` at minute precision in its own offset, as JQL compares it."""
+    return issue["fields"]["created"][:16].replace("T", " ")
+
+
+def keys(issues: List[Dict[str, Any]]) -> List[str]:
+    return [issue["key"] for issue in issues]
+
+
+def time_fetch(jira_issues, issues, latency: float, count_latency: float, workers: int, max_shard: int) -> Dict[str, Any]:
+    jira = ShardableJira(issues, latency, count_latency)
+    started = time.perf_counter()
+    if workers == 1:
+        fetched = jira_issues.fetch_all_issues(jira, JQL)
+    else:
+        fetched = jira_issues.fetch_sharded_issues(jira, JQL, workers=workers, max_shard_issues=max_shard)
+    elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 2), "issues": len(fetched), "page_requests": len(jira.requests), "count_requests": jira.counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the sharded JIRA fetch against a stand-in JIRA.")
+    parser.add_argument("--size", default="10k", help=f"Number of issues: {', '.join(synthetic.SIZES)} or a number")
+    parser.add_argument("--page-latency-ms", type=float, default=150, help="Artificial latency per page request")
+    parser.add_argument("--count-latency-ms", type=float, default=50, help="Artificial latency per count request")
+    parser.add_argument("--shard-size", type=int, default=1000, help="Target issues per shard")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    args = parser.parse_args()
+    size = synthetic.SIZES.get(args.size) or int(args.size)
+
+    from data import jira_issues
+    for name in ("tamkeen", "tamkeen.jira"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    issues = synthetic.generate_jira_issues(size, args.seed)
+
+    latency, count_latency = args.page_latency_ms / 1000, args.count_latency_ms / 1000
+    report = {"issues": size}
+    for workers in (1, 2, 4, 8):
+        label = "serial" if workers == 1 else f"sharded_{workers}"
+        report[label] = time_fetch(jira_issues, issues, latency, count_latency, workers, args.shard_size)
+    for workers in (2, 4, 8):
+        report[f"sharded_{workers}"]["speedup"] = round(
+            report["serial"]["seconds"] / report[f"sharded_{workers}"]["seconds"], 1
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
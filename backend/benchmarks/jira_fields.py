@@ -0,0 +1,132 @@
+"""JIRA field projection payload timings against a stand-in JIRA.
+
+Pads the synthetic issues with custom fields that are empty on (nearly)
+every issue, as ``fields=*all`` returns them for a real instance, and serves
+them from an in-memory ``enhanced_jql`` that honours the ``fields``
+parameter and round-trips every page through JSON. It then compares a full
+fetch with ``*all`` against the ``auto`` projection: bytes downloaded, JSON
+parse time, ``prepare_dataset`` time and width. The behaviour is covered by
+``tests/test_jira_fields.py``, which uses the same stand-in JIRA.
+
+Runs inside a temporary directory.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.jira_fields --size 10k --empty-fields 300
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks import synthetic
+
+SPARSE_FIELD = ("customfield_19000", "Escalation Reason")
+
+
+class StandInJira:
+    """In-memory ``enhanced_jql`` and ``get_all_fields`` that count what they serve."""
+
+    def __init__(self, issues: List[Dict[str, Any]], catalogue: List[Dict[str, Any]]):
+        self.issues = issues
+        self.catalogue = catalogue
+        self.catalogue_calls = 0
+        self.bytes = 0
+        self.parse_seconds = 0.0
+        self.issues_served = 0
+
+    def reset(self):
+        self.bytes = 0
+        self.parse_seconds = 0.0
+        self.issues_served = 0
+
+    def get_all_fields(self) -> List[Dict[str, Any]]:
+        self.catalogue_calls += 1
+        return self.catalogue
+
+    def enhanced_jql(self, jql: str, fields: str = "*all", nextPageToken: Optional[str] = None, limit: int = 50):
+        start = int(nextPageToken or 0)
+        page = self.issues[start:start + limit]
+        if fields != "*all":
+            wanted = fields.split(",")
+            page = [{**issue, "fields": {f: issue["fields"].get(f) for f in wanted}} for issue in page]
+        end = start + len(page)
+        body = json.dumps({"issues": page, "nextPageToken": str(end), "isLast": end >= len(self.issues)})
+        self.bytes += len(body.encode("utf-8"))
+        self.issues_served += len(page)
+        started = time.perf_counter()
+        result = json.loads(body)
+        self.parse_seconds += time.perf_counter() - started
+        if result["isLast"]:
+            del result["nextPageToken"]
+        return result
+
+
+def padded_issues(size: int, seed: int, empty_fields: int):
+    """Synthetic issues plus ``empty_fields`` null custom fields and one sparse one."""
+    issues = synthetic.generate_jira_issues(size, seed)
+    padding = [f"customfield_{20000 + i}" for i in range(empty_fields)]
+    for n, issue in enumerate(issues):
+        issue["fields"].update(dict.fromkeys(padding))
+        issue["fields"][SPARSE_FIELD[0]] = {"value": "Regulator"} if n % 200 == 0 else None
+    catalogue = synthetic.jira_field_catalogue() + [
+        {"id": field_id, "name": f"Unused Field {i}", "custom": True} for i, field_id in enumerate(padding)
+    ] + [{"id": SPARSE_FIELD[0], "name": SPARSE_FIELD[1], "custom": True}]
+    return issues, catalogue
+
+
+def measure(jira_issues, jira: StandInJira, fields: str) -> Dict[str, Any]:
+    jira.reset()
+    started = time.perf_counter()
+    issues = jira_issues.fetch_all_issues(jira, "project = DMD", fields=fields)
+    fetched = time.perf_counter() - started
+    started = time.perf_counter()
+    df = jira_issues.prepare_dataset(issues, jira)
+    prepared = time.perf_counter() - started
+    return {
+        "download_mb": round(jira.bytes / 1e6, 2),
+        "json_parse_ms": round(jira.parse_seconds * 1000, 1),
+        "fetch_ms": round(fetched * 1000, 1),
+        "prepare_dataset_ms": round(prepared * 1000, 1),
+        "columns": len(df.columns),
+        "dataframe_mb": round(df.memory_usage(deep=True).sum() / 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the JIRA field projection on synthetic issues.")
+    parser.add_argument("--size", default="10k", help=f"Number of issues: {', '.join(synthetic.SIZES)} or a number")
+    parser.add_argument("--empty-fields", type=int, default=300, help="Custom fields that are empty on every issue")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    args = parser.parse_args()
+    size = synthetic.SIZES.get(args.size) or int(args.size)
+
+    from data import jira_issues
+    for name in ("tamkeen", "tamkeen.jira"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    issues, catalogue = padded_issues(size, args.seed, args.empty_fields)
+    jira = StandInJira(issues, catalogue)
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            projection = jira_issues.resolve_field_projection(jira, "project = DMD", {}, spec="auto")
+            report = {
+                "issues": size,
+                "all_fields": measure(jira_issues, jira, "*all"),
+                "auto_projection": measure(jira_issues, jira, jira_issues.fields_param(projection["fields"])),
+            }
+        finally:
+            os.chdir(original_dir)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Data-path benchmark suite on synthetic JIRA and Freshservice datasets.
+
+Cases, each run at every requested size:
+
+- ``jira.prepare_dataset``: raw ``enhanced_jql`` issues -> typed DataFrame
+- ``jira.cache_load``: ``read_issues_cache`` of the prepared dataset
+- ``jira.query.<name>``: the SQL corpus through ``JiraHandler.query_demands``
+- ``jira.profile_dataset``: the column profile behind ``describe_dataset``
+- ``jira.build_rollups``: the rollup tables built with every published generation
+- ``jira.search_index_build`` / ``jira.search_index_resync``: indexing every demand
+  into an empty search index, and syncing an unchanged dataset (a restart)
+- ``jira.search.<name>``: ``JiraHandler.search`` queries
+- ``freshservice.prepare_df_for_pandasql``: list columns of raw tickets -> JSON text
+- ``freshservice.fetch_tickets``: ``fetch_freshservice_tickets`` with pages served
+  from memory (pagination, ``json_normalize``, agent merge, post-processing)
+- ``freshservice.cache_load``: ``read_tickets_cache`` of the processed tickets
+- ``freshservice.query.<name>``: the SQL corpus through ``FreshserviceHandler.query_tickets``
+- ``freshservice.profile_dataset``: the column profile behind ``describe_dataset``
+- ``freshservice.build_rollups``: the rollup tables built with every published generation
+- ``freshservice.search_index_build`` / ``freshservice.search_index_resync``: as for JIRA
+- ``freshservice.search.<name>``: ``FreshserviceHandler.search`` queries
+
+The ``*_rollup`` queries answer the same question as the query without the
+suffix from a rollup table.
+
+Queries are timed with the handler's result cache cleared before every run,
+so they measure the query engine, not cache hits. Everything runs inside a
+temporary directory, so no real cache file is read or written.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.run --sizes 1k,10k --output reports/before.json
+    python -m benchmarks.compare reports/before.json reports/after.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks import synthetic
+
+REPORT_VERSION = 1
+
+JIRA_QUERIES = {
+    "count": "SELECT COUNT(*) FROM df",
+    "status_breakdown": 'SELECT "Status (status)", COUNT(*) AS n FROM df GROUP BY 1 ORDER BY n DESC',
+    "priority_by_status": 'SELECT "Priority (priority)", "Status (status)", COUNT(*) AS n FROM df GROUP BY 1, 2',
+    "latest_created": 'SELECT Jira, "Summary (summary)", "Created (created)" FROM df ORDER BY "Created (created)" DESC LIMIT 20',
+    "summary_search": "SELECT Jira, \"Summary (summary)\" FROM df WHERE \"Summary (summary)\" LIKE '%payment%' LIMIT 50",
+    "open_by_assignee": 'SELECT "Assignee (assignee)", COUNT(*) AS n FROM df WHERE "Resolution (resolution)" IS NULL GROUP BY 1 ORDER BY n DESC',
+    "label_filter": "SELECT Jira FROM df WHERE \"Labels (labels)\" LIKE '%backend%'",
+    "monthly_created": 'SELECT substr("Created (created)", 1, 7) AS month, COUNT(*) AS n FROM df GROUP BY month ORDER BY month',
+    "wide_page": "SELECT * FROM df LIMIT 200",
+    "status_breakdown_rollup": "SELECT status, SUM(demands) AS n FROM demands_by_status GROUP BY 1 ORDER BY n DESC",
+    "priority_by_status_rollup": "SELECT priority, status, SUM(demands) AS n FROM demands_by_status GROUP BY 1, 2",
+    "monthly_created_rollup": "SELECT month, SUM(demands) AS n FROM demands_created_monthly GROUP BY month ORDER BY month",
+}
+
+FRESHSERVICE_QUERIES = {
+    "count": "SELECT COUNT(*) FROM df",
+    "status_breakdown": "SELECT status, COUNT(*) AS n FROM df GROUP BY status ORDER BY n DESC",
+    "by_responder": "SELECT responder_name, COUNT(*) AS n FROM df WHERE status NOT IN ('Resolved', 'Closed') GROUP BY responder_name ORDER BY n DESC LIMIT 20",
+    "by_department": 'SELECT "department.name", priority, COUNT(*) AS n FROM df GROUP BY 1, 2',
+    "subject_search": "SELECT ticket_id, subject, status FROM df WHERE subject LIKE '%laptop%' LIMIT 50",
+    "tag_filter": "SELECT ticket_id FROM df WHERE tags LIKE '%vpn%'",
+    "monthly_created": "SELECT substr(created_at, 1, 7) AS month, COUNT(*) AS n FROM df GROUP BY month ORDER BY month",
+    "recent_resolved": 'SELECT ticket_id, subject, "stats.resolved_at" FROM df WHERE "stats.resolved_at" IS NOT NULL ORDER BY "stats.resolved_at" DESC LIMIT 20',
+    "wide_page": "SELECT * FROM df LIMIT 200",
+    "status_breakdown_rollup": "SELECT status, SUM(tickets) AS n FROM tickets_by_status GROUP BY status ORDER BY n DESC",
+    "by_responder_rollup": "SELECT responder_name, SUM(tickets) AS n FROM tickets_by_responder WHERE status NOT IN ('Resolved', 'Closed') GROUP BY responder_name ORDER BY n DESC LIMIT 20",
+    "by_department_rollup": "SELECT department, priority, SUM(tickets) AS n FROM tickets_created_weekly GROUP BY 1, 2",
+    "monthly_created_rollup": "SELECT substr(week, 1, 7) AS month, SUM(tickets) AS n FROM tickets_created_weekly GROUP BY month ORDER BY month",
+}
+
+
+JIRA_SEARCHES = {
+    "topic": ("payment", None),
+    "topic_filtered": ("payment dashboard", {"status": ["In Progress", "Done"]}),
+}
+
+FRESHSERVICE_SEARCHES = {
+    "topic": ("laptop", None),
+    "topic_filtered": ("vpn laptop", {"status": ["Open", "Pending"], "priority": [3, 4]}),
+}
+
+
+class FakeJiraClient:
+    """Stands in for the atlassian client where only the field catalogue is needed."""
+
+    def get_all_fields(self) -> List[Dict[str, Any]]:
+        return synthetic.jira_field_catalogue()
+
+
+def time_call(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    """Run ``fn`` ``repeats`` times and summarize the wall-clock durations in milliseconds."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "runs": repeats,
+    }
+
+
+@contextmanager
+def serve_freshservice_pages(freshservice_module, payloads: Dict[str, List[Dict[str, Any]]]):
+    """Serve Freshservice endpoint pages from memory instead of the API."""
+    per_page = freshservice_module.PER_PAGE
+
+    def fetch_page(endpoint, params, page, gate):
+        records = payloads.get(endpoint, [])
+        start = (page - 1) * per_page
+        return records[start:start + per_page], start + per_page < len(records)
+
+    original = freshservice_module.fetch_page
+    freshservice_module.fetch_page = fetch_page
+    try:
+        yield
+    finally:
+        freshservice_module.fetch_page = original
+
+
+def time_search_index(handler, df: pd.DataFrame, prefix: str, repeats: int, results: Dict[str, Dict[str, Any]], label: str):
+    """Time full builds into fresh index files, a resync of unchanged data and the search corpus."""
+    from mcp_handlers.search_index import SearchIndex
+
+    index = handler.search_index
+    builds = iter(range(repeats))
+
+    def build():
+        path = f"bench_{prefix}_search_{label}_{next(builds)}.sqlite"
+        SearchIndex(path, index.key, index.title, index.body, index.columns).sync(df)
+
+    results.setdefault(f"{prefix}.search_index_build", {})[label] = time_call(build, repeats)
+    results.setdefault(f"{prefix}.search_index_resync", {})[label] = time_call(lambda: index.sync(df), repeats)
+    searches = JIRA_SEARCHES if prefix == "jira" else FRESHSERVICE_SEARCHES
+    for name, (query, filters) in searches.items():
+        results.setdefault(f"{prefix}.search.{name}", {})[label] = time_call(
+            lambda query=query, filters=filters: handler.search(query, filters), repeats
+        )
+
+
+def _git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def _quiet_logs():
+    """Keep per-page progress logging out of the timings."""
+    for name in ("tamkeen", "tamkeen.jira", "tamkeen.freshservice", "tamkeen.benchmarks"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def run_jira(size: int, seed: int, repeats: int, results: Dict[str, Dict[str, Any]], label: str):
+    from data.jira_issues import prepare_dataset, read_issues_cache, write_issues_cache
+    from mcp_handlers import JiraHandler
+    from mcp_handlers.dataset_profile import profile_dataset
+    from mcp_handlers.rollups import JIRA_ROLLUPS, build_rollups
+
+    issues = synthetic.generate_jira_issues(size, seed)
+    client = FakeJiraClient()
+    results.setdefault("jira.prepare_dataset", {})[label] = time_call(
+        lambda: prepare_dataset(issues, client), repeats
+    )
+
+    df = prepare_dataset(issues, client)
+    del issues
+    write_issues_cache(df, "bench_jira.parquet")
+    results.setdefault("jira.cache_load", {})[label] = time_call(
+        lambda: read_issues_cache("bench_jira.parquet"), repeats
+    )
+
+    handler = JiraHandler(logging.getLogger("tamkeen.benchmarks"), load_cache=False)
+    handler._publish_data(df)
+    for name, sql in JIRA_QUERIES.items():
+        def query(sql=sql):
+            handler.query_cache.clear()
+            handler.query_demands(sql)
+        results.setdefault(f"jira.query.{name}", {})[label] = time_call(query, repeats)
+    results.setdefault("jira.profile_dataset", {})[label] = time_call(lambda: profile_dataset(df), repeats)
+    results.setdefault("jira.build_rollups", {})[label] = time_call(lambda: build_rollups(df, JIRA_ROLLUPS), repeats)
+    time_search_index(handler, df, "jira", repeats, results, label)
+
+
+def run_freshservice(size: int, seed: int, repeats: int, results: Dict[str, Dict[str, Any]], label: str):
+    import freshservice
+    from mcp_handlers import FreshserviceHandler
+    from mcp_handlers.dataset_profile import profile_dataset
+    from mcp_handlers.rollups import FRESHSERVICE_ROLLUPS, build_rollups
+
+    agents = synthetic.generate_freshservice_agents(max(10, size // 100), seed)
+    tickets = synthetic.generate_freshservice_tickets(size, len(agents), seed)
+
+    raw = pd.json_normalize(tickets)
+    results.setdefault("freshservice.prepare_df_for_pandasql", {})[label] = time_call(
+        lambda: freshservice.prepare_df_for_pandasql(raw), repeats
+    )
+    del raw
+
+    with serve_freshservice_pages(freshservice, {"tickets": tickets, "agents": agents}):
+        results.setdefault("freshservice.fetch_tickets", {})[label] = time_call(
+            freshservice.fetch_freshservice_tickets, repeats
+        )
+        df = freshservice.fetch_freshservice_tickets()
+    del tickets
+
+    freshservice.write_tickets_cache(df, "bench_tickets.parquet")
+    results.setdefault("freshservice.cache_load", {})[label] = time_call(
+        lambda: freshservice.read_tickets_cache("bench_tickets.parquet"), repeats
+    )
+
+    handler = FreshserviceHandler(logging.getLogger("tamkeen.benchmarks"), load_cache=False)
+    handler._publish_data(df)
+    for name, sql in FRESHSERVICE_QUERIES.items():
+        def query(sql=sql):
+            handler.query_cache.clear()
+            handler.query_tickets(sql)
+        results.setdefault(f"freshservice.query.{name}", {})[label] = time_call(query, repeats)
+    results.setdefault("freshservice.profile_dataset", {})[label] = time_call(lambda: profile_dataset(df), repeats)
+    results.setdefault("freshservice.build_rollups", {})[label] = time_call(
+        lambda: build_rollups(df, FRESHSERVICE_ROLLUPS), repeats
+    )
+    time_search_index(handler, df, "freshservice", repeats, results, label)
+
+
+SUITES = {"jira": run_jira, "freshservice": run_freshservice}
+
+
+def run(sizes: List[str], suites: List[str], repeats: int, seed: int) -> Dict[str, Any]:
+    """Run the selected suites at every size and return the report."""
+    from data.arrow_cache import CACHE_FORMAT
+    from mcp_handlers.query_engine import DEFAULT_QUERY_ENGINE
+
+    _quiet_logs()
+    report = {
+        "version": REPORT_VERSION,
+        "meta": {
+            **_git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "repeats": repeats,
+            "sizes": {label: synthetic.SIZES[label] for label in sizes},
+            "query_engine": DEFAULT_QUERY_ENGINE,
+            "data_cache_format": CACHE_FORMAT,
+        },
+        "results": {},
+    }
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="tamkeen_bench_") as workdir:
+        os.chdir(workdir)
+        try:
+            for label in sizes:
+                for suite in suites:
+                    print(f"⏱️  {suite} @ {label}", file=sys.stderr)
+                    SUITES[suite](synthetic.SIZES[label], seed, repeats, report["results"], label)
+        finally:
+            os.chdir(cwd)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data-path benchmarks on synthetic datasets.")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="Comma-separated sizes from: " + ", ".join(synthetic.SIZES))
+    parser.add_argument("--suites", default="jira,freshservice", help="Comma-separated suites from: " + ", ".join(SUITES))
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED, help="Synthetic data seed")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in synthetic.SIZES] + [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown size or suite: {', '.join(unknown)}")
+
+    report = run(sizes, suites, args.repeats, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"📄 Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Full-text search index timings on synthetic Freshservice tickets.
+
+Builds the ticket search index in a temporary directory, then times a full
+build, a resync of unchanged data, an incremental sync after a refresh that
+changed 1% of the tickets, and searches next to a ``LIKE`` count of the
+filtered search through the SQL engine. The behaviour is covered by
+``tests/test_search_index.py``, which uses the same refresh.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.search_index --size 100k
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks import synthetic
+from benchmarks.run import serve_freshservice_pages, time_call
+
+CHANGED_FRACTION = 0.01
+
+
+def refreshed(df: pd.DataFrame) -> pd.DataFrame:
+    """The tickets after a refresh: some edited, some deleted and one new."""
+    changed = max(1, int(len(df) * CHANGED_FRACTION))
+    after = df.iloc[changed:].copy()
+    after.iloc[:changed, after.columns.get_loc("subject")] = "Quarantined mailbox after phishing report"
+    new = df.iloc[[0]].copy()
+    new["ticket_id"] = df["ticket_id"].max() + 1
+    new["subject"] = "Zeppelin model on reception desk"
+    return pd.concat([after, new], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the ticket search index on synthetic tickets.")
+    parser.add_argument("--size", default="10k", help=f"Number of tickets: {', '.join(synthetic.SIZES)} or a number")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    args = parser.parse_args()
+    size = synthetic.SIZES.get(args.size) or int(args.size)
+
+    import freshservice
+    from mcp_handlers import FreshserviceHandler
+    from mcp_handlers.search_index import SearchIndex
+    for name in ("tamkeen", "tamkeen.freshservice"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    agents = synthetic.generate_freshservice_agents(max(10, size // 100), args.seed)
+    tickets = synthetic.generate_freshservice_tickets(size, len(agents), args.seed)
+    with serve_freshservice_pages(freshservice, {"tickets": tickets, "agents": agents}):
+        df = freshservice.fetch_freshservice_tickets()
+    del tickets
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        handler = FreshserviceHandler(logging.getLogger("tamkeen.benchmarks"), load_cache=False)
+        index = handler.search_index
+        builds = iter(range(args.repeats))
+        after = refreshed(df)
+        report = {
+            "tickets": size,
+            "build": time_call(
+                lambda: SearchIndex(f"build-{next(builds)}.sqlite", index.key, index.title, index.body, index.columns).sync(df),
+                args.repeats,
+            ),
+            "resync_unchanged": time_call(lambda: index.sync(df), args.repeats),
+            "sync_after_refresh": time_call(lambda: (index.sync(df), index.sync(after)), args.repeats),
+            "index_mb": round(os.path.getsize(index.path) / 2**20, 1),
+        }
+        handler._publish_data(df)
+        report["search_topic"] = time_call(lambda: handler.search("laptop vpn"), args.repeats)
+        report["search_filtered"] = time_call(
+            lambda: handler.search("laptop", {"status": ["Open", "Pending"], "priority": [3, 4]}), args.repeats
+        )
+        report["like_count"] = time_call(
+            lambda: handler.store.query(
+                "SELECT COUNT(*) FROM df WHERE (subject LIKE '%laptop%' OR description_text LIKE '%laptop%') "
+                "AND status IN ('Open', 'Pending') AND priority IN (3, 4)"
+            ),
+            args.repeats,
+        )
+        os.chdir("/")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
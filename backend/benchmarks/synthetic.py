@@ -0,0 +1,274 @@
+"""Deterministic synthetic JIRA and Freshservice payloads.
+
+The generators return data shaped like the real API responses the data path
+consumes: JIRA issues as returned by ``enhanced_jql`` (``key`` + ``fields``
+with users, options, statuses, arrays and ISO timestamps), the matching
+``get_all_fields`` catalogue, and Freshservice ``tickets`` (with the
+``requester``, ``department``, ``requested_for`` and ``stats`` includes) and
+``agents`` records. The same seed and size always produce the same data.
+Nested objects that repeat in real payloads (users, options, statuses) are
+shared between records to keep 100k-row datasets affordable in memory.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+DEFAULT_SEED = 20240101
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_SITE = "https://example.atlassian.net/rest/api/2"
+
+_WORDS = (
+    "payment portal login report dashboard employee onboarding invoice approval workflow "
+    "integration mobile notification export vendor contract renewal access request laptop "
+    "network printer license migration backend frontend api timeout error performance "
+    "customer experience training survey salary leave attendance certificate upload"
+).split()
+
+JIRA_STATUSES = [
+    ("Backlog", "new"), ("Ready For Analysis", "new"), ("In Analysis", "indeterminate"),
+    ("In Development", "indeterminate"), ("In Testing", "indeterminate"),
+    ("READY TO ACCEPT", "indeterminate"), ("Done", "done"), ("Cancelled", "done"),
+]
+JIRA_PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+JIRA_ISSUE_TYPES = ["Demand", "Epic", "Story", "Bug"]
+JIRA_DEMAND_TYPES = ["New Feature", "Enhancement", "Bug Fix", "Integration", "Report"]
+JIRA_TECH_TEAMS = ["BA", "Dev", "QA", "UX", "DevOps", "Data"]
+JIRA_LABELS = ["backend", "frontend", "mobile", "urgent", "customer", "compliance", "tech-debt"]
+
+# (field id, field name, kind) for every field an issue carries
+JIRA_FIELDS = [
+    ("summary", "Summary", "text"),
+    ("description", "Description", "long_text"),
+    ("status", "Status", "status"),
+    ("statusCategory", "Status Category", "status_category"),
+    ("priority", "Priority", "priority"),
+    ("issuetype", "Issue Type", "issue_type"),
+    ("project", "Project", "project"),
+    ("assignee", "Assignee", "user"),
+    ("reporter", "Reporter", "user"),
+    ("creator", "Creator", "user"),
+    ("created", "Created", "datetime"),
+    ("updated", "Updated", "datetime"),
+    ("statuscategorychangedate", "Status Category Changed", "datetime"),
+    ("resolutiondate", "Resolved", "optional_datetime"),
+    ("duedate", "Due date", "date"),
+    ("resolution", "Resolution", "resolution"),
+    ("labels", "Labels", "labels"),
+    ("fixVersions", "Fix versions", "versions"),
+    ("components", "Components", "components"),
+    ("issuelinks", "Linked Issues", "links"),
+    ("timeestimate", "Remaining Estimate", "seconds"),
+    ("aggregatetimeoriginalestimate", "Σ Original Estimate", "seconds"),
+    ("watches", "Watchers", "watches"),
+    ("customfield_10346", "Demand Type", "demand_type"),
+    ("customfield_10348", "Tech Teams", "tech_teams"),
+    ("customfield_10349", "Demand Source", "demand_source"),
+    ("customfield_10477", "Demand Classification", "classification"),
+    ("customfield_10345", "Requested By", "user"),
+    ("customfield_10016", "Story Points", "points"),
+    ("customfield_10510", "Must-Have", "flag"),
+    ("customfield_10101", "Steps to Reproduce", "optional_text"),
+]
+
+FRESHSERVICE_DEPARTMENTS = ["IT", "HR", "Finance", "Operations", "Legal", "Customer Care"]
+FRESHSERVICE_CATEGORIES = ["Hardware", "Software", "Network", "Access", "Facilities"]
+FRESHSERVICE_SOURCES = [1, 2, 3, 4, 9]
+FRESHSERVICE_STATUSES = [2, 3, 4, 5, 6, 11, 12, 13]
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(count))
+
+
+def _timestamp(moment: datetime, jira: bool = False) -> str:
+    if jira:
+        # JIRA style: milliseconds and a numeric offset
+        return moment.astimezone(timezone(timedelta(hours=3))).strftime("%Y-%m-%dT%H:%M:%S.000%z")
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _jira_user(i: int) -> Dict[str, Any]:
+    return {
+        "self": f"{_SITE}/user?accountId=acc-{i:04d}",
+        "accountId": f"acc-{i:04d}",
+        "emailAddress": f"user{i}@example.com",
+        "avatarUrls": {"48x48": f"https://avatars.example.com/{i}.png"},
+        "displayName": f"User {i:03d}",
+        "active": True,
+        "timeZone": "Asia/Riyadh",
+        "accountType": "atlassian",
+    }
+
+
+def _jira_option(option_id: int, value: str) -> Dict[str, Any]:
+    return {"self": f"{_SITE}/customFieldOption/{option_id}", "value": value, "id": str(option_id)}
+
+
+def jira_field_catalogue() -> List[Dict[str, Any]]:
+    """The ``get_all_fields`` response for the synthetic issues."""
+    return [
+        {"id": field_id, "name": name, "custom": field_id.startswith("customfield_")}
+        for field_id, name, _ in JIRA_FIELDS
+    ]
+
+
+def generate_jira_issues(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Generate ``count`` JIRA issues as returned in ``enhanced_jql`` pages."""
+    rng = random.Random(seed)
+    users = [_jira_user(i) for i in range(max(10, count // 50))]
+    statuses = [
+        {
+            "self": f"{_SITE}/status/{10000 + i}",
+            "name": name,
+            "id": str(10000 + i),
+            "statusCategory": {"self": f"{_SITE}/statuscategory/{i}", "id": i, "key": key, "name": key.title()},
+        }
+        for i, (name, key) in enumerate(JIRA_STATUSES)
+    ]
+    priorities = [
+        {"self": f"{_SITE}/priority/{i}", "iconUrl": f"https://example.com/p{i}.svg", "name": name, "id": str(i)}
+        for i, name in enumerate(JIRA_PRIORITIES, 1)
+    ]
+    issue_types = [{"self": f"{_SITE}/issuetype/{i}", "id": str(i), "name": name, "subtask": False}
+                   for i, name in enumerate(JIRA_ISSUE_TYPES, 1)]
+    project = {"self": f"{_SITE}/project/10000", "id": "10000", "key": "DMD", "name": "Demands"}
+    resolution = {"self": f"{_SITE}/resolution/1", "id": "1", "name": "Done"}
+    demand_types = [_jira_option(10449 + i, v) for i, v in enumerate(JIRA_DEMAND_TYPES)]
+    tech_teams = [_jira_option(10460 + i, v) for i, v in enumerate(JIRA_TECH_TEAMS)]
+    sources = [_jira_option(10467 + i, v) for i, v in enumerate(["Backlog", "Request", "Audit"])]
+    classifications = [_jira_option(10619 + i, v) for i, v in enumerate(["Customer Experience", "Operations", "Regulatory"])]
+    versions = [{"self": f"{_SITE}/version/{i}", "id": str(i), "name": f"R{i}", "released": i < 8} for i in range(12)]
+    components = [{"self": f"{_SITE}/component/{i}", "id": str(i), "name": name}
+                  for i, name in enumerate(["Portal", "Mobile", "Payments", "Reporting"])]
+    flag = [_jira_option(10700, "Yes")]
+
+    issues = []
+    for n in range(count):
+        key = f"DMD-{n + 1}"
+        created = _BASE_TIME + timedelta(minutes=rng.randrange(0, 60 * 24 * 600))
+        updated = created + timedelta(minutes=rng.randrange(0, 60 * 24 * 60))
+        status = rng.choice(statuses)
+        done = status["statusCategory"]["key"] == "done"
+        values = {
+            "text": lambda: _words(rng, rng.randint(4, 10)),
+            "long_text": lambda: _words(rng, rng.randint(20, 80)),
+            "optional_text": lambda: _words(rng, 12) if rng.random() < 0.2 else None,
+            "status": lambda: status,
+            "status_category": lambda: status["statusCategory"],
+            "priority": lambda: rng.choice(priorities),
+            "issue_type": lambda: rng.choice(issue_types),
+            "project": lambda: project,
+            "user": lambda: rng.choice(users) if rng.random() < 0.9 else None,
+            "datetime": lambda: _timestamp(updated if rng.random() < 0.5 else created, jira=True),
+            "optional_datetime": lambda: _timestamp(updated, jira=True) if done else None,
+            "date": lambda: (created + timedelta(days=rng.randrange(7, 120))).strftime("%Y-%m-%d") if rng.random() < 0.6 else None,
+            "resolution": lambda: resolution if done else None,
+            "labels": lambda: rng.sample(JIRA_LABELS, rng.randint(0, 3)),
+            "versions": lambda: rng.sample(versions, rng.randint(0, 2)),
+            "components": lambda: rng.sample(components, rng.randint(0, 2)),
+            "links": lambda: [
+                {
+                    "id": str(rng.randrange(30000, 40000)),
+                    "type": {"id": "10000", "name": "Blocks", "inward": "is blocked by", "outward": "blocks"},
+                    "outwardIssue": {"id": str(m), "key": f"DMD-{m}"},
+                }
+                for m in rng.sample(range(1, count + 1), min(count, rng.choice((0, 0, 1, 2))))
+            ],
+            "seconds": lambda: rng.choice((None, 3600 * rng.randint(1, 80))),
+            "watches": lambda: {"self": f"{_SITE}/issue/{key}/watchers", "watchCount": rng.randint(0, 6), "isWatching": False},
+            "demand_type": lambda: rng.choice(demand_types),
+            "tech_teams": lambda: rng.sample(tech_teams, rng.randint(1, 3)),
+            "demand_source": lambda: rng.choice(sources),
+            "classification": lambda: rng.choice(classifications) if rng.random() < 0.8 else None,
+            "points": lambda: rng.choice((None, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0)),
+            "flag": lambda: flag if rng.random() < 0.3 else None,
+        }
+        fields = {field_id: values[kind]() for field_id, _, kind in JIRA_FIELDS}
+        fields["created"] = _timestamp(created, jira=True)
+        fields["updated"] = _timestamp(updated, jira=True)
+        issues.append({
+            "expand": "operations,versionedRepresentations,editmeta,changelog,renderedFields",
+            "id": str(20000 + n),
+            "self": f"{_SITE}/issue/{20000 + n}",
+            "key": key,
+            "fields": fields,
+        })
+    return issues
+
+
+def generate_freshservice_agents(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Generate ``count`` agents as returned by the ``agents`` endpoint."""
+    rng = random.Random(seed + 1)
+    return [
+        {
+            "id": 5000 + i,
+            "first_name": f"Agent{i:03d}",
+            "last_name": rng.choice(["Alharbi", "Smith", "Khan", "Garcia", "Otieno", "Nguyen"]),
+            "email": f"agent{i}@example.com",
+            "active": rng.random() < 0.95,
+            "job_title": rng.choice(["Support Engineer", "Team Lead", "Analyst"]),
+            "department_ids": [rng.randrange(1, len(FRESHSERVICE_DEPARTMENTS) + 1)],
+            "created_at": _timestamp(_BASE_TIME - timedelta(days=rng.randrange(30, 900))),
+        }
+        for i in range(count)
+    ]
+
+
+def generate_freshservice_tickets(count: int, agent_count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Generate ``count`` tickets as returned by ``tickets?include=requester,department,requested_for,stats``."""
+    rng = random.Random(seed + 2)
+    departments = [{"id": i, "name": name} for i, name in enumerate(FRESHSERVICE_DEPARTMENTS, 1)]
+    requesters = [
+        {"id": 9000 + i, "name": f"Requester {i:04d}", "email": f"requester{i}@example.com", "mobile": None, "phone": None}
+        for i in range(max(20, count // 20))
+    ]
+
+    tickets = []
+    for n in range(count):
+        created = _BASE_TIME + timedelta(minutes=rng.randrange(0, 60 * 24 * 600))
+        updated = created + timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+        status = rng.choice(FRESHSERVICE_STATUSES)
+        resolved = status in (4, 5)
+        requester = rng.choice(requesters)
+        department = rng.choice(departments)
+        tickets.append({
+            "id": 10000 + n,
+            "subject": _words(rng, rng.randint(3, 9)).capitalize(),
+            "description_text": _words(rng, rng.randint(15, 60)),
+            "status": status,
+            "priority": rng.randint(1, 4),
+            "source": rng.choice(FRESHSERVICE_SOURCES),
+            "type": rng.choice(["Incident", "Service Request"]),
+            "category": rng.choice(FRESHSERVICE_CATEGORIES),
+            "sub_category": None,
+            "item_category": None,
+            "is_escalated": rng.random() < 0.05,
+            "tags": rng.sample(["vpn", "email", "laptop", "payroll", "sap", "printer"], rng.randint(0, 2)),
+            "cc_emails": [],
+            "fwd_emails": [],
+            "custom_fields": {"impacted_users": rng.randint(1, 50), "location": rng.choice(["Riyadh", "Jeddah", "Remote"])},
+            "created_at": _timestamp(created),
+            "updated_at": _timestamp(updated),
+            "due_by": _timestamp(created + timedelta(days=3)),
+            "fr_due_by": _timestamp(created + timedelta(hours=8)),
+            "requester_id": requester["id"],
+            "requested_for_id": requester["id"],
+            "responder_id": 5000 + rng.randrange(agent_count) if rng.random() < 0.85 else None,
+            "group_id": rng.randrange(1, 8),
+            "department_id": department["id"],
+            "workspace_id": 2,
+            "requester": requester,
+            "requested_for": requester,
+            "department": department,
+            "stats": {
+                "created_at": _timestamp(created),
+                "first_responded_at": _timestamp(created + timedelta(minutes=rng.randrange(5, 600))),
+                "resolved_at": _timestamp(updated) if resolved else None,
+                "closed_at": _timestamp(updated) if status == 5 else None,
+                "status_updated_at": _timestamp(updated),
+            },
+        })
+    return tickets
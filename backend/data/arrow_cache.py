@@ -0,0 +1,145 @@
+"""Memory-mapped Arrow IPC (Feather v2) copies of the Parquet dataset caches.
+
+With ``DATA_CACHE_FORMAT=arrow`` every Parquet cache write also writes an
+uncompressed Arrow IPC file next to it (``jira_issues_cache.arrow`` beside
+``jira_issues_cache.parquet``), and loads prefer that file when it is at least
+as new as the Parquet one. The file is opened with a memory map, so loading
+does no decoding: numeric columns and text columns (as ``string[pyarrow]``)
+point straight into the mapped pages, which the OS faults in on demand and can
+drop again under memory pressure. The Parquet file stays the source of truth;
+a missing or stale Arrow file is simply rebuilt from it.
+"""
+
+import os
+from typing import Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# "parquet" (decode into memory on load) or "arrow" (memory-mapped Arrow IPC copy)
+CACHE_FORMAT = os.getenv("DATA_CACHE_FORMAT", "parquet").lower()
+ARROW_SUFFIX = ".arrow"
+
+TypesMapper = Callable[[pa.DataType], Optional[object]]
+
+
+def arrow_cache_enabled() -> bool:
+    return CACHE_FORMAT == "arrow"
+
+
+def arrow_cache_path(parquet_path: str) -> str:
+    """Path of the Arrow copy that belongs to a Parquet cache."""
+    root, _ = os.path.splitext(parquet_path)
+    return root + ARROW_SUFFIX
+
+
+def _write_atomically(path: str, write: Callable[[str], None]):
+    """
+    Write a file under a temporary name in the same directory and rename it over ``path``.
+
+    Readers (and the next start after a crash mid-write) see either the old
+    file or the complete new one, never a truncated file. Processes that still
+    map the old file keep their mapping.
+
+    Parameters
+    ----------
+    path : str
+        Destination path.
+    write : callable
+        Writes the complete file to the path it is given.
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_arrow_table(table: pa.Table, path: str):
+    """
+    Write a table as an uncompressed Arrow IPC file, atomically.
+
+    Parameters
+    ----------
+    table : pa.Table
+        Table to write.
+    path : str
+        Destination path.
+    """
+    def write(tmp_path: str):
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    _write_atomically(path, write)
+
+
+def read_arrow_table(path: str) -> pa.Table:
+    """Open an Arrow IPC file as a memory-mapped table (no data is read yet)."""
+    return ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def arrow_types_mapper(types_mapper: Optional[TypesMapper] = None) -> TypesMapper:
+    """Types mapper that keeps text columns as ``string[pyarrow]`` views of the mapped buffers."""
+    string_dtype = pd.StringDtype("pyarrow")
+
+    def mapper(arrow_type: pa.DataType):
+        if types_mapper is not None:
+            dtype = types_mapper(arrow_type)
+            if dtype is not None:
+                return dtype
+        if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            return string_dtype
+        return None
+
+    return mapper
+
+
+def arrow_cache_is_fresh(parquet_path: str) -> bool:
+    """Return True if the Arrow copy exists and is not older than the Parquet cache."""
+    arrow_path = arrow_cache_path(parquet_path)
+    if not os.path.exists(arrow_path):
+        return False
+    if not os.path.exists(parquet_path):
+        return True
+    return os.path.getmtime(arrow_path) >= os.path.getmtime(parquet_path)
+
+
+def write_cache_table(table: pa.Table, parquet_path: str):
+    """Write a cache table to Parquet, plus its Arrow copy when the Arrow format is enabled, atomically."""
+    _write_atomically(parquet_path, lambda tmp_path: pq.write_table(table, tmp_path))
+    if arrow_cache_enabled():
+        write_arrow_table(table, arrow_cache_path(parquet_path))
+
+
+def read_cache_frame(parquet_path: str, types_mapper: Optional[TypesMapper] = None) -> pd.DataFrame:
+    """
+    Load a cached dataset, from its memory-mapped Arrow copy when enabled and fresh.
+
+    Parameters
+    ----------
+    parquet_path : str
+        Path of the Parquet cache.
+    types_mapper : callable, optional
+        Extra Arrow -> pandas type mapping (applied before the string mapping).
+
+    Returns
+    -------
+    pd.DataFrame
+        Cached dataset.
+    """
+    if not arrow_cache_enabled():
+        return pq.read_table(parquet_path).to_pandas(types_mapper=types_mapper)
+
+    if arrow_cache_is_fresh(parquet_path):
+        table = read_arrow_table(arrow_cache_path(parquet_path))
+    else:
+        # First load after enabling the format, or the Parquet file was replaced: rebuild the copy
+        write_arrow_table(pq.read_table(parquet_path), arrow_cache_path(parquet_path))
+        table = read_arrow_table(arrow_cache_path(parquet_path))
+    return table.to_pandas(types_mapper=arrow_types_mapper(types_mapper))
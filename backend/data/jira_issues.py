@@ -1,16 +1,25 @@
 """Fetch issues from JIRA using Atlassian Python API v3 and cache them locally."""
 
 import os
+import re
+import math
 import time
 import json
-from typing import Any, Dict, List, Optional
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import dotenv
 import pandas as pd
+import pyarrow as pa
 from atlassian import Jira
 
+from data.arrow_cache import read_cache_frame, write_cache_table
+from data.rate_limit import RateLimitGate, retry_after_seconds
+
 from logger_config import (
     setup_logging, log_success, log_data_loaded,
     log_error_with_retry, log_progress
@@ -24,8 +33,45 @@ logger = setup_logging("tamkeen.jira", use_color=True)
 # Constants
 CACHE_FILE = "jira_issues_cache.parquet"
 CACHE_METADATA_FILE = "jira_issues_cache_metadata.json"
+FIELD_CATALOGUE_FILE = "jira_fields_cache.json"
 DEFAULT_BATCH_SIZE = 100
 DEFAULT_CACHE_DURATION_HOURS = 24
+CACHE_DURATION_HOURS = int(os.getenv("JIRA_CACHE_HOURS", str(DEFAULT_CACHE_DURATION_HOURS)))
+
+# Incremental sync: "incremental" fetches only issues updated since the last sync, "full" refetches everything
+JIRA_SYNC_MODE = os.getenv("JIRA_SYNC_MODE", "incremental").lower()
+# Margin added to the updated-since window to cover clock skew between this host and JIRA
+JIRA_SYNC_OVERLAP_MINUTES = int(os.getenv("JIRA_SYNC_OVERLAP_MINUTES", "5"))
+# How often an incremental sync also sweeps out issues that left the JQL or were deleted
+JIRA_DELETE_SWEEP_HOURS = int(os.getenv("JIRA_DELETE_SWEEP_HOURS", "24"))
+
+# "sharded" splits large fetches into disjoint created-date windows paged concurrently, "serial" pages one JQL
+JIRA_FETCH_MODE = os.getenv("JIRA_FETCH_MODE", "sharded").lower()
+JIRA_FETCH_WORKERS = int(os.getenv("JIRA_FETCH_WORKERS", "4"))
+# Windows are halved until the approximate count of each is at most this many issues
+JIRA_SHARD_MAX_ISSUES = int(os.getenv("JIRA_SHARD_MAX_ISSUES", "1000"))
+MAX_SHARDS = 256
+
+# Field projection: "*all", a comma-separated allow-list of field ids or names, or "auto"
+# (optionally followed by fields to always keep, e.g. "auto,duedate,Demand Type")
+JIRA_FIELDS = os.getenv("JIRA_FIELDS", "*all").strip()
+# auto: drop fields that are empty on more than this percentage of a sample of issues
+JIRA_FIELD_MAX_NULL_PERCENT = float(os.getenv("JIRA_FIELD_MAX_NULL_PERCENT", "98"))
+JIRA_FIELD_PROBE_ISSUES = int(os.getenv("JIRA_FIELD_PROBE_ISSUES", "500"))
+# auto: how often the sample is taken again (a changed projection triggers a full sync)
+JIRA_FIELD_PROBE_HOURS = int(os.getenv("JIRA_FIELD_PROBE_HOURS", "168"))
+# How long the get_all_fields catalogue is reused before it is fetched again
+JIRA_FIELD_CATALOGUE_HOURS = int(os.getenv("JIRA_FIELD_CATALOGUE_HOURS", "24"))
+# Always requested: the incremental sync watermark is read from "updated"
+REQUIRED_FIELDS = ("updated",)
+
+# JIRA objects are reduced to the first of these keys they carry
+# (users -> displayName, options -> value, status/priority/type -> name, issues -> key)
+OBJECT_LABEL_KEYS = ("displayName", "value", "name", "key", "filename")
+ISO_DATE_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$"
+)
+STRING_LIST_DTYPE = pd.ArrowDtype(pa.list_(pa.string()))
 
 # Environment variables
 JIRA_SERVER = os.getenv("JIRA_SERVER")
@@ -53,7 +99,7 @@ def get_jira_client() -> Jira:
     )
 
 
-def is_cache_valid(cache_duration_hours: int = DEFAULT_CACHE_DURATION_HOURS) -> bool:
+def is_cache_valid(cache_duration_hours: int = CACHE_DURATION_HOURS) -> bool:
     """Check if the cache is still valid based on age."""
     if not os.path.exists(CACHE_FILE):
         return False
@@ -89,7 +135,7 @@ def query_issues(
     """
     if not force_refresh and is_cache_valid():
         logger.info("📤 Reading JIRA issues from cache...")
-        df = pd.read_parquet(CACHE_FILE)
+        df = read_issues_cache()
         log_data_loaded(logger, "JIRA issues", len(df), "cache")
         return df
 
@@ -100,26 +146,389 @@ def query_issues(
     logger.info(f"🔍 Using JQL query: {jql_query}")
     try:
         jira_client = get_jira_client()
-        all_issues = fetch_all_issues(jira_client, jql_query)
-        all_issues_df = prepare_dataset(all_issues, jira_client)
+        metadata = read_cache_metadata()
+        projection = resolve_field_projection(jira_client, jql_query, metadata)
+
+        if can_sync_incrementally(jql_query, metadata, projection["fields"]):
+            all_issues_df, metadata = sync_issues(jira_client, jql_query, metadata)
+        else:
+            all_issues = fetch_issues(jira_client, jql_query, fields=fields_param(projection["fields"]))
+            all_issues_df = prepare_dataset(all_issues, jira_client)
+            now = datetime.now(timezone.utc).isoformat()
+            metadata = {
+                "jql": jql_query,
+                "watermark": get_updated_watermark(all_issues),
+                "last_full_sync": now,
+                "last_sync": now,
+                "last_sweep": now,
+            }
+        metadata.update(projection)
 
         # Save to cache
-        all_issues_df.to_parquet(CACHE_FILE)
+        write_issues_cache(all_issues_df)
+        write_cache_metadata(metadata)
 
         return all_issues_df
     except Exception as e:
         # If cache exists and there's an error, return cached data
         if os.path.exists(CACHE_FILE):
             logger.warning(f"Error fetching fresh data, using cache: {e}")
-            return pd.read_parquet(CACHE_FILE)
+            return read_issues_cache()
         raise
 
 
+def read_issues_cache(cache_file: str = CACHE_FILE) -> pd.DataFrame:
+    """
+    Read the typed JIRA dataset from its Parquet cache (or its Arrow copy).
+
+    List columns are restored as Arrow-backed list columns rather than
+    object columns of numpy arrays.
+
+    Parameters
+    ----------
+    cache_file : str, optional
+        Path of the Parquet cache.
+
+    Returns
+    -------
+    pd.DataFrame
+        Cached JIRA issues.
+    """
+    return read_cache_frame(cache_file, types_mapper=issues_types_mapper)
+
+
+def issues_types_mapper(arrow_type: pa.DataType):
+    """Arrow -> pandas type mapping that restores list columns as ``list<string>`` Arrow columns."""
+    return STRING_LIST_DTYPE if pa.types.is_list(arrow_type) else None
+
+
+def issues_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert the typed JIRA dataset to an Arrow table.
+
+    Arrow list columns are handed to Arrow as plain lists so the stored
+    pandas metadata stays readable, then cast back to ``list<string>`` so
+    columns that only hold empty lists keep their type.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Prepared JIRA issues.
+
+    Returns
+    -------
+    pa.Table
+        Table ready to be written to Parquet or Arrow IPC.
+    """
+    list_columns = [col for col in df.columns if _is_list_dtype(df[col].dtype)]
+    table = pa.Table.from_pandas(df.astype({col: object for col in list_columns}))
+    for col in list_columns:
+        position = table.schema.get_field_index(col)
+        table = table.set_column(
+            position, col, table.column(col).cast(STRING_LIST_DTYPE.pyarrow_dtype)
+        )
+    return table
+
+
+def write_issues_cache(df: pd.DataFrame, cache_file: str = CACHE_FILE):
+    """
+    Write the typed JIRA dataset to its Parquet cache (and Arrow copy, if enabled).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Prepared JIRA issues.
+    cache_file : str, optional
+        Path of the Parquet cache.
+    """
+    write_cache_table(issues_table(df), cache_file)
+
+
+def read_cache_metadata() -> Dict[str, Any]:
+    """Read the sync metadata stored next to the cache, or an empty dict if there is none."""
+    if not os.path.exists(CACHE_METADATA_FILE):
+        return {}
+    try:
+        with open(CACHE_METADATA_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {CACHE_METADATA_FILE}: {e}")
+        return {}
+
+
+def write_cache_metadata(metadata: Dict[str, Any]):
+    """Atomically write the sync metadata stored next to the cache."""
+    tmp_file = f"{CACHE_METADATA_FILE}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_file, CACHE_METADATA_FILE)
+
+
+def can_sync_incrementally(
+    jql: str, metadata: Dict[str, Any], fields: Optional[List[str]] = None
+) -> bool:
+    """Return True if the cache can be brought up to date with an incremental sync."""
+    if JIRA_SYNC_MODE != "incremental":
+        return False
+    if not os.path.exists(CACHE_FILE):
+        return False
+    if metadata.get("jql") != jql or not metadata.get("watermark"):
+        logger.info("🔁 No usable sync metadata for this JQL, doing a full JIRA sync")
+        return False
+    if metadata.get("fields") != fields:
+        # Issues left unchanged would keep the columns of the old projection
+        logger.info("🔁 JIRA field projection changed, doing a full JIRA sync")
+        return False
+    return True
+
+
+def get_updated_watermark(
+    issues: List[Dict[str, Any]], previous: Optional[str] = None
+) -> Optional[str]:
+    """
+    Return the latest ``updated`` timestamp across issues, as a UTC ISO string.
+
+    Parameters
+    ----------
+    issues : List[Dict[str, Any]]
+        Raw JIRA issues.
+    previous : str, optional
+        Watermark from the previous sync, kept if no issue is newer.
+
+    Returns
+    -------
+    str or None
+        New high-water mark, or None if nothing carries an ``updated`` field.
+    """
+    timestamps = [pd.Timestamp(previous)] if previous else []
+    for issue in issues:
+        updated = issue.get("fields", {}).get("updated")
+        if updated:
+            timestamps.append(pd.Timestamp(updated).tz_convert("UTC"))
+    if not timestamps:
+        return None
+    return max(timestamps).isoformat()
+
+
+def updated_since_jql(jql: str, watermark: str, now: Optional[datetime] = None) -> str:
+    """
+    Restrict a JQL query to issues updated since a watermark.
+
+    Absolute JQL dates are read in the API user's timezone, so the window is
+    expressed as a relative date (``-90m``), which does not depend on it.
+
+    Parameters
+    ----------
+    jql : str
+        Base JQL query, optionally with an ORDER BY clause.
+    watermark : str
+        UTC ISO timestamp of the last synced update.
+    now : datetime, optional
+        Current time; defaults to the UTC clock.
+
+    Returns
+    -------
+    str
+        JQL selecting issues updated at or after the watermark, rewound by
+        ``JIRA_SYNC_OVERLAP_MINUTES``.
+    """
+    since = pd.Timestamp(watermark)
+    if since.tzinfo is None:
+        since = since.tz_localize("UTC")
+    elapsed = pd.Timestamp(now or datetime.now(timezone.utc)) - since
+    minutes = max(0, math.ceil(elapsed.total_seconds() / 60)) + JIRA_SYNC_OVERLAP_MINUTES
+    return f'({jql_condition(jql)}) AND updated >= "-{minutes}m" ORDER BY updated ASC'
+
+
+def jql_condition(jql: str) -> str:
+    """Return a JQL query without its ORDER BY clause."""
+    match = re.search(r"\border\s+by\b", jql, re.IGNORECASE)
+    return jql[:match.start()].strip() if match else jql.strip()
+
+
+def sync_issues(
+    jira_client: Jira, jql: str, metadata: Dict[str, Any]
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Bring the cached dataset up to date by fetching only recently updated issues.
+
+    Changed issues are upserted by key. Every ``JIRA_DELETE_SWEEP_HOURS`` the
+    sync also lists the keys still matching the JQL and drops the rest.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string the cache was built from.
+    metadata : Dict[str, Any]
+        Sync metadata of the current cache.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, Dict[str, Any]]
+        Updated dataset and its new sync metadata.
+    """
+    cached_df = read_issues_cache()
+    delta_jql = updated_since_jql(jql, metadata["watermark"])
+    logger.info(f"🔄 Incremental JIRA sync: {delta_jql}")
+
+    changed_issues = fetch_issues(jira_client, delta_jql, fields=fields_param(metadata.get("fields")))
+    df = cached_df
+    if changed_issues:
+        changed_df = prepare_dataset(changed_issues, jira_client)
+        df = merge_issues(cached_df, changed_df)
+    logger.info(f"🔄 Upserted {len(changed_issues)} changed JIRA issues")
+
+    now = datetime.now(timezone.utc)
+    metadata = {
+        **metadata,
+        "watermark": get_updated_watermark(changed_issues, metadata["watermark"]),
+        "last_sync": now.isoformat(),
+    }
+
+    last_sweep = metadata.get("last_sweep")
+    if not last_sweep or now - datetime.fromisoformat(last_sweep) >= timedelta(hours=JIRA_DELETE_SWEEP_HOURS):
+        df = sweep_deleted_issues(jira_client, jql, df)
+        metadata["last_sweep"] = now.isoformat()
+
+    return df, metadata
+
+
+def merge_issues(cached_df: pd.DataFrame, changed_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Upsert changed issues into the cached dataset by key.
+
+    Parameters
+    ----------
+    cached_df : pd.DataFrame
+        Cached dataset indexed by issue key.
+    changed_df : pd.DataFrame
+        Newly prepared issues indexed by issue key.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataset with changed issues replaced or appended, keeping typed columns.
+    """
+    if cached_df.empty:
+        return changed_df
+
+    # prepare_dataset types each column from the issues it is given, so the delta can
+    # disagree with the cache (``5`` vs ``'abc'``); bring both sides to one type first
+    cached_text, changed_text = {}, {}
+    for col in changed_df.columns.intersection(cached_df.columns):
+        cached_kind = _column_kind(cached_df[col])
+        changed_kind = _column_kind(changed_df[col])
+        if None in (cached_kind, changed_kind) or cached_kind == changed_kind:
+            continue
+        if cached_kind != "text":
+            cached_text[col] = _text_column(cached_df[col])
+        changed_text[col] = _text_column(changed_df[col])
+    if cached_text:
+        cached_df = cached_df.assign(**cached_text)
+    if changed_text:
+        changed_df = changed_df.assign(**changed_text)
+
+    with warnings.catch_warnings():
+        # All-null columns are re-typed below, so pandas' dtype deprecation notice does not apply
+        warnings.simplefilter("ignore", FutureWarning)
+        merged = pd.concat([cached_df.drop(index=changed_df.index, errors="ignore"), changed_df])
+
+    # A column that is all-null on one side comes back as object; restore the typed dtype
+    for col in merged.columns:
+        for source in (cached_df, changed_df):
+            if col not in source.columns or source[col].dtype == object:
+                continue
+            if merged[col].dtype == object:
+                try:
+                    if _column_kind(source[col]) == "numeric":
+                        # Integer columns gain nulls from the other side, so let pandas pick the width
+                        merged[col] = pd.to_numeric(merged[col])
+                    else:
+                        target = "category" if isinstance(source[col].dtype, pd.CategoricalDtype) else source[col].dtype
+                        merged[col] = merged[col].astype(target)
+                except (TypeError, ValueError):
+                    pass
+            break
+
+    return merged
+
+
+def _column_kind(column: pd.Series) -> Optional[str]:
+    """Return the value kind of a prepared column, or None if it holds no values."""
+    if not column.notna().any():
+        return None
+    dtype = column.dtype
+    if dtype == object or isinstance(dtype, pd.CategoricalDtype):
+        return "text"
+    if _is_list_dtype(dtype):
+        return "list"
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    return "text"
+
+
+def _text_value(value: Any) -> Optional[str]:
+    """Render one typed value the way the mixed-shape fallback of ``type_field_column`` does."""
+    if isinstance(value, list):
+        return json.dumps(value, default=str)
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return json.dumps(value, default=str)
+
+
+def _text_column(column: pd.Series) -> pd.Series:
+    """Turn a typed column into the object text column used for mixed-shape fields."""
+    return pd.Series([_text_value(v) for v in column.tolist()], index=column.index, dtype=object)
+
+
+def sweep_deleted_issues(jira_client: Jira, jql: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop issues that no longer match the JQL (deleted, moved or filtered out).
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string the cache was built from.
+    df : pd.DataFrame
+        Dataset indexed by issue key.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataset restricted to issues still returned by the JQL.
+    """
+    logger.info("🧹 Sweeping JIRA cache for deleted issues...")
+    live_keys = {issue.get("key") for issue in fetch_issues(jira_client, jql, fields="key")}
+    if not live_keys:
+        logger.warning("⚠️ Deletion sweep returned no issues, keeping the cache as is")
+        return df
+    stale = df.index.difference(list(live_keys))
+    if len(stale):
+        logger.info(f"🧹 Removing {len(stale)} issues no longer matching the JQL")
+        df = df.drop(index=stale)
+    return df
+
+
 def fetch_all_issues(
     jira_client: Jira,
     jql: str,
     batch_size: int = DEFAULT_BATCH_SIZE,
     max_retries: int = 3,
+    fields: str = "*all",
+    max_issues: Optional[int] = None,
+    gate: Optional[RateLimitGate] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fetch all issues from JIRA using the enhanced_jql method with pagination.
@@ -134,6 +543,13 @@ def fetch_all_issues(
         Number of issues to fetch per request.
     max_retries : int, optional
         Maximum number of retries for failed requests.
+    fields : str, optional
+        Fields to request for each issue.
+    max_issues : int, optional
+        Stop after this many issues instead of paging to the end.
+    gate : RateLimitGate, optional
+        Backoff shared with concurrent fetches: a failed request here holds
+        back every fetch using the same gate.
 
     Returns
     -------
@@ -149,12 +565,14 @@ def fetch_all_issues(
     while True:
         for attempt in range(max_retries):
             try:
+                if gate is not None:
+                    gate.wait()
                 # Use enhanced_jql for Jira Cloud v3 API
                 result = jira_client.enhanced_jql(
                     jql=jql,
-                    limit=batch_size,
+                    limit=batch_size if max_issues is None else min(batch_size, max_issues - total_fetched),
                     nextPageToken=next_page_token,
-                    fields="*all"
+                    fields=fields
                 )
 
                 # Extract issues from the result
@@ -192,6 +610,8 @@ def fetch_all_issues(
                 if is_last or not next_page_token:
                     logger.info(f"✅ Fetched all {total_fetched} issues")
                     return all_issues
+                if max_issues is not None and total_fetched >= max_issues:
+                    return all_issues[:max_issues]
 
                 break
 
@@ -200,11 +620,218 @@ def fetch_all_issues(
                     logger.error(f"Failed to fetch issues after {max_retries} attempts: {e}")
                     raise
                 log_error_with_retry(logger, e, attempt + 1, max_retries)
-                time.sleep(2**attempt)  # Exponential backoff
+                delay = retry_after_seconds(e) or 2**attempt  # Exponential backoff
+                if gate is not None:
+                    gate.pause(delay)
+                else:
+                    time.sleep(delay)
 
     return all_issues
 
 
+def fetch_issues(jira_client: Jira, jql: str, fields: str = "*all") -> List[Dict[str, Any]]:
+    """
+    Fetch all issues matching a JQL query, sharded when ``JIRA_FETCH_MODE`` is ``sharded``.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string.
+    fields : str, optional
+        Fields to request for each issue.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        List of JIRA issues as dictionaries.
+    """
+    if JIRA_FETCH_MODE == "sharded" and JIRA_FETCH_WORKERS > 1:
+        return fetch_sharded_issues(jira_client, jql, fields=fields)
+    return fetch_all_issues(jira_client, jql, fields=fields)
+
+
+def count_issues(jira_client: Jira, jql: str) -> Optional[int]:
+    """Return JIRA's approximate count of issues matching a JQL query, or None if unavailable."""
+    try:
+        result = jira_client.approximate_issue_count(jql)
+        return int(result["count"])
+    except Exception as e:
+        logger.debug(f"Approximate issue count unavailable: {e}")
+        return None
+
+
+def created_range(jira_client: Jira, condition: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return the oldest and newest ``created`` timestamps of the issues matching a JQL condition."""
+    bounds = []
+    for direction in ("ASC", "DESC"):
+        result = jira_client.enhanced_jql(
+            jql=f"({condition}) ORDER BY created {direction}", limit=1, fields="created"
+        )
+        issues = result.get("issues", []) if isinstance(result, dict) else []
+        created = issues[0].get("fields", {}).get("created") if issues else None
+        if not created:
+            return None
+        bounds.append(pd.Timestamp(created))
+    return bounds[0], bounds[1]
+
+
+def created_window_jql(
+    condition: str, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]
+) -> str:
+    """
+    Restrict a JQL condition to issues created in ``[start, end)``.
+
+    Bounds are written at minute precision in the timezone of the
+    timestamps (the one JIRA reports ``created`` in). A missing bound leaves
+    that side open.
+    """
+    clauses = [f"({condition})"]
+    if start is not None:
+        clauses.append(f'created >= "{start.strftime("%Y-%m-%d %H:%M")}"')
+    if end is not None:
+        clauses.append(f'created < "{end.strftime("%Y-%m-%d %H:%M")}"')
+    return " AND ".join(clauses) + " ORDER BY created ASC"
+
+
+def plan_created_shards(
+    jira_client: Jira,
+    jql: str,
+    pool: ThreadPoolExecutor,
+    max_shard_issues: int = JIRA_SHARD_MAX_ISSUES,
+    workers: int = JIRA_FETCH_WORKERS,
+) -> List[str]:
+    """
+    Split a JQL query into disjoint ``created`` windows of similar size.
+
+    The created range is halved until the approximate count of every window
+    is at most ``max_shard_issues``; counts run concurrently on ``pool``.
+    Without the count endpoint the range is split evenly into four windows
+    per worker. The first and last windows are open-ended, so together the
+    shards cover every issue matching the JQL.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string, optionally with an ORDER BY clause (ignored).
+    pool : ThreadPoolExecutor
+        Pool for the window counts.
+    max_shard_issues : int, optional
+        Largest window worth splitting further.
+    workers : int, optional
+        Concurrency the shards are fetched with.
+
+    Returns
+    -------
+    List[str]
+        Shard JQL queries, or just ``[jql]`` if the query is small or has no
+        created range.
+    """
+    condition = jql_condition(jql)
+    total = count_issues(jira_client, condition)
+    if total is not None and total <= max_shard_issues:
+        return [jql]
+    bounds = created_range(jira_client, condition)
+    if bounds is None:
+        return [jql]
+
+    minute = pd.Timedelta(minutes=1)
+    first, last = bounds[0].floor("min"), bounds[1].tz_convert(bounds[0].tz).floor("min") + minute
+
+    def midpoint(start: pd.Timestamp, end: pd.Timestamp) -> pd.Timestamp:
+        return (start + (end - start) / 2).floor("min")
+
+    if total is None:
+        step = (last - first) / (workers * 4)
+        edges = sorted({(first + step * i).floor("min") for i in range(1, workers * 4)} - {first})
+    else:
+        # (start, end, approximate count) per window, in created order
+        windows: List[Tuple[pd.Timestamp, pd.Timestamp, int]] = [(first, last, total)]
+        while len(windows) < MAX_SHARDS:
+            splittable = [
+                w for w in windows if w[2] > max_shard_issues and w[0] < midpoint(w[0], w[1]) < w[1]
+            ]
+            splittable = sorted(splittable, key=lambda w: -w[2])[:MAX_SHARDS - len(windows)]
+            if not splittable:
+                break
+            left_counts = list(pool.map(
+                lambda w: count_issues(jira_client, created_window_jql(condition, w[0], midpoint(w[0], w[1]))),
+                splittable,
+            ))
+            if any(count is None for count in left_counts):
+                break
+            halves = {}
+            for w, left in zip(splittable, left_counts):
+                mid = midpoint(w[0], w[1])
+                halves[w] = [(w[0], mid, left), (mid, w[1], max(w[2] - left, 0))]
+            windows = [half for w in windows for half in halves.get(w, [w])]
+        edges = [w[0] for w in windows[1:]]
+
+    if not edges:
+        return [jql]
+    starts = [None] + edges
+    ends = edges + [None]
+    return [created_window_jql(condition, start, end) for start, end in zip(starts, ends)]
+
+
+def fetch_sharded_issues(
+    jira_client: Jira,
+    jql: str,
+    fields: str = "*all",
+    workers: int = JIRA_FETCH_WORKERS,
+    max_shard_issues: int = JIRA_SHARD_MAX_ISSUES,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all issues matching a JQL query as concurrently paged ``created`` windows.
+
+    ``enhanced_jql`` pages follow a ``nextPageToken``, so one query can only
+    be paged serially. The query is split by ``plan_created_shards`` and the
+    shards are paged on a pool of ``workers`` threads that share one backoff
+    gate. Results are merged in created order and deduplicated by key.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string.
+    fields : str, optional
+        Fields to request for each issue.
+    workers : int, optional
+        Shards fetched at the same time.
+    max_shard_issues : int, optional
+        Target size of a shard.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        List of JIRA issues as dictionaries.
+    """
+    gate = RateLimitGate()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jira-shard") as pool:
+        shards = plan_created_shards(jira_client, jql, pool, max_shard_issues, workers)
+        if len(shards) == 1:
+            return fetch_all_issues(jira_client, jql, fields=fields)
+        logger.info(f"🧩 Fetching JIRA issues in {len(shards)} created-date shards, {workers} at a time")
+        futures = [pool.submit(fetch_all_issues, jira_client, shard, fields=fields, gate=gate) for shard in shards]
+        try:
+            results = [future.result() for future in futures]
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+    issues: Dict[str, Dict[str, Any]] = {}
+    for shard_issues in results:
+        for issue in shard_issues:
+            issues.setdefault(issue.get("key"), issue)
+    logger.info(f"✅ Fetched all {len(issues)} issues from {len(shards)} shards")
+    return list(issues.values())
+
+
 def prepare_dataset(all_issues: List[Dict[str, Any]], jira_client: Jira) -> pd.DataFrame:
     """
     Prepare the dataset from JIRA issues.
@@ -256,18 +883,125 @@ def prepare_dataset(all_issues: List[Dict[str, Any]], jira_client: Jira) -> pd.D
     if 'Key' in df.columns and not df.empty:
         df = df.set_index('Key')
 
-    # Convert all columns to string for consistency
-    for col in df.columns:
-        df[col] = df[col].map(lambda x: str(x) if x is not None else "")
+    # Turn raw JIRA values into compact typed columns
+    df = pd.DataFrame({col: type_field_column(df[col]) for col in df.columns}, index=df.index)
 
     logger.info(f"📊 Prepared dataset with {len(df)} issues and {len(df.columns)} fields")
 
     return df
 
 
-def get_field_id_map(jira_client: Jira) -> Dict[str, str]:
+def _is_list_dtype(dtype: Any) -> bool:
+    """Return True for Arrow-backed list columns."""
+    return isinstance(dtype, pd.ArrowDtype) and pa.types.is_list(dtype.pyarrow_dtype)
+
+
+def _is_missing(value: Any) -> bool:
+    """Return True for JSON nulls and the NaNs pandas uses for absent fields."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _object_label(value: Dict[str, Any]) -> Optional[str]:
+    """Return the human-readable label of a JIRA object, or None if it has none."""
+    for key in OBJECT_LABEL_KEYS:
+        label = value.get(key)
+        if isinstance(label, str):
+            return label
+    # Issue links point at the issue on the other side of the link
+    linked = value.get("outwardIssue") or value.get("inwardIssue")
+    if isinstance(linked, dict):
+        return linked.get("key")
+    return None
+
+
+def flatten_field_value(value: Any) -> Any:
     """
-    Return a mapping from field ID to field name.
+    Reduce a raw JIRA field value to a scalar or a list of strings.
+
+    Parameters
+    ----------
+    value : Any
+        Field value as returned by the JIRA API.
+
+    Returns
+    -------
+    Any
+        Objects become their label (or JSON if they have none), arrays become
+        lists of labels and scalars are returned unchanged.
+    """
+    if isinstance(value, dict):
+        label = _object_label(value)
+        return label if label is not None else json.dumps(value, default=str)
+    if isinstance(value, list):
+        items = []
+        for item in value:
+            if isinstance(item, dict):
+                label = _object_label(item)
+                items.append(label if label is not None else json.dumps(item, default=str))
+            elif isinstance(item, str):
+                items.append(item)
+            elif not _is_missing(item):
+                items.append(json.dumps(item, default=str))
+        return items
+    return value
+
+
+def type_field_column(raw: pd.Series) -> pd.Series:
+    """
+    Convert a column of raw JIRA field values into a typed column.
+
+    Parameters
+    ----------
+    raw : pd.Series
+        Raw values of one JIRA field across all issues.
+
+    Returns
+    -------
+    pd.Series
+        Categorical for objects (users, statuses, options...), datetime64 (UTC)
+        for ISO timestamps and dates, numeric for numbers, boolean for flags,
+        Arrow list of strings for arrays and object strings otherwise.
+    """
+    raw_values = raw.tolist()
+    values = [None if _is_missing(v) else flatten_field_value(v) for v in raw_values]
+    present = [v for v in values if v is not None]
+
+    if not present:
+        return pd.Series(values, index=raw.index, dtype=object)
+
+    if all(isinstance(v, list) for v in present):
+        return pd.Series(
+            pa.array(values, type=pa.list_(pa.string())),
+            index=raw.index,
+            dtype=STRING_LIST_DTYPE,
+        )
+
+    if all(isinstance(v, bool) for v in present):
+        return pd.Series(values, index=raw.index, dtype="boolean")
+
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return pd.to_numeric(pd.Series(values, index=raw.index, dtype=object))
+
+    if all(isinstance(v, str) for v in present):
+        if all(ISO_DATE_PATTERN.match(v) for v in present):
+            return pd.to_datetime(
+                pd.Series(values, index=raw.index), format="ISO8601", utc=True
+            )
+        if any(isinstance(v, dict) for v in raw_values):
+            return pd.Series(values, index=raw.index, dtype="category")
+        return pd.Series(values, index=raw.index, dtype=object)
+
+    # Mixed shapes: fall back to text, keeping lists as JSON
+    return pd.Series(
+        [v if v is None or isinstance(v, str) else json.dumps(v, default=str) for v in values],
+        index=raw.index,
+        dtype=object,
+    )
+
+
+def fetch_field_id_map(jira_client: Jira) -> Dict[str, str]:
+    """
+    Fetch the field catalogue from JIRA as a mapping from field ID to field name.
 
     Parameters
     ----------
@@ -277,7 +1011,7 @@ def get_field_id_map(jira_client: Jira) -> Dict[str, str]:
     Returns
     -------
     Dict[str, str]
-        Mapping from field ID to field name.
+        Mapping from field ID to field name, empty if the catalogue could not be fetched.
     """
     try:
         # Try to get all fields from Jira
@@ -300,4 +1034,201 @@ def get_field_id_map(jira_client: Jira) -> Dict[str, str]:
     except Exception as e:
         logger.warning(f"Error fetching field mapping: {e}")
         # Return empty mapping as fallback
-        return {}
\ No newline at end of file
+        return {}
+
+
+def read_field_catalogue() -> Dict[str, Any]:
+    """Read the persisted field catalogue, or an empty dict if there is none."""
+    if not os.path.exists(FIELD_CATALOGUE_FILE):
+        return {}
+    try:
+        with open(FIELD_CATALOGUE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {FIELD_CATALOGUE_FILE}: {e}")
+        return {}
+
+
+def write_field_catalogue(field_map: Dict[str, str]):
+    """Atomically persist the field catalogue with the time it was fetched."""
+    tmp_file = f"{FIELD_CATALOGUE_FILE}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump({"fetched_at": datetime.now(timezone.utc).isoformat(), "fields": field_map}, f, indent=2)
+    os.replace(tmp_file, FIELD_CATALOGUE_FILE)
+
+
+def get_field_id_map(
+    jira_client: Jira, max_age_hours: int = JIRA_FIELD_CATALOGUE_HOURS
+) -> Dict[str, str]:
+    """
+    Return a mapping from field ID to field name.
+
+    The catalogue is persisted in ``FIELD_CATALOGUE_FILE`` and only fetched
+    again once it is older than ``max_age_hours``. If that fetch fails the
+    stale catalogue is kept.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    max_age_hours : int, optional
+        Age after which the persisted catalogue is refetched.
+
+    Returns
+    -------
+    Dict[str, str]
+        Mapping from field ID to field name.
+    """
+    catalogue = read_field_catalogue()
+    fetched_at = catalogue.get("fetched_at")
+    if catalogue.get("fields") and fetched_at:
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(fetched_at)
+        if age < timedelta(hours=max_age_hours):
+            return catalogue["fields"]
+
+    field_map = fetch_field_id_map(jira_client)
+    if field_map:
+        write_field_catalogue(field_map)
+        return field_map
+    if catalogue.get("fields"):
+        logger.warning("⚠️ Using the stale JIRA field catalogue")
+        return catalogue["fields"]
+    return {}
+
+
+def fields_param(fields: Optional[List[str]]) -> str:
+    """Return the ``fields`` parameter for a projection (None requests every field)."""
+    return ",".join(fields) if fields else "*all"
+
+
+def _is_empty_field(value: Any) -> bool:
+    """Return True for values that carry nothing: nulls, empty strings, lists and objects."""
+    return value is None or value == "" or value == [] or value == {}
+
+
+def resolve_allow_list(names: List[str], field_map: Dict[str, str]) -> List[str]:
+    """
+    Resolve an allow-list of field ids or names to field ids.
+
+    Parameters
+    ----------
+    names : List[str]
+        Field ids (``summary``, ``customfield_10449``) or names (``Demand Type``),
+        matched case-insensitively.
+    field_map : Dict[str, str]
+        Field catalogue from ``get_field_id_map``.
+
+    Returns
+    -------
+    List[str]
+        Field ids; a name shared by several custom fields selects all of them.
+    """
+    ids_by_name: Dict[str, List[str]] = {}
+    ids_by_lower: Dict[str, str] = {}
+    for field_id, field_name in field_map.items():
+        ids_by_name.setdefault((field_name or "").lower(), []).append(field_id)
+        ids_by_lower[field_id.lower()] = field_id
+
+    resolved: List[str] = []
+    for name in names:
+        key = name.lower()
+        if key in ids_by_lower:
+            resolved.append(ids_by_lower[key])
+        elif key in ids_by_name:
+            resolved.extend(ids_by_name[key])
+        elif not field_map or re.fullmatch(r"customfield_\d+", key):
+            resolved.append(name)  # Without a catalogue, trust the configured id
+        else:
+            logger.warning(f"⚠️ JIRA field '{name}' is not in the field catalogue, skipping it")
+    return resolved
+
+
+def probe_field_projection(
+    jira_client: Jira, jql: str, pinned: List[str], sample_size: int = JIRA_FIELD_PROBE_ISSUES
+) -> Optional[List[str]]:
+    """
+    Pick the fields worth requesting from a sample of issues fetched with every field.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string.
+    pinned : List[str]
+        Field ids kept regardless of how often they are empty.
+    sample_size : int, optional
+        Number of issues to sample.
+
+    Returns
+    -------
+    List[str] or None
+        Sorted field ids, or None if the JQL returned no issues to judge by.
+    """
+    sample = fetch_all_issues(jira_client, jql, fields="*all", max_issues=sample_size)
+    if not sample:
+        return None
+
+    seen = set()
+    filled: Dict[str, int] = {}
+    for issue in sample:
+        for field_id, value in issue.get("fields", {}).items():
+            seen.add(field_id)
+            if not _is_empty_field(value):
+                filled[field_id] = filled.get(field_id, 0) + 1
+
+    max_empty = JIRA_FIELD_MAX_NULL_PERCENT / 100
+    kept = {field_id for field_id in seen if 1 - filled.get(field_id, 0) / len(sample) <= max_empty}
+    fields = sorted(kept.union(pinned, REQUIRED_FIELDS))
+    logger.info(
+        f"🧮 JIRA field probe: keeping {len(fields)} of {len(seen)} fields "
+        f"(empty on at most {JIRA_FIELD_MAX_NULL_PERCENT:g}% of {len(sample)} issues)"
+    )
+    return fields
+
+
+def resolve_field_projection(
+    jira_client: Jira, jql: str, metadata: Dict[str, Any], spec: str = JIRA_FIELDS
+) -> Dict[str, Any]:
+    """
+    Work out which fields to request per issue from the ``JIRA_FIELDS`` setting.
+
+    Parameters
+    ----------
+    jira_client : Jira
+        Authenticated JIRA client.
+    jql : str
+        JQL query string.
+    metadata : Dict[str, Any]
+        Sync metadata of the current cache; an ``auto`` projection probed
+        less than ``JIRA_FIELD_PROBE_HOURS`` ago for the same JQL is reused.
+    spec : str, optional
+        ``*all``, a comma-separated allow-list of field ids or names, or
+        ``auto`` optionally followed by fields to always keep.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Sync metadata entries: ``fields`` (sorted field ids, or None for every
+        field) and ``fields_probed_at``.
+    """
+    entries = [entry.strip() for entry in spec.split(",") if entry.strip()]
+    if not entries or entries == ["*all"]:
+        return {"fields": None, "fields_probed_at": None}
+
+    auto = any(entry.lower() == "auto" for entry in entries)
+    names = [entry for entry in entries if entry.lower() != "auto"]
+    pinned = resolve_allow_list(names, get_field_id_map(jira_client)) if names else []
+    if not auto:
+        return {"fields": sorted(set(pinned).union(REQUIRED_FIELDS)), "fields_probed_at": None}
+
+    probed_at = metadata.get("fields_probed_at")
+    if metadata.get("jql") == jql and metadata.get("fields") and probed_at:
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(probed_at)
+        if age < timedelta(hours=JIRA_FIELD_PROBE_HOURS) and set(pinned) <= set(metadata["fields"]):
+            return {"fields": metadata["fields"], "fields_probed_at": probed_at}
+
+    fields = probe_field_projection(jira_client, jql, pinned)
+    if fields is None:
+        return {"fields": None, "fields_probed_at": None}
+    return {"fields": fields, "fields_probed_at": datetime.now(timezone.utc).isoformat()}
@@ -0,0 +1,37 @@
+"""Pause point shared by the workers of a concurrent API fetch."""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimitGate:
+    """Pause point shared by all workers: a 429 on one worker holds back every worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def pause(self, seconds):
+        """Hold all workers for at least the given number of seconds."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self):
+        """Block until no pause is in effect."""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Return the ``Retry-After`` delay of a failed HTTP request, if the response carried one."""
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
@@ -2,16 +2,22 @@
 
 import json
 import os
-import time
-from datetime import datetime, timedelta
+import threading
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 
 import dotenv
 import pandas as pd
+import pyarrow as pa
 import requests
 import requests.exceptions
 from pandas.api.types import is_list_like
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
+from data.arrow_cache import read_cache_frame, write_cache_table
+from data.rate_limit import RateLimitGate
 from logger_config import log_progress, log_success, setup_logging
 
 dotenv.load_dotenv()
@@ -22,7 +28,15 @@ logger = setup_logging("tamkeen.freshservice", use_color=True)
 FRESHSERVICE_DOMAIN = os.getenv("FRESHSERVICE_DOMAIN")
 API_KEY = os.getenv("FRESHSERVICE_API_KEY", "")
 CACHE_FILE = "fresh_service_tickets.parquet"
+SYNC_METADATA_FILE = "fresh_service_tickets_metadata.json"
+# "incremental" merges tickets updated since the last sync into the cache, "full" refetches everything
+SYNC_MODE = os.getenv("FRESHSERVICE_SYNC_MODE", "incremental").lower()
 CACHE_DURATION_HOURS = int(os.getenv("FRESHSERVICE_CACHE_HOURS", "24"))
+MAX_WORKERS = int(os.getenv("FRESHSERVICE_MAX_WORKERS", "4"))
+PER_PAGE = 100  # Max allowed
+
+_session = None
+_session_lock = threading.Lock()
 
 
 def prepare_df_for_pandasql(df):
@@ -42,6 +56,21 @@ def prepare_df_for_pandasql(df):
     return df_copy
 
 
+def read_tickets_cache(cache_file=CACHE_FILE):
+    """Read the cached tickets from Parquet, or from their memory-mapped Arrow copy when enabled."""
+    return read_cache_frame(cache_file)
+
+
+def tickets_table(df):
+    """Convert the processed tickets to an Arrow table."""
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_tickets_cache(df, cache_file=CACHE_FILE):
+    """Write the tickets to the Parquet cache (and its Arrow copy when enabled)."""
+    write_cache_table(tickets_table(df), cache_file)
+
+
 def is_cache_valid():
     """Check if cache file exists and is still valid."""
     if not os.path.exists(CACHE_FILE):
@@ -82,13 +111,17 @@ ticket_status_map = {
 }
 
 
-def fetch_freshservice_tickets():
-    """Fetch all tickets from Freshservice API."""
+def fetch_freshservice_tickets(updated_since=None):
+    """Fetch tickets from Freshservice API, optionally only those updated since a UTC timestamp."""
     logger.info("🎫 Fetching tickets from Freshservice...")
 
-    tickets = get_api(
-        "tickets", params={"include": "requester,department,requested_for,stats"}
-    )
+    params = {"include": "requester,department,requested_for,stats"}
+    if updated_since:
+        params["updated_since"] = updated_since
+    # A partial ticket list must never replace the cache or advance the sync timestamp
+    tickets = get_api("tickets", params=params, strict=True)
+    if tickets.empty:
+        return tickets
 
     agents = get_api("agents")
     # merge agents into tickets
@@ -112,82 +145,183 @@ def fetch_freshservice_tickets():
     return tickets
 
 
+def read_sync_metadata():
+    """Read the last-synced metadata stored next to the cache, or an empty dict if there is none."""
+    if not os.path.exists(SYNC_METADATA_FILE):
+        return {}
+    try:
+        with open(SYNC_METADATA_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {SYNC_METADATA_FILE}: {e}")
+        return {}
+
+
+def write_sync_metadata(metadata):
+    """Atomically write the last-synced metadata stored next to the cache."""
+    tmp_file = f"{SYNC_METADATA_FILE}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_file, SYNC_METADATA_FILE)
+
+
+def merge_tickets(cached, changed):
+    """Upsert changed tickets into the cached frame by ticket_id."""
+    if changed.empty:
+        return cached
+    with warnings.catch_warnings():
+        # Columns missing from one side are simply null there
+        warnings.simplefilter("ignore", FutureWarning)
+        return pd.concat(
+            [cached[~cached["ticket_id"].isin(changed["ticket_id"])], changed],
+            ignore_index=True,
+        )
+
+
+def sync_freshservice_tickets():
+    """Bring the cached tickets up to date, fetching only what changed since the last sync when possible."""
+    metadata = read_sync_metadata()
+    synced_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    if SYNC_MODE == "incremental" and os.path.exists(CACHE_FILE) and metadata.get("last_synced"):
+        logger.info(f"🔄 Incremental Freshservice sync since {metadata['last_synced']}")
+        changed = fetch_freshservice_tickets(updated_since=metadata["last_synced"])
+        df = merge_tickets(read_tickets_cache(), changed)
+        logger.info(f"🔄 Upserted {len(changed)} changed tickets")
+    else:
+        df = fetch_freshservice_tickets()
+
+    write_tickets_cache(df)
+    write_sync_metadata({"last_synced": synced_at})
+    return df
+
+
 def get_freshservice_tickets(force_refresh=False):
     """Get Freshservice tickets, using cache if available and valid."""
     if force_refresh or not is_cache_valid():
-        df = fetch_freshservice_tickets()
-        df.to_parquet(CACHE_FILE, index=False)
+        df = sync_freshservice_tickets()
         logger.info(f"💾 Saved {len(df)} tickets to {CACHE_FILE}")
     else:
         logger.info("📤 Reading from cache...")
-        df = pd.read_parquet(CACHE_FILE)
+        df = read_tickets_cache()
         log_success(logger, f"Loaded {len(df)} tickets from cache")
 
     return df
 
 
-def get_api(endpoint, params=None):
-    """Generic function to fetch paginated data from Freshservice API with optional query parameters."""
-    url = f"https://{FRESHSERVICE_DOMAIN}/api/v2/{endpoint}"
-    all_data = []
-    page = 1
-    per_page = 100  # Max allowed
+def get_session():
+    """Return the shared keep-alive session used for all Freshservice calls."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.auth = HTTPBasicAuth(API_KEY, "X")
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+            _session = session
+    return _session
 
-    # Use a copy of params to avoid mutating the caller's dictionary
-    query_params = params.copy() if params else {}
-    query_params.update({"page": page, "per_page": per_page})
+
+def fetch_page(endpoint, params, page, gate):
+    """
+    Fetch one page of an endpoint, waiting out rate limits through the shared gate.
+
+    Returns the page records and whether the API advertises a next page, or
+    (None, False) if the page could not be fetched.
+    """
+    url = f"https://{FRESHSERVICE_DOMAIN}/api/v2/{endpoint}"
+    query_params = {**params, "page": page, "per_page": PER_PAGE}
 
     while True:
-        query_params["page"] = page
-        try:
-            while True:
-                response = requests.get(
-                    url,
-                    auth=HTTPBasicAuth(API_KEY, "X"),
-                    params=query_params,
-                    timeout=60,
-                )
-
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", "60"))
-                    logger.warning(
-                        f"🔄 Rate limit hit. Retrying page {page} after {retry_after} seconds..."
-                    )
-                    time.sleep(retry_after)
-                    continue  # Retry the same request
-
-                break  # Exit retry loop on success
-
-            if response.status_code != 200:
-                logger.error(f"Error {response.status_code}: {response.text}")
-                break
+        gate.wait()
+        response = get_session().get(url, params=query_params, timeout=60)
 
-            response_json = response.json()
-            page_data = response_json.get(endpoint, [])
+        if response.status_code == 429:
+            retry_after = int(response.headers.get("Retry-After", "60"))
+            logger.warning(
+                f"🔄 Rate limit hit. Pausing all workers, retrying page {page} after {retry_after} seconds..."
+            )
+            gate.pause(retry_after)
+            continue  # Retry the same request
 
-            if not isinstance(page_data, list):
-                logger.error("⚠️ Unexpected response format.")
-                break
+        break  # Exit retry loop on success
 
-            all_data.extend(page_data)
-            log_progress(logger, len(all_data), -1, f"{endpoint} page {page}")
-            page += 1
+    if response.status_code != 200:
+        logger.error(f"Error {response.status_code}: {response.text}")
+        return None, False
 
-            if (
-                "link" not in response.headers
-                or 'rel="next"' not in response.headers["link"]
-            ):
-                logger.info("✅ Last page reached (no next link).")
-                break
+    page_data = response.json().get(endpoint, [])
+    if not isinstance(page_data, list):
+        logger.error("⚠️ Unexpected response format.")
+        return None, False
 
+    return page_data, 'rel="next"' in response.headers.get("link", "")
+
+
+def get_api(endpoint, params=None, max_workers=MAX_WORKERS, strict=False):
+    """Fetch paginated data from the Freshservice API, several pages at a time.
+
+    The API does not report a page count, so pages are requested ahead on a
+    bounded worker pool until one comes back without a next link. Pages are
+    reassembled in order; an error on a page ends the result before it, or
+    raises if ``strict`` is set. Errors on pages requested ahead beyond the
+    page that ended the listing are ignored.
+    """
+    # Use a copy of params to avoid mutating the caller's dictionary
+    query_params = params.copy() if params else {}
+    gate = RateLimitGate()
+    pages = {}
+    last_page = None  # Last page worth keeping, once known
+    listing_end = None  # Last page according to the API (no next link)
+    failed_pages = []
+
+    def finish(page, future):
+        nonlocal last_page, listing_end
+        try:
+            page_data, has_next = future.result()
         except requests.exceptions.RequestException as e:
             logger.error(f"🚨 Request failed: {e}")
+            page_data, has_next = None, False
+
+        if page_data is None:
+            failed_pages.append(page)
+            end = page - 1
+        else:
+            pages[page] = page_data
+            log_progress(logger, sum(len(p) for p in pages.values()), -1, f"{endpoint} page {page}")
+            end = None if has_next else page
+            if not has_next:
+                listing_end = page if listing_end is None else min(listing_end, page)
+        if end is not None:
+            last_page = end if last_page is None else min(last_page, end)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"freshservice-{endpoint}") as pool:
+        # The first page tells us whether there is anything to fetch in parallel
+        finish(1, pool.submit(fetch_page, endpoint, query_params, 1, gate))
+
+        next_page = 2
+        in_flight = {}
+        while True:
+            while last_page is None and len(in_flight) < max_workers:
+                in_flight[pool.submit(fetch_page, endpoint, query_params, next_page, gate)] = next_page
+                next_page += 1
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(in_flight.pop(future), future)
+
+    failed = any(listing_end is None or page <= listing_end for page in failed_pages)
+    if failed and strict:
+        raise RuntimeError(f"Failed to fetch all pages of {endpoint} (stopped after page {last_page})")
+
+    all_data = []
+    for page in range(1, (last_page or 0) + 1):
+        if page not in pages:
             break
+        all_data.extend(pages[page])
+    logger.info(f"✅ Last page reached (page {last_page}).")
 
     log_success(logger, f"Retrieved {len(all_data)} records from {endpoint}")
-    for data in all_data:
-        if data["id"] == 19309:
-            print(data)
 
     return pd.json_normalize(all_data)
 
@@ -195,9 +329,8 @@ def get_api(endpoint, params=None):
 def get_single_ticket(ticket: str) -> dict:
     url = f"https://{FRESHSERVICE_DOMAIN}/api/v2/tickets/{ticket}"
     query_params={"include":"conversations"}
-    response = requests.get(
+    response = get_session().get(
         url,
-        auth=HTTPBasicAuth(API_KEY, "X"),
         params=query_params,
         timeout=60,
     )
@@ -1,21 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from dotenv import load_dotenv
+import asyncio
 import os
 
-# Import AI router
+# Import AI router (cheap: the AI service and data handlers are built by startup)
 from ai.routes import ai_router
 from auth.azure_auth import optional_auth
+from startup import Startup
+import metrics
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Accept connections right away; datasets and the AI service load in the background
+    startup = app.state.startup = Startup()
+    startup_task = asyncio.create_task(startup.run())
+    yield
+
+    if not startup_task.done():
+        startup_task.cancel()
+    # Let background refreshes finish before the process exits
+    from ai import mcp_tools
+    if mcp_tools.refresh_handler is not None:
+        await asyncio.to_thread(mcp_tools.refresh_handler.shutdown, 30)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ExCom AI Chat API",
     version="1.0.0",
-    description="AI Chat Service API"
+    description="AI Chat Service API",
+    lifespan=lifespan
 )
 
 # CORS configuration - in production, same-origin so less critical
@@ -43,10 +64,25 @@ app.add_middleware(
 # Include AI router
 app.include_router(ai_router)
 
-# Health check endpoint
+# Health check endpoint (liveness): answers as soon as the server is up
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "service": "ExCom AI Chat"}
+    startup = getattr(app.state, "startup", None)
+    return {"status": "healthy", "service": "ExCom AI Chat", "ready": bool(startup and startup.ready)}
+
+# Prometheus metrics of this worker process
+@app.get("/api/metrics")
+async def metrics_endpoint():
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+# Readiness: 200 once datasets and the AI service are loaded, 503 before, with per-phase timings
+@app.get("/api/ready")
+async def readiness_check():
+    startup = getattr(app.state, "startup", None)
+    if startup is None:
+        return JSONResponse(status_code=503, content={"ready": False, "phases": {}})
+    status = startup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
 
 # Root API endpoint - only served if not handled by static files
 @app.get("/api")
@@ -56,6 +92,8 @@ async def api_root():
         "version": "1.0.0",
         "endpoints": [
             "/api/health",
+            "/api/ready",
+            "/api/metrics",
             "/api/chat",
             "/api/chat/stream",
             "/docs"
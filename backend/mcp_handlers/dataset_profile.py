@@ -0,0 +1,159 @@
+"""Column profiles of a published dataset, for the ``describe_dataset`` tool.
+
+A profile lists every column the SQL table exposes with its SQL-facing type,
+null ratio and distinct count, the most common values of low-cardinality
+columns, the range of numeric and timestamp columns and an example of
+free-text ones. It is computed once per dataset generation (see
+``DatasetSnapshot.describe``), so describing a dataset costs the model one
+small tool call instead of an exploratory ``SELECT *``.
+"""
+
+import os
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Columns with at most this many distinct values list their most common values
+DESCRIBE_MAX_CATEGORIES = int(os.getenv("DESCRIBE_MAX_CATEGORIES", "30"))
+# Number of most common values listed per low-cardinality column
+DESCRIBE_TOP_K = int(os.getenv("DESCRIBE_TOP_K", "10"))
+EXAMPLE_MAX_CHARS = 80
+# Values that older caches stored for empty fields
+EMPTY_TEXT = ("", "[]", "{}")
+
+SQL_NOTES = [
+    "The table is named df; quote column names that contain spaces or parentheses in double quotes.",
+    "timestamp columns are ISO text: compare with strings such as '2024-06-01' and group with substr().",
+    "list columns are JSON arrays stored as text: filter with LIKE '%\"value\"%'.",
+]
+
+
+def _sql_type(series: pd.Series) -> str:
+    """Type of a column as it behaves in SQL queries."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype) and pa.types.is_list(dtype.pyarrow_dtype):
+        return "list"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _sql_type(pd.Series(dtype.categories))
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "timestamp"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "integer"
+    if pd.api.types.is_float_dtype(dtype):
+        return "real"
+    return "text"
+
+
+def _plain(value: Any) -> Any:
+    """JSON-friendly form of a pandas/numpy scalar, with long text clipped."""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, str) and len(value) > EXAMPLE_MAX_CHARS:
+        return value[:EXAMPLE_MAX_CHARS] + "…"
+    return value
+
+
+def _text_missing(series: pd.Series) -> pd.Series:
+    """Nulls plus the empty placeholders older caches stored as text."""
+    try:
+        return series.isna() | series.isin(EMPTY_TEXT)
+    except TypeError:  # Unhashable leftovers (raw JSON objects)
+        return series.map(lambda value: value is None or (isinstance(value, str) and value in EMPTY_TEXT))
+
+
+def _list_counts(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Missing-or-empty mask and item counts of an Arrow list column, computed in Arrow."""
+    items = pa.array(series)
+    lengths = pc.list_value_length(items).fill_null(0).to_numpy(zero_copy_only=False)
+    counted = pc.value_counts(pc.drop_null(pc.list_flatten(items)))
+    counts = pd.Series(
+        counted.field("counts").to_numpy(zero_copy_only=False),
+        index=counted.field("values").to_pylist(),
+        dtype="int64",
+    ).sort_values(ascending=False, kind="stable")
+    return pd.Series(lengths == 0, index=series.index), counts
+
+
+def profile_column(name: str, series: pd.Series) -> Dict[str, Any]:
+    """
+    Profile one column.
+
+    Parameters
+    ----------
+    name : str
+        Column name as used in SQL.
+    series : pd.Series
+        Column values.
+
+    Returns
+    -------
+    Dict[str, Any]
+        ``name``, ``type``, ``nulls`` (ratio), ``distinct``, and depending on
+        the column ``top`` ([value, count] pairs), ``min``/``max`` or ``example``.
+    """
+    kind = _sql_type(series)
+    if kind == "list":
+        missing, counts = _list_counts(series)
+        present = None
+    else:
+        missing = _text_missing(series) if kind == "text" else series.isna()
+        present = series[~missing]
+        try:
+            counts = present.value_counts()
+        except TypeError:
+            counts = present.astype(str).value_counts()
+
+    profile: Dict[str, Any] = {
+        "name": name,
+        "type": kind,
+        "nulls": round(float(missing.mean()), 3) if len(series) else 0.0,
+        "distinct": int(len(counts)),
+    }
+    if kind in ("integer", "real", "timestamp") and len(present) and not isinstance(series.dtype, pd.CategoricalDtype):
+        profile["min"], profile["max"] = _plain(present.min()), _plain(present.max())
+    if kind != "timestamp" and 0 < len(counts) <= DESCRIBE_MAX_CATEGORIES:
+        profile["top"] = [[_plain(value), int(count)] for value, count in counts.head(DESCRIBE_TOP_K).items()]
+    elif kind == "text" and len(present):
+        profile["example"] = _plain(str(present.iloc[0]))
+    return profile
+
+
+def profile_dataset(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Profile every column of a dataset as the SQL table ``df`` exposes it.
+
+    A named index is a column of the SQL table and is profiled first.
+    Columns that are empty on every row are only listed by name.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Published dataset.
+
+    Returns
+    -------
+    Dict[str, Any]
+        ``rows``, ``columns`` (one profile per non-empty column),
+        ``empty_columns`` and ``notes`` on querying the column types.
+    """
+    columns: List[Dict[str, Any]] = []
+    empty: List[str] = []
+    series = []
+    if len(df.index.names) == 1 and df.index.name is not None:
+        series.append((str(df.index.name), df.index.to_series(index=range(len(df)))))
+    series.extend((str(col), df[col]) for col in df.columns)
+
+    for name, values in series:
+        profile = profile_column(name, values)
+        if len(df) and profile["distinct"] == 0:
+            empty.append(name)
+        else:
+            columns.append(profile)
+
+    return {"rows": len(df), "columns": columns, "empty_columns": empty, "notes": SQL_NOTES}
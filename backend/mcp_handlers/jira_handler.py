@@ -3,9 +3,15 @@
 import threading
 from typing import Optional
 import pandas as pd
-from pandasql import sqldf
-from data.jira_issues import query_issues
+from data.jira_issues import query_issues, read_issues_cache
 from logger_config import log_refresh_start, log_refresh_complete
+import tracing
+from metrics import DATASET_GENERATION, DATASET_RECORDS, SQL_QUERY_CACHE, SQL_QUERY_SECONDS
+from .query_engine import DatasetSnapshot, QueryStore, create_store
+from .result_cache import QueryResultCache
+from .rollups import JIRA_ROLLUPS, build_rollups, rollup_catalogue
+from .search_index import SearchIndex
+from .shared_datasets import SharedDataset
 import os
 from datetime import datetime, timezone
 
@@ -13,57 +19,155 @@ from datetime import datetime, timezone
 class JiraHandler:
     """Handler for JIRA-related operations."""
     
-    def __init__(self, logger):
+    def __init__(self, logger, load_cache: bool = True, shared: Optional[SharedDataset] = None):
         self.logger = logger
-        self.data: Optional[pd.DataFrame] = pd.DataFrame()  # Initialize with empty DataFrame
-        self.data_lock = threading.RLock()
+        # Set when several worker processes share the dataset through memory-mapped files
+        self.shared = shared
+        # Current dataset; replaced as a whole on every publish, read without locking
+        self.snapshot = DatasetSnapshot(pd.DataFrame(), None, generation=0)
+        self.query_cache = QueryResultCache()
+        # BM25 index of demand summaries and descriptions, persisted next to the parquet cache
+        self.search_index = SearchIndex(
+            "jira_search_index.sqlite",
+            key="Jira",
+            title="summary",
+            body="description",
+            columns=["summary", "status", "priority", "issuetype", "assignee", "created"],
+        )
+        self.data_lock = threading.RLock()  # Serializes publishers only
         
-        # Try to load from cache immediately if available
-        self._try_load_cache()
+        # Try to load from cache immediately if available (startup loads it in the background instead)
+        if load_cache:
+            self.load_cache()
     
-    def _try_load_cache(self):
+    def load_cache(self):
         """Try to load data from cache file if it exists."""
+        if self.shared is not None and not self.shared.election.is_refresher:
+            # Only the refresher reads the cache and publishes it; other workers attach to its files
+            self.attach_shared()
+            return
         cache_file = "jira_issues_cache.parquet"
         if os.path.exists(cache_file):
             try:
                 self.logger.info("📤 Loading JIRA data from cache on startup...")
-                data = pd.read_parquet(cache_file)
-                with self.data_lock:
-                    self.data = data
+                data = read_issues_cache(cache_file)
+                self._publish_data(data)
                 self.logger.info(f"✅ Loaded {len(data)} issues from cache")
             except Exception as e:
                 self.logger.warning(f"⚠️ Failed to load cache on startup: {e}")
-                self.data = pd.DataFrame()
+                self._publish_data(pd.DataFrame())
         else:
             self.logger.info("📭 No JIRA cache file found on startup")
     
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        return self.snapshot.data
+
+    @property
+    def store(self) -> Optional[QueryStore]:
+        return self.snapshot.store
+
+    @property
+    def generation(self) -> int:
+        return self.snapshot.generation
+
+    def _publish_data(self, data: Optional[pd.DataFrame]):
+        """Build a query store for new data and publish both as a new snapshot."""
+        # Index before publishing, so every process that attaches the generation can search all of it
+        self._sync_search_index(data)
+        if self.shared is not None:
+            with self.data_lock:
+                self._install_snapshot(self.shared.publish(data, self.logger))
+            return
+        tables = build_rollups(data, JIRA_ROLLUPS, self.logger)
+        store = create_store(data, self.logger, tables=tables) if data is not None and not data.empty else None
+        rollups = rollup_catalogue(tables, JIRA_ROLLUPS)
+        with self.data_lock:
+            self._install_snapshot(DatasetSnapshot(data, store, self.snapshot.generation + 1, rollups))
+
+    def _install_snapshot(self, snapshot: DatasetSnapshot):
+        self.snapshot = snapshot
+        self.query_cache.clear()
+        DATASET_RECORDS.labels(source="jira").set(snapshot.record_count)
+        DATASET_GENERATION.labels(source="jira").set(snapshot.generation)
+        snapshot.describe()  # Profile each generation once, off the request path
+
+    def _sync_search_index(self, data: Optional[pd.DataFrame]):
+        """Update the search index for data about to be published; an empty load leaves it as is."""
+        if data is None or data.empty:
+            return
+        try:
+            changes = self.search_index.sync(data)
+            self.logger.info(
+                f"🔎 JIRA search index synced: {changes['added']} added, "
+                f"{changes['updated']} updated, {changes['removed']} removed"
+            )
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to update JIRA search index: {e}")
+
+    def attach_shared(self) -> bool:
+        """Switch to the latest shared generation if it is newer than the current one."""
+        manifest = self.shared.read_manifest()
+        if manifest is None or manifest["generation"] <= self.snapshot.generation:
+            return False
+        with self.data_lock:
+            self._install_snapshot(self.shared.attach(manifest, self.logger))
+        self.logger.info(f"🔗 Attached to shared JIRA generation {manifest['generation']} ({manifest['records']} issues)")
+        return True
+
     def load_data(self):
         """Load JIRA data from cache without forcing refresh."""
         try:
             self.logger.info("📋 Loading JIRA data...")
             new_data = query_issues(force_refresh=False)
-            with self.data_lock:
-                self.data = new_data
+            self._publish_data(new_data)
             if self.data is not None:
                 self.logger.info(f"✅ JIRA data loaded ({len(self.data)} issues)")
             else:
                 self.logger.warning("⚠️ No JIRA data available")
         except Exception as e:
             self.logger.error(f"Error loading JIRA data: {e}")
-            self.data = pd.DataFrame()  # Empty DataFrame as fallback
+            self._publish_data(pd.DataFrame())  # Empty DataFrame as fallback
     
     def refresh_data(self, force: bool = True):
         """Refresh JIRA data with thread safety."""
         try:
             log_refresh_start(self.logger, "JIRA")
             new_data = query_issues(force_refresh=force)
-            with self.data_lock:
-                self.data = new_data
+            self._publish_data(new_data)
             log_refresh_complete(self.logger, "JIRA", len(new_data))
         except Exception as e:
             self.logger.error(f"Error refreshing JIRA data: {e}")
             raise
     
+    def run_query(self, excomai_sql: str) -> Optional[pd.DataFrame]:
+        """Execute a SQL query on the Jira demands dataframe and return the result as a DataFrame.
+
+        Returns None if no data is loaded yet or the statement returns no rows.
+        """
+        # Pin the current snapshot; a concurrent refresh publishes a new one without affecting this query
+        snapshot = self.snapshot
+        if snapshot.store is None:
+            self.logger.warning("⚠️ JIRA data not yet loaded. Returning empty result.")
+            return None
+
+        # Results are cached per dataset generation, so a refresh never serves stale rows
+        key = self.query_cache.make_key(snapshot.generation, excomai_sql)
+        found, result = self.query_cache.get(key)
+        if found:
+            SQL_QUERY_CACHE.labels(handler="jira", result="hit").inc()
+            tracing.annotate(query_cache="hit")
+            return result
+
+        SQL_QUERY_CACHE.labels(handler="jira", result="miss").inc()
+        with SQL_QUERY_SECONDS.labels(handler="jira").time(), tracing.span("sql", handler="jira") as span:
+            result = snapshot.store.query(excomai_sql)
+            if span is not None:
+                span.set(engine=snapshot.store.engine, generation=snapshot.generation, rows=0 if result is None else len(result))
+        if self.snapshot is snapshot:  # Don't cache results of a snapshot that was replaced meanwhile
+            self.query_cache.put(key, result)
+        return result
+
     def query_demands(self, excomai_sql: str) -> str:
         """Execute a SQL query on the Jira demands dataframe and return the result as a JSON string.
 
@@ -86,52 +190,60 @@ class JiraHandler:
         '[{"Status": "READY TO ACCEPT", ...}, ...]'
         """
 
-        # Check if data is loaded
-        with self.data_lock:
-            if self.data is None or self.data.empty:
-                self.logger.warning("⚠️ JIRA data not yet loaded. Returning empty result.")
-                return "[]"
-
-        # Define a function to use pandasql with the dataframe
-        def pysqldf(q):
-            # Use thread-safe access - expose as 'df' for SQL queries
-            with self.data_lock:
-                return sqldf(q, {"df": self.data})
-
-        # Execute the SQL query and return the result as a JSON string
-        result_df = pysqldf(excomai_sql)
+        result_df = self.run_query(excomai_sql)
         if result_df is None:
             return "[]"  # Return empty JSON array if query returns None
         return result_df.to_json(index=False)
     
+    def describe_dataset(self) -> dict:
+        """Column names, types, null ratios, cardinality and common values of the current JIRA dataset."""
+        snapshot = self.snapshot
+        return {"dataset": "jira", "generation": snapshot.generation, **snapshot.describe()}
+
+    def list_rollups(self) -> dict:
+        """Pre-aggregated tables built with the current JIRA dataset, queryable next to df."""
+        snapshot = self.snapshot
+        return {"dataset": "jira", "generation": snapshot.generation, "rollups": snapshot.rollups}
+
+    def search(self, query: str, filters: Optional[dict] = None, top_k: int = 10) -> dict:
+        """BM25 search over the demand summaries and descriptions of the current JIRA dataset."""
+        snapshot = self.snapshot
+        if snapshot.record_count == 0:
+            return {"error": "JIRA data not yet loaded"}
+        with tracing.span("search", handler="jira"):
+            result = self.search_index.search(snapshot.data, query, filters, top_k)
+        return {"dataset": "jira", "generation": snapshot.generation, **result}
+
     def get_record_count(self) -> int:
         """Get the number of records currently loaded."""
-        with self.data_lock:
-            return len(self.data) if self.data is not None else 0
+        return self.snapshot.record_count
 
     def get_status(self) -> dict:
         """Get the current status of JIRA data."""
-        with self.data_lock:
-            record_count = len(self.data) if self.data is not None else 0
-            cache_file = "jira_issues_cache.parquet"
-
-            # Get file modification time
-            file_date = None
-            file_age_hours = None
-            if os.path.exists(cache_file):
-                try:
-                    file_stat = os.stat(cache_file)
-                    file_mtime = datetime.fromtimestamp(file_stat.st_mtime, timezone.utc)
-                    file_date = file_mtime.isoformat()
-                    # Calculate age in hours
-                    file_age_hours = (datetime.now(timezone.utc) - file_mtime).total_seconds() / 3600
-                except Exception as e:
-                    self.logger.warning(f"Could not get file date for {cache_file}: {e}")
-
-            return {
-                "status": "available" if record_count > 0 else "no_data",
-                "record_count": record_count,
-                "cache_file": cache_file,
-                "file_date": file_date,
-                "file_age_hours": round(file_age_hours, 2) if file_age_hours else None
-            }
\ No newline at end of file
+        snapshot = self.snapshot
+        record_count = snapshot.record_count
+        cache_file = "jira_issues_cache.parquet"
+
+        # Get file modification time
+        file_date = None
+        file_age_hours = None
+        if os.path.exists(cache_file):
+            try:
+                file_stat = os.stat(cache_file)
+                file_mtime = datetime.fromtimestamp(file_stat.st_mtime, timezone.utc)
+                file_date = file_mtime.isoformat()
+                # Calculate age in hours
+                file_age_hours = (datetime.now(timezone.utc) - file_mtime).total_seconds() / 3600
+            except Exception as e:
+                self.logger.warning(f"Could not get file date for {cache_file}: {e}")
+
+        return {
+            "status": "available" if record_count > 0 else "no_data",
+            "record_count": record_count,
+            "cache_file": cache_file,
+            "file_date": file_date,
+            "file_age_hours": round(file_age_hours, 2) if file_age_hours else None,
+            "generation": snapshot.generation,
+            "shared": self.shared is not None,
+            "query_cache": self.query_cache.stats()
+        }
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""Query engines that execute LLM-issued SQL against a loaded dataset.
+
+A store is built once per dataset refresh and published together with its
+DataFrame as an immutable ``DatasetSnapshot``. The handlers swap snapshots by
+reassigning a single attribute, so queries never take a lock: each one keeps
+using the snapshot it started with, and an old snapshot (store included) is
+freed once its last query finishes.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+from pandasql import sqldf
+
+from .dataset_profile import profile_dataset
+
+# Name the dataset is exposed as in SQL queries
+TABLE_NAME = "df"
+
+# Engine selection: "sqlite" (database built once per refresh, mapped by every reader) or "pandasql" (legacy per-query copy)
+DEFAULT_QUERY_ENGINE = os.getenv("QUERY_ENGINE", "sqlite").lower()
+
+# Most pooled reader connections a SQLite store keeps for concurrent queries
+QUERY_MAX_READERS = int(os.getenv("QUERY_MAX_READERS", "4"))
+
+# Directory for the SQLite files the in-process engine queries (defaults to the system temp dir)
+QUERY_TEMP_DIR = os.getenv("QUERY_TEMP_DIR") or None
+
+
+def prepare_for_sql(df: pd.DataFrame) -> pd.DataFrame:
+    """Encode Arrow list columns as JSON text, which SQLite can store and LIKE can search."""
+    list_columns = [
+        col for col in df.columns
+        if isinstance(df[col].dtype, pd.ArrowDtype) and pa.types.is_list(df[col].dtype.pyarrow_dtype)
+    ]
+    if not list_columns:
+        return df
+
+    df = df.copy()
+    for col in list_columns:
+        df[col] = [json.dumps(items) if isinstance(items, list) else None for items in df[col].tolist()]
+    return df
+
+
+class QueryStore(ABC):
+    """Read-only SQL view over a single DataFrame."""
+
+    engine = "base"
+
+    @abstractmethod
+    def query(self, sql: str) -> Optional[pd.DataFrame]:
+        """Execute a SQL query and return the result, or None if it returns no rows."""
+
+
+class PandasqlStore(QueryStore):
+    """Legacy engine: copies the DataFrame into a fresh SQLite database on every query."""
+
+    engine = "pandasql"
+
+    def __init__(self, df: pd.DataFrame, table_name: str = TABLE_NAME, tables: Optional[Dict[str, pd.DataFrame]] = None):
+        self.df = prepare_for_sql(df)
+        self.table_name = table_name
+        self.tables = {name: prepare_for_sql(table) for name, table in (tables or {}).items()}
+
+    def query(self, sql: str) -> Optional[pd.DataFrame]:
+        return sqldf(sql, {**self.tables, self.table_name: self.df})
+
+
+def _load_sqlite(
+    conn: sqlite3.Connection,
+    df: pd.DataFrame,
+    table_name: str,
+    tables: Optional[Dict[str, pd.DataFrame]] = None,
+):
+    # Same index handling as pandasql: keep the index if all its levels are named
+    for name, frame in [(table_name, df), *(tables or {}).items()]:
+        prepare_for_sql(frame).to_sql(
+            name,
+            conn,
+            index=not any(level is None for level in frame.index.names),
+        )
+
+
+def write_sqlite_file(
+    df: pd.DataFrame,
+    path: str,
+    table_name: str = TABLE_NAME,
+    tables: Optional[Dict[str, pd.DataFrame]] = None,
+):
+    """
+    Write a DataFrame as a standalone SQLite database file, atomically.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset to store as ``table_name``.
+    path : str
+        Destination path; the file is built under a temporary name and renamed.
+    table_name : str, optional
+        Table name used in SQL queries.
+    tables : Dict[str, pd.DataFrame], optional
+        Extra tables (rollups) stored next to the dataset, by name.
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            _load_sqlite(conn, df, table_name, tables)
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SQLiteFileStore(QueryStore):
+    """Queries a published, never-modified SQLite database file shared with other processes.
+
+    The file is opened read-only and ``immutable`` (no locking, no change
+    detection) with memory-mapped I/O, so every reader in every process reads
+    the same pages of the OS page cache instead of holding a private copy.
+    Readers are created on demand up to ``max_readers`` and pooled; once all
+    of them are busy, further queries wait for one to be returned.
+    """
+
+    engine = "sqlite-file"
+
+    def __init__(self, path: str, table_name: str = TABLE_NAME, max_readers: int = QUERY_MAX_READERS):
+        self.table_name = table_name
+        self.path = path
+        self._mmap_size = os.path.getsize(path)
+        self._readers: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(max(1, max_readers))
+
+    def _acquire(self) -> sqlite3.Connection:
+        self._slots.acquire()
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._open_reader()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size = {self._mmap_size}")
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        self._readers.put(conn)
+        self._slots.release()
+
+    def query(self, sql: str) -> Optional[pd.DataFrame]:
+        conn = self._acquire()
+        try:
+            cursor = conn.execute(sql)
+            if cursor.description is None:
+                return None
+            columns = [col[0] for col in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        finally:
+            self._release(conn)
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SQLiteStore(SQLiteFileStore):
+    """Loads the DataFrame once into a private SQLite file and queries it through shared, mapped readers.
+
+    The database is written once to a temporary file and then served exactly
+    like a published ``SQLiteFileStore``: every pooled reader maps the same
+    pages, so concurrent queries run in parallel without each reader holding
+    its own copy of the dataset. The file is removed when the store is freed.
+    """
+
+    engine = "sqlite"
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        table_name: str = TABLE_NAME,
+        max_readers: int = QUERY_MAX_READERS,
+        tables: Optional[Dict[str, pd.DataFrame]] = None,
+    ):
+        fd, path = tempfile.mkstemp(prefix="tamkeen-query-", suffix=".sqlite", dir=QUERY_TEMP_DIR)
+        os.close(fd)
+        try:
+            write_sqlite_file(df, path, table_name, tables)
+            super().__init__(path, table_name, max_readers)
+        except BaseException:
+            _remove_file(path)
+            raise
+        self._cleanup = weakref.finalize(self, _remove_file, path)
+
+
+ENGINES = {
+    "sqlite": SQLiteStore,
+    "pandasql": PandasqlStore,
+}
+
+
+def create_store(
+    df: pd.DataFrame,
+    logger=None,
+    engine: Optional[str] = None,
+    tables: Optional[Dict[str, pd.DataFrame]] = None,
+) -> QueryStore:
+    """Build a query store for a DataFrame, falling back to pandasql if the engine fails to load it.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset to expose as the ``df`` table.
+    logger : logging.Logger, optional
+        Logger used to report fallbacks.
+    engine : str, optional
+        Engine name from ``ENGINES``. Defaults to the ``QUERY_ENGINE`` environment variable.
+    tables : Dict[str, pd.DataFrame], optional
+        Extra tables (rollups) to expose next to ``df``, by name.
+
+    Returns
+    -------
+    QueryStore
+        Store ready to serve queries.
+    """
+    engine = (engine or DEFAULT_QUERY_ENGINE).lower()
+    store_cls = ENGINES.get(engine)
+    if store_cls is None:
+        if logger:
+            logger.warning(f"⚠️ Unknown QUERY_ENGINE '{engine}', using pandasql")
+        store_cls = PandasqlStore
+
+    try:
+        return store_cls(df, tables=tables)
+    except Exception as e:
+        if store_cls is PandasqlStore:
+            raise
+        if logger:
+            logger.warning(f"⚠️ Failed to load dataset into {engine} engine, falling back to pandasql: {e}")
+        return PandasqlStore(df, tables=tables)
+
+
+class DatasetSnapshot:
+    """One published dataset: the DataFrame, its query store, its generation id and its rollups.
+
+    Snapshots are never modified after they are published; a refresh builds a
+    new one and swaps it in.
+    """
+
+    def __init__(
+        self,
+        data: Optional[pd.DataFrame],
+        store: Optional[QueryStore],
+        generation: int,
+        rollups: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.data = data
+        self.store = store
+        self.generation = generation
+        self.rollups = rollups or []
+        self.published_at = time.time()
+        self._profile: Optional[Dict[str, Any]] = None
+        self._profile_lock = threading.Lock()
+
+    @property
+    def record_count(self) -> int:
+        return len(self.data) if self.data is not None else 0
+
+    def describe(self) -> Dict[str, Any]:
+        """Column profile of the dataset, computed on first use and kept for the snapshot's lifetime."""
+        if self._profile is None:
+            with self._profile_lock:
+                if self._profile is None:
+                    data = self.data if self.data is not None else pd.DataFrame()
+                    self._profile = profile_dataset(data)
+        return self._profile
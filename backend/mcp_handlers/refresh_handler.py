@@ -3,154 +3,218 @@
 import os
 import time
 import threading
-from typing import List, Tuple, Optional
-from datetime import datetime
+from typing import Dict, Optional
+from datetime import datetime, timezone
+from metrics import REFRESH_IN_PROGRESS, REFRESH_QUEUE_DEPTH, REFRESH_SECONDS
+
+
+class RefreshRequest:
+    """A pending refresh for one source."""
+
+    def __init__(self, force: bool, reason: str):
+        self.force = force
+        self.reason = reason
+        self.queued_at = time.monotonic()
+
+
+class RefreshSource:
+    """Scheduling state of one data source, owned by its worker thread."""
+
+    def __init__(self, name: str, label: str, handler, interval: int):
+        self.name = name
+        self.label = label
+        self.handler = handler
+        self.interval = interval
+        self.condition = threading.Condition()
+        self.pending: Optional[RefreshRequest] = None
+        self.running: Optional[RefreshRequest] = None
+        self.running_since: Optional[float] = None
+        self.next_due = time.monotonic() + interval
+        self.refresh_count = 0
+        self.last_wait_seconds: Optional[float] = None
+        self.last_duration_seconds: Optional[float] = None
+        self.last_finished_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.thread: Optional[threading.Thread] = None
 
 
 class RefreshHandler:
-    """Handler for data refresh operations."""
-    
+    """Handler for data refresh operations.
+
+    Every source has its own worker thread, so a slow JIRA pull never delays a
+    Freshservice refresh. A worker sleeps until its source is either requested
+    or due, holds at most one pending request (a forced request absorbs a
+    pending non-forced one) and schedules the next periodic refresh one
+    interval after the last one finished.
+    """
+
     def __init__(self, logger, jira_handler, freshservice_handler, queue_initial_load=True):
         self.logger = logger
         self.jira_handler = jira_handler
         self.freshservice_handler = freshservice_handler
-        
+
         # Configuration for refresh intervals (in seconds)
         self.jira_refresh_interval = int(os.getenv("JIRA_REFRESH_INTERVAL", "3600"))
         self.freshservice_refresh_interval = int(os.getenv("FRESHSERVICE_REFRESH_INTERVAL", "3600"))
-        
-        # Async refresh queue
-        self.refresh_queue: List[Tuple[str, bool]] = []
-        self.queue_lock = threading.Lock()
-        
+
+        self.sources: Dict[str, RefreshSource] = {
+            "jira": RefreshSource("jira", "JIRA", jira_handler, self.jira_refresh_interval),
+            "freshservice": RefreshSource(
+                "freshservice", "Freshservice", freshservice_handler, self.freshservice_refresh_interval
+            ),
+        }
+        self._stopping = threading.Event()
+        for source in self.sources.values():
+            REFRESH_QUEUE_DEPTH.labels(source=source.name).set_function(lambda s=source: int(s.pending is not None))
+            REFRESH_IN_PROGRESS.labels(source=source.name).set_function(lambda s=source: int(s.running is not None))
+
         # Queue initial data loads if requested
         if queue_initial_load:
             self.logger.info("📥 Queuing initial data loads...")
-            self.refresh_queue.append(("jira", False))  # Use cache if available
-            self.refresh_queue.append(("freshservice", False))  # Use cache if available
-        
+            for source in self.sources.values():
+                source.pending = RefreshRequest(force=False, reason="initial")  # Use cache if available
+
         # Start background threads
         self._start_background_threads()
-    
+
     def _start_background_threads(self):
-        """Start the refresh queue processor and periodic refresh threads."""
-        # Start the refresh queue processor thread
-        queue_thread = threading.Thread(
-            target=self._process_refresh_queue,
-            daemon=True,
-            name="RefreshQueueProcessor"
-        )
-        queue_thread.start()
-        self.logger.info("⚡ Refresh queue processor started")
-        
-        # Start the periodic refresh thread
-        refresh_thread = threading.Thread(
-            target=self._periodic_refresh,
-            daemon=True,
-            name="PeriodicRefresh"
-        )
-        refresh_thread.start()
-        
+        """Start one refresh worker per source."""
+        for source in self.sources.values():
+            source.thread = threading.Thread(
+                target=self._run_source,
+                args=(source,),
+                daemon=True,
+                name=f"Refresh-{source.label}"
+            )
+            source.thread.start()
+
         from logger_config import log_thread_started
         log_thread_started(self.logger, "Background refresh", {
-            "JIRA": self.jira_refresh_interval,
-            "Freshservice": self.freshservice_refresh_interval
+            source.label: source.interval for source in self.sources.values()
         })
-    
-    def _process_refresh_queue(self):
-        """Process async refresh requests from the queue."""
-        self.logger.info("🔄 Refresh queue processor started")
-        while True:
-            with self.queue_lock:
-                if self.refresh_queue:
-                    task = self.refresh_queue.pop(0)
-                    remaining = len(self.refresh_queue)
-                else:
-                    task = None
-                    remaining = 0
-            
-            if task:
-                source, force = task
-                self.logger.info(f"🎯 Processing {source} refresh (force={force}, {remaining} remaining in queue)")
-                try:
-                    if source == "jira":
-                        self.jira_handler.refresh_data(force=force)
-                    elif source == "freshservice":
-                        self.freshservice_handler.refresh_data(force=force)
-                except Exception as e:
-                    self.logger.error(f"Error processing refresh for {source}: {e}")
-            
-            time.sleep(1)  # Check queue every second
-    
-    def _periodic_refresh(self):
-        """Periodically refresh data from both sources."""
-        jira_last_refresh = 0
-        freshservice_last_refresh = 0
-        
+
+    def _run_source(self, source: RefreshSource):
+        """Refresh one source whenever it is requested or due, until shutdown."""
         while True:
-            current_time = time.time()
-            
-            # Check if JIRA needs refresh
-            if current_time - jira_last_refresh >= self.jira_refresh_interval:
-                with self.queue_lock:
-                    self.refresh_queue.append(("jira", False))  # Use cache if valid
-                jira_last_refresh = current_time
-            
-            # Check if Freshservice needs refresh
-            if current_time - freshservice_last_refresh >= self.freshservice_refresh_interval:
-                with self.queue_lock:
-                    self.refresh_queue.append(("freshservice", False))  # Use cache if valid
-                freshservice_last_refresh = current_time
-            
-            # Sleep for a short interval before checking again
-            time.sleep(60)  # Check every minute
-    
-    def queue_jira_refresh(self, force: bool = True) -> str:
-        """Queue a JIRA refresh request."""
+            with source.condition:
+                while source.pending is None and not self._stopping.is_set():
+                    delay = source.next_due - time.monotonic()
+                    if delay <= 0:
+                        source.pending = RefreshRequest(force=False, reason="scheduled")  # Use cache if valid
+                        break
+                    source.condition.wait(delay)
+
+                if self._stopping.is_set():
+                    if source.pending is not None:
+                        self.logger.info(f"🛑 Dropping pending {source.label} refresh on shutdown")
+                        source.pending = None
+                    return
+
+                request = source.pending
+                source.pending = None
+                source.running = request
+                source.running_since = time.monotonic()
+                wait_seconds = source.running_since - request.queued_at
+
+            self.logger.info(
+                f"🎯 Processing {source.label} refresh (force={request.force}, "
+                f"{request.reason}, waited {wait_seconds:.1f}s)"
+            )
+            error = None
+            try:
+                source.handler.refresh_data(force=request.force)
+            except Exception as e:
+                error = str(e)
+                self.logger.error(f"Error processing refresh for {source.name}: {e}")
+
+            with source.condition:
+                finished = time.monotonic()
+                REFRESH_SECONDS.labels(source=source.name, outcome="error" if error else "ok").observe(
+                    finished - source.running_since
+                )
+                source.last_wait_seconds = round(wait_seconds, 3)
+                source.last_duration_seconds = round(finished - source.running_since, 3)
+                source.last_finished_at = datetime.now(timezone.utc).isoformat()
+                source.last_error = error
+                source.refresh_count += 1
+                source.running = None
+                source.running_since = None
+                source.next_due = finished + source.interval
+
+    def _queue_refresh(self, name: str, force: bool) -> str:
+        """Queue a refresh for a source, coalescing with any pending request."""
+        source = self.sources[name]
         try:
-            with self.queue_lock:
-                # Check if already in queue
-                if any(task[0] == "jira" and task[1] for task in self.refresh_queue):
-                    return "⏳ JIRA refresh already queued"
-                
-                self.refresh_queue.append(("jira", force))
-                queue_size = len(self.refresh_queue)
-            
-            self.logger.info("🔄 Force refresh queued for JIRA data")
-            return f"✅ JIRA refresh queued (position: {queue_size}). Check status with get_data_status()."
+            with source.condition:
+                if source.pending is not None:
+                    if source.pending.force or not force:
+                        return f"⏳ {source.label} refresh already queued"
+                    # A forced request absorbs the pending non-forced one and keeps its place
+                    source.pending.force = True
+                    source.pending.reason = "manual"
+                else:
+                    source.pending = RefreshRequest(force=force, reason="manual")
+                    source.condition.notify()
+                running = source.running is not None
+
+            self.logger.info(f"🔄 Force refresh queued for {source.label} data")
+            position = "after the refresh in progress" if running else "next"
+            return f"✅ {source.label} refresh queued ({position}). Check status with get_data_status()."
         except Exception as e:
-            error_msg = f"❌ Failed to queue JIRA refresh: {str(e)}"
+            error_msg = f"❌ Failed to queue {source.label} refresh: {str(e)}"
             self.logger.error(error_msg)
             return error_msg
-    
+
+    def queue_jira_refresh(self, force: bool = True) -> str:
+        """Queue a JIRA refresh request."""
+        return self._queue_refresh("jira", force)
+
     def queue_freshservice_refresh(self, force: bool = True) -> str:
         """Queue a Freshservice refresh request."""
-        try:
-            with self.queue_lock:
-                # Check if already in queue
-                if any(task[0] == "freshservice" and task[1] for task in self.refresh_queue):
-                    return "⏳ Freshservice refresh already queued"
-                
-                self.refresh_queue.append(("freshservice", force))
-                queue_size = len(self.refresh_queue)
-            
-            self.logger.info("🔄 Force refresh queued for Freshservice data")
-            return f"✅ Freshservice refresh queued (position: {queue_size}). Check status with get_data_status()."
-        except Exception as e:
-            error_msg = f"❌ Failed to queue Freshservice refresh: {str(e)}"
-            self.logger.error(error_msg)
-            return error_msg
-    
+        return self._queue_refresh("freshservice", force)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop the workers, letting refreshes already in progress finish."""
+        self._stopping.set()
+        for source in self.sources.values():
+            with source.condition:
+                source.condition.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for source in self.sources.values():
+            if source.thread is not None:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                source.thread.join(remaining)
+        self.logger.info("🛑 Refresh workers stopped")
+
     def get_queue_status(self) -> dict:
         """Get the current status of the refresh queue."""
-        with self.queue_lock:
-            queue_copy = self.refresh_queue.copy()
-            jira_queued = any(task[0] == "jira" for task in queue_copy)
-            freshservice_queued = any(task[0] == "freshservice" for task in queue_copy)
-        
+        now = time.monotonic()
+        items = []
+        sources = {}
+        for source in self.sources.values():
+            with source.condition:
+                pending = source.pending
+                running = source.running
+                if pending is not None:
+                    items.append({"source": source.name, "force": pending.force})
+                sources[source.name] = {
+                    "pending": pending is not None,
+                    "pending_force": pending.force if pending else None,
+                    "queued_for_seconds": round(now - pending.queued_at, 3) if pending else None,
+                    "running": running is not None,
+                    "running_for_seconds": round(now - source.running_since, 3) if running else None,
+                    "next_due_in_seconds": round(max(0.0, source.next_due - now), 1),
+                    "refresh_count": source.refresh_count,
+                    "last_wait_seconds": source.last_wait_seconds,
+                    "last_duration_seconds": source.last_duration_seconds,
+                    "last_finished_at": source.last_finished_at,
+                    "last_error": source.last_error,
+                }
+
         return {
-            "size": len(queue_copy),
-            "items": [{"source": task[0], "force": task[1]} for task in queue_copy],
-            "jira_queued": jira_queued,
-            "freshservice_queued": freshservice_queued
-        }
\ No newline at end of file
+            "size": len(items),
+            "items": items,
+            "jira_queued": sources["jira"]["pending"],
+            "freshservice_queued": sources["freshservice"]["pending"],
+            "sources": sources
+        }
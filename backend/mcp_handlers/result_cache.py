@@ -0,0 +1,155 @@
+"""Versioned cache of SQL query results.
+
+Entries are keyed on the handler's dataset generation plus a normalized form of
+the SQL, so a refresh that publishes new data makes every older entry
+unreachable; the handler also clears the cache at that point to release the
+memory right away. Entries expire after a TTL and the least recently used ones
+are evicted once the cache is full.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import pandas as pd
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))
+QUERY_CACHE_TTL_SECONDS = int(os.getenv("QUERY_CACHE_TTL_SECONDS", "600"))
+# Results with more rows than this are not cached, to keep memory bounded
+QUERY_CACHE_MAX_ROWS = int(os.getenv("QUERY_CACHE_MAX_ROWS", "50000"))
+
+_SQL_TOKEN = re.compile(
+    r"""
+      (?P<string>'(?:[^']|'')*')               # string literal, kept verbatim
+    | (?P<quoted>"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])  # quoted identifier, kept verbatim
+    | (?P<comment>--[^\n]*|/\*.*?\*/)          # comment, dropped
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?(?![\w.]))
+    | (?P<word>[A-Za-z_][\w$]*)
+    | (?P<space>\s+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_SPACED = ("string", "quoted", "number", "word")
+
+
+def _canonical_number(token: str) -> str:
+    """Spell a numeric literal one way per value, without changing its integer/real type."""
+    if any(c in token for c in ".eE"):
+        return repr(float(token))
+    return str(int(token))
+
+
+def normalize_sql(sql: str) -> str:
+    """Canonical text of a query for cache keys.
+
+    Keywords and unquoted identifiers are lower-cased (SQLite treats them
+    case-insensitively), whitespace and comments are collapsed, numeric
+    literals are spelled canonically and a trailing semicolon is dropped.
+    String literals and quoted identifiers are kept exactly as written.
+    """
+    parts = []
+    separated = False
+    last_kind = None
+    for match in _SQL_TOKEN.finditer(sql):
+        kind = match.lastgroup
+        token = match.group()
+        if kind in ("space", "comment"):
+            separated = True
+            continue
+        if kind == "number":
+            token = _canonical_number(token)
+        elif kind == "word":
+            token = token.lower()
+        # Keep a single space only where it separates two words or literals
+        if separated and kind in _SPACED and last_kind in _SPACED:
+            parts.append(" ")
+        parts.append(token)
+        separated = False
+        last_kind = kind
+
+    while parts and parts[-1] == ";":
+        parts.pop()
+    return "".join(parts)
+
+
+class QueryResultCache:
+    """Bounded LRU/TTL cache of query results, with hit and miss statistics.
+
+    Cached DataFrames are shared between callers and must be treated as
+    read-only. Queries that differ only in formatting share an entry, so a
+    hit may carry column labels spelled as in the query that filled it
+    (for example ``count(*)`` instead of ``COUNT(*)``).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_SIZE,
+        ttl_seconds: float = QUERY_CACHE_TTL_SECONDS,
+        max_rows: int = QUERY_CACHE_MAX_ROWS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Hashable, Tuple[float, Optional[pd.DataFrame]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(generation: int, sql: str) -> Tuple[int, str]:
+        return (generation, normalize_sql(sql))
+
+    def get(self, key: Hashable) -> Tuple[bool, Optional[pd.DataFrame]]:
+        """Look up a result, returning ``(found, result)``; ``result`` may be None for empty results."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key: Hashable, result: Optional[pd.DataFrame]):
+        """Store a result, evicting the least recently used entries beyond the size limit."""
+        if self.max_entries <= 0 or (result is not None and len(result) > self.max_rows):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (called when a refresh publishes new data)."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
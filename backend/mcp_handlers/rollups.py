@@ -0,0 +1,215 @@
+"""Materialized rollups: small pre-aggregated tables built with every dataset generation.
+
+Most questions about the datasets are counts and breakdowns (tickets by
+status, responder, department and week; demands by status and priority).
+Each rollup groups the dataset by a few common dimensions, optionally with a
+week or month bucket of a timestamp, and counts the rows. The tables are
+loaded into the query store next to ``df``, so the query tools answer these
+questions from a few hundred rows instead of scanning the whole dataset, and
+``list_rollups`` tells the model which ones exist.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+class Rollup:
+    """Definition of one rollup table.
+
+    ``dimensions`` pairs each rollup column with its source column; a JIRA
+    field id (``status``) matches the dataset's ``"Status (status)"`` column.
+    ``bucket`` is ``(column, source timestamp column, "week" | "month")``;
+    rows without that timestamp are left out of bucketed rollups. Weeks start
+    on Monday and are written as ``YYYY-MM-DD``, months as ``YYYY-MM``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        dimensions: Sequence[Tuple[str, str]],
+        measure: str,
+        bucket: Optional[Tuple[str, str, str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.dimensions = list(dimensions)
+        self.measure = measure
+        self.bucket = bucket
+
+
+JIRA_ROLLUPS = [
+    Rollup(
+        "demands_by_status",
+        "Demands by status, priority and issue type",
+        [("status", "status"), ("priority", "priority"), ("issue_type", "issuetype")],
+        "demands",
+    ),
+    Rollup(
+        "demands_by_assignee",
+        "Demands by assignee and status",
+        [("assignee", "assignee"), ("status", "status")],
+        "demands",
+    ),
+    Rollup(
+        "demands_created_monthly",
+        "Demands created per month, by status and priority",
+        [("status", "status"), ("priority", "priority")],
+        "demands",
+        bucket=("month", "created", "month"),
+    ),
+    Rollup(
+        "demands_resolved_monthly",
+        "Demands resolved per month, by priority and issue type",
+        [("priority", "priority"), ("issue_type", "issuetype")],
+        "demands",
+        bucket=("month", "resolutiondate", "month"),
+    ),
+]
+
+FRESHSERVICE_ROLLUPS = [
+    Rollup(
+        "tickets_by_status",
+        "Tickets by status, priority and type",
+        [("status", "status"), ("priority", "priority"), ("type", "type")],
+        "tickets",
+    ),
+    Rollup(
+        "tickets_by_responder",
+        "Tickets by responder and status",
+        [("responder_name", "responder_name"), ("status", "status")],
+        "tickets",
+    ),
+    Rollup(
+        "tickets_by_department",
+        "Tickets by department, category and status",
+        [("department", "department.name"), ("category", "category"), ("status", "status")],
+        "tickets",
+    ),
+    Rollup(
+        "tickets_created_weekly",
+        "Tickets created per week, by department, status and priority",
+        [("department", "department.name"), ("status", "status"), ("priority", "priority")],
+        "tickets",
+        bucket=("week", "created_at", "week"),
+    ),
+    Rollup(
+        "tickets_resolved_weekly",
+        "Tickets resolved per week, by responder",
+        [("responder_name", "responder_name")],
+        "tickets",
+        bucket=("week", "stats.resolved_at", "week"),
+    ),
+]
+
+
+def find_column(df: pd.DataFrame, source: str) -> Optional[str]:
+    """Return the dataset column for a source name or JIRA field id, if present."""
+    if source in df.columns:
+        return source
+    suffix = f"({source})"
+    return next((col for col in df.columns if isinstance(col, str) and col.endswith(suffix)), None)
+
+
+def _timestamps(series: pd.Series) -> pd.Series:
+    """Parse a timestamp column (typed or ISO text) as naive UTC."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        parsed = series
+    else:
+        parsed = pd.to_datetime(series.replace("", None), utc=True, errors="coerce", format="ISO8601")
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+    return parsed
+
+
+def build_rollup(df: pd.DataFrame, rollup: Rollup) -> Optional[pd.DataFrame]:
+    """
+    Build one rollup table.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Published dataset.
+    rollup : Rollup
+        Rollup definition.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        Bucket and dimension columns plus the count, or None if the dataset
+        lacks one of the source columns.
+    """
+    frame = {}
+    if rollup.bucket is not None:
+        column, source, unit = rollup.bucket
+        found = find_column(df, source)
+        if found is None:
+            return None
+        timestamps = _timestamps(df[found])
+        if unit == "week":
+            # Integer days: float weekdays (NaN where the timestamp is missing) can overflow in to_timedelta
+            weekday = timestamps.dt.weekday.fillna(0).astype("int64")
+            frame[column] = (timestamps - pd.to_timedelta(weekday, unit="D")).dt.strftime("%Y-%m-%d")
+        else:
+            frame[column] = timestamps.dt.strftime("%Y-%m")
+
+    for column, source in rollup.dimensions:
+        found = find_column(df, source)
+        if found is None:
+            return None
+        values = df[found]
+        frame[column] = values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype) else values
+
+    grouped = pd.DataFrame(frame).reset_index(drop=True)
+    if rollup.bucket is not None:
+        grouped = grouped[grouped[rollup.bucket[0]].notna()]
+    keys = list(frame)
+    table = grouped.groupby(keys, dropna=False, sort=False).size().reset_index(name=rollup.measure)
+    order = [rollup.bucket[0]] if rollup.bucket is not None else []
+    return table.sort_values(order + [rollup.measure], ascending=[True] * len(order) + [False], kind="stable").reset_index(drop=True)
+
+
+def build_rollups(df: Optional[pd.DataFrame], rollups: Sequence[Rollup], logger=None) -> Dict[str, pd.DataFrame]:
+    """
+    Build every rollup the dataset has the columns for.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or None
+        Published dataset; None or empty builds nothing.
+    rollups : Sequence[Rollup]
+        Rollup definitions.
+    logger : logging.Logger, optional
+        Logger used to report skipped or failed rollups.
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        Rollup tables by name.
+    """
+    tables: Dict[str, pd.DataFrame] = {}
+    if df is None or df.empty:
+        return tables
+    for rollup in rollups:
+        try:
+            table = build_rollup(df, rollup)
+        except Exception as e:
+            if logger:
+                logger.warning(f"⚠️ Failed to build rollup {rollup.name}: {e}")
+            continue
+        if table is None:
+            if logger:
+                logger.debug(f"Skipping rollup {rollup.name}: source columns missing")
+            continue
+        tables[rollup.name] = table
+    return tables
+
+
+def rollup_catalogue(tables: Dict[str, pd.DataFrame], rollups: Sequence[Rollup]) -> List[Dict[str, Any]]:
+    """Describe the built rollup tables: name, description, columns and row count."""
+    descriptions = {rollup.name: rollup.description for rollup in rollups}
+    return [
+        {"table": name, "description": descriptions.get(name, ""), "columns": list(table.columns), "rows": len(table)}
+        for name, table in tables.items()
+    ]
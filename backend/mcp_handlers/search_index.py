@@ -0,0 +1,304 @@
+"""BM25 full-text search over the text fields of a dataset.
+
+Each dataset keeps an SQLite FTS5 index of one title and one body column
+(ticket subject and description, demand summary and description) in a
+database file next to its parquet cache. ``SearchIndex.sync`` runs with every
+published generation and only rewrites the documents whose text changed,
+using a digest of the text per row, so a restart with an unchanged cache
+reindexes nothing and a refresh touches only new, edited and deleted rows.
+
+Searches rank matches with BM25 (title weighted above body) and then apply
+filters on structured columns against the published DataFrame, so filters
+always see the current generation.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .rollups import find_column
+
+# Upper bound for top_k in the search tools
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+SNIPPET_TOKENS = 16
+# Bump when the schema or tokenizer changes; older index files are rebuilt
+SCHEMA_VERSION = 2
+TITLE_WEIGHT, BODY_WEIGHT = 2.0, 1.0
+
+SCHEMA = f"""
+CREATE TABLE documents (id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, digest INTEGER NOT NULL);
+CREATE VIRTUAL TABLE documents_fts USING fts5(title, body, tokenize = 'porter unicode61 remove_diacritics 2');
+INSERT INTO documents_fts (documents_fts, rank) VALUES ('rank', 'bm25({TITLE_WEIGHT}, {BODY_WEIGHT})');
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+def _text(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    """A text column as plain strings, empty where missing."""
+    if column is None:
+        return pd.Series("", index=df.index, dtype=object)
+    values = df[column]
+    return values.astype(object).where(values.notna(), "").astype(str)
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 query matching any word of free text, with FTS5 syntax characters neutralized."""
+    terms = list(dict.fromkeys(re.findall(r"\w+", query.lower())))
+    return " OR ".join(f'"{term}"' for term in terms) or None
+
+
+def _plain(value: Any) -> Any:
+    """JSON-friendly form of a DataFrame cell."""
+    if isinstance(value, np.ndarray):
+        return [_plain(item) for item in value.tolist()]
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _matches(value: Any, wanted: List[str]) -> bool:
+    """Case-insensitive equality with any wanted value; list cells match on any item."""
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            value = json.loads(value)  # List columns stored as JSON text
+        except ValueError:
+            pass
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return any(_matches(item, wanted) for item in value)
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "" in wanted
+    return str(value).casefold() in wanted
+
+
+def _filter_mask(cells: pd.Series, wanted: List[str]) -> np.ndarray:
+    """Vectorized ``_matches`` over a column slice; only list-like cells are matched one by one."""
+    text = cells.astype(str).str.casefold()
+    missing = cells.isna().to_numpy()
+    mask = text.isin(wanted).to_numpy() & ~missing
+    if "" in wanted:
+        mask |= missing
+    listy = text.str.startswith("[").to_numpy()
+    if listy.any():
+        mask[listy] = [_matches(value, wanted) for value in cells[listy]]
+    return mask
+
+
+def _positions_of(positions: np.ndarray, rowids: np.ndarray) -> np.ndarray:
+    """Row positions of document ids; -1 for ids the position map does not know."""
+    known = rowids < len(positions)  # Documents added by a sync in another process
+    return np.where(known, positions[np.where(known, rowids, 0)], -1)
+
+
+class SearchIndex:
+    """Persistent FTS5 index of one dataset, kept in step with its published generations."""
+
+    def __init__(self, path: str, key: str, title: str, body: str, columns: Sequence[str]):
+        """
+        Parameters
+        ----------
+        path : str
+            Index database file.
+        key : str
+            Column identifying a row (ticket id, issue key).
+        title, body : str
+            Text columns to index, as dataset column names or JIRA field ids.
+        columns : Sequence[str]
+            Columns returned with each result, when the dataset has them.
+        """
+        self.path = path
+        self.key = key
+        self.title = title
+        self.body = body
+        self.columns = list(columns)
+        self._positions: Optional[tuple] = None  # (DataFrame, document id -> row position array)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")  # Searches keep reading while a sync writes
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DROP TABLE IF EXISTS documents")
+            conn.execute("DROP TABLE IF EXISTS documents_fts")
+            for statement in SCHEMA.strip().splitlines():
+                conn.execute(statement)
+            conn.execute("COMMIT")
+        return conn
+
+    def sync(self, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Bring the index in line with a dataset, rewriting only changed documents.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Published dataset. Rows are matched to documents by the key column.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of ``added``, ``updated``, ``removed`` and ``unchanged`` documents.
+        """
+        docs = pd.DataFrame({
+            "key": df[self.key].astype(str).to_numpy(),
+            "title": _text(df, find_column(df, self.title)).to_numpy(),
+            "body": _text(df, find_column(df, self.body)).to_numpy(),
+        }).drop_duplicates("key", keep="last")
+        docs["digest"] = pd.util.hash_pandas_object(docs[["title", "body"]], index=False).to_numpy().view(np.int64)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")  # Read and rewrite as one step if several processes sync
+            indexed = pd.read_sql("SELECT id, key, digest AS indexed_digest FROM documents", conn)
+            merged = docs.merge(indexed, on="key", how="outer", indicator=True)
+            removed = merged[merged["_merge"] == "right_only"]
+            updated = merged[(merged["_merge"] == "both") & (merged["digest"] != merged["indexed_digest"])]
+            added = merged[merged["_merge"] == "left_only"].copy()
+            # Ids are never reused: other processes may still map an old id to the row it belonged to
+            last_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'documents'").fetchone()
+            next_id = max(last_id[0] if last_id else 0, int(indexed["id"].max()) if len(indexed) else 0) + 1
+            added["id"] = np.arange(next_id, next_id + len(added))
+
+            stale = [(int(i),) for i in pd.concat([removed["id"], updated["id"]])]
+            conn.executemany("DELETE FROM documents_fts WHERE rowid = ?", stale)
+            conn.executemany("DELETE FROM documents WHERE id = ?", [(int(i),) for i in removed["id"]])
+            conn.executemany(
+                "UPDATE documents SET digest = ? WHERE id = ?",
+                zip(updated["digest"].astype("int64").tolist(), updated["id"].astype("int64").tolist()),
+            )
+            conn.executemany(
+                "INSERT INTO documents (id, key, digest) VALUES (?, ?, ?)",
+                zip(added["id"].tolist(), added["key"].tolist(), added["digest"].astype("int64").tolist()),
+            )
+            written = pd.concat([updated, added])
+            conn.executemany(
+                "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+                zip(written["id"].astype("int64").tolist(), written["title"].tolist(), written["body"].tolist()),
+            )
+            if len(written) > len(docs) // 2:
+                conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+            conn.execute("COMMIT")
+            self._positions = None
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        return {
+            "added": len(added),
+            "updated": len(updated),
+            "removed": len(removed),
+            "unchanged": len(docs) - len(added) - len(updated),
+        }
+
+    def _row_positions(self, conn: sqlite3.Connection, df: pd.DataFrame) -> np.ndarray:
+        """Row position in ``df`` of every document id (-1 if absent), kept until the next sync or DataFrame."""
+        cached = self._positions
+        if cached is None or cached[0] is not df:
+            documents = pd.read_sql("SELECT id, key FROM documents", conn)
+            positions = np.full(int(documents["id"].max()) + 1 if len(documents) else 1, -1, dtype=np.int64)
+            positions[documents["id"].to_numpy()] = pd.Index(df[self.key].astype(str)).get_indexer(documents["key"])
+            cached = (df, positions)
+            self._positions = cached
+        return cached[1]
+
+    def search(
+        self,
+        df: pd.DataFrame,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Rank the rows of a dataset against free text with BM25.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Published dataset; matches of rows it no longer has are dropped.
+        query : str
+            Free text; rows matching any of its words are ranked.
+        filters : Dict[str, Any], optional
+            Column (name or JIRA field id) to a value or list of values;
+            matching is case-insensitive and list columns match on any item.
+        top_k : int, optional
+            Number of results, capped at ``SEARCH_MAX_RESULTS``.
+
+        Returns
+        -------
+        Dict[str, Any]
+            ``query``, ``total_matches`` and ``results`` (key, score, result
+            columns and a highlighted ``snippet``), or ``error``.
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return {"error": "The search query has no words to match."}
+        if not os.path.exists(self.path):
+            return {"error": "The search index has not been built yet."}
+        top_k = max(1, min(int(top_k), SEARCH_MAX_RESULTS))
+
+        wanted = {}
+        for name, value in (filters or {}).items():
+            column = find_column(df, name)
+            if column is None:
+                return {"error": f"Unknown filter column {name!r}."}
+            values = value if isinstance(value, (list, tuple)) else [value]
+            wanted[column] = ["" if v is None else str(v).casefold() for v in values]
+
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            positions = self._row_positions(conn, df)
+            sql = "SELECT rowid, rank FROM documents_fts WHERE documents_fts MATCH ?"
+            ranked_by_sqlite = False
+            if not wanted:
+                # Count only matches of rows this DataFrame has (another process may have synced
+                # a newer generation); when all of them are here SQLite returns the best directly
+                matched = np.array([row[0] for row in conn.execute(
+                    "SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?", (expression,)
+                )], dtype=np.int64)
+                mapped = _positions_of(positions, matched) >= 0
+                if mapped.all():
+                    sql += f" ORDER BY rank LIMIT {top_k}"
+                    ranked_by_sqlite = True
+            # Otherwise every match is mapped and filtered first and the survivors are sorted
+            # here, which is faster than ORDER BY rank
+            hits = pd.DataFrame(conn.execute(sql, (expression,)).fetchall(), columns=["rowid", "rank"])
+            hits["position"] = _positions_of(positions, hits["rowid"].to_numpy(dtype=np.int64))
+            hits = hits[hits["position"] >= 0]
+            for column, values in wanted.items():
+                cells = df[column].take(hits["position"])
+                hits = hits[_filter_mask(cells, values)]
+            if ranked_by_sqlite:
+                total = len(matched)
+            else:
+                total = len(hits)
+                hits = hits.sort_values("rank", kind="stable").head(top_k)
+
+            rowids = hits["rowid"].tolist()
+            snippets = dict(conn.execute(
+                f"SELECT rowid, snippet(documents_fts, -1, '[', ']', '…', {SNIPPET_TOKENS}) FROM documents_fts "
+                f"WHERE documents_fts MATCH ? AND rowid IN ({', '.join('?' * len(rowids))})",
+                (expression, *rowids),
+            ).fetchall()) if rowids else {}
+        finally:
+            conn.close()
+
+        columns = [(name, find_column(df, name)) for name in self.columns]
+        results = []
+        key = df[self.key]
+        for rowid, rank, position in hits.itertuples(index=False):
+            result = {self.key: _plain(key.iat[position]), "score": round(-rank, 3)}
+            for name, column in columns:
+                if column is not None:
+                    result[column] = _plain(df[column].iat[position])
+            result["snippet"] = snippets.get(rowid, "")
+            results.append(result)
+        return {"query": query, "total_matches": total, "results": results}
@@ -0,0 +1,321 @@
+"""Datasets shared by several worker processes through a common directory.
+
+With ``SHARED_DATASET_DIR`` set (for ``uvicorn --workers N``), the worker
+processes elect one refresher by taking an exclusive lock on
+``refresher.lock``. Only the refresher runs the refresh workers and calls the
+JIRA and Freshservice APIs. It publishes every refresh as a new generation:
+
+- ``<name>-<generation>.arrow``: the dataset as an uncompressed Arrow IPC file
+- ``<name>-<generation>.sqlite``: its query database with the rollup tables (``sqlite`` engine only)
+- ``<name>.json``: manifest naming the current generation, replaced atomically
+
+Every process, the refresher included, serves a generation from those files
+read-only: the Arrow file is memory-mapped and the SQLite file is opened
+immutable with memory-mapped I/O, so their pages are held once in the OS page
+cache however many workers read them. Point the directory at a tmpfs such as
+``/dev/shm`` to keep the files in shared memory.
+
+The other workers poll the manifests and attach to new generations as they
+appear, hand forced refresh requests to the refresher as request files, and
+take over the refresher role when its process exits (the lock is released by
+the OS).
+"""
+
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+
+from data.arrow_cache import arrow_types_mapper, read_arrow_table, write_arrow_table
+from .query_engine import (
+    DEFAULT_QUERY_ENGINE,
+    DatasetSnapshot,
+    SQLiteFileStore,
+    create_store,
+    write_sqlite_file,
+)
+from .refresh_handler import RefreshHandler
+from .rollups import Rollup, build_rollups, rollup_catalogue
+
+# Directory shared by the worker processes; empty disables sharing (every process refreshes on its own)
+SHARED_DATASET_DIR = os.getenv("SHARED_DATASET_DIR", "")
+SHARED_DATASET_POLL_SECONDS = float(os.getenv("SHARED_DATASET_POLL_SECONDS", "2"))
+# Generations kept on disk; a worker may still be opening one that was just superseded
+SHARED_DATASET_KEEP_GENERATIONS = int(os.getenv("SHARED_DATASET_KEEP_GENERATIONS", "3"))
+
+SOURCE_LABELS = {"jira": "JIRA", "freshservice": "Freshservice"}
+
+
+def shared_datasets_enabled() -> bool:
+    return bool(SHARED_DATASET_DIR)
+
+
+class RefresherElection:
+    """Elects the refresher among the processes sharing a directory.
+
+    The refresher holds an exclusive ``flock`` on the lock file for as long as
+    it runs; the lock goes away with its process, so another worker can win
+    the next election.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, "refresher.lock")
+        self._fd: Optional[int] = None
+
+    @property
+    def is_refresher(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Become the refresher if no other process is; returns whether this process is it."""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def refresher_pid(self) -> Optional[int]:
+        """Pid of the current refresher, as written to the lock file."""
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedDataset:
+    """Publishes and attaches the generations of one dataset in the shared directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        election: RefresherElection,
+        to_table: Callable[[pd.DataFrame], pa.Table],
+        types_mapper: Optional[Callable[[pa.DataType], Any]] = None,
+        rollups: Sequence[Rollup] = (),
+    ):
+        self.directory = directory
+        self.name = name
+        self.election = election
+        self.to_table = to_table
+        self.types_mapper = types_mapper
+        self.rollups = rollups
+        self.manifest_path = os.path.join(directory, f"{name}.json")
+        self.request_path = os.path.join(directory, f"{name}.refresh-request")
+        self._file_pattern = re.compile(rf"^{re.escape(name)}-(\d+)\.(arrow|sqlite)$")
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        """Return the current manifest, or None if nothing has been published yet."""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def publish(self, data: Optional[pd.DataFrame], logger) -> DatasetSnapshot:
+        """
+        Write a dataset as the next generation and return the snapshot serving it.
+
+        Parameters
+        ----------
+        data : pd.DataFrame or None
+            Dataset to publish; None or empty publishes an empty generation.
+        logger : logging.Logger
+            Logger used to report fallbacks.
+
+        Returns
+        -------
+        DatasetSnapshot
+            Snapshot attached to the published files, as other workers will see it.
+        """
+        generation = (self.read_manifest() or {}).get("generation", 0) + 1
+        manifest = {
+            "generation": generation,
+            "records": 0,
+            "arrow": None,
+            "sqlite": None,
+            "rollups": [],
+            "published_at": time.time(),
+            "publisher_pid": os.getpid(),
+        }
+
+        if data is not None and not data.empty:
+            manifest["records"] = len(data)
+            manifest["arrow"] = f"{self.name}-{generation}.arrow"
+            write_arrow_table(self.to_table(data), os.path.join(self.directory, manifest["arrow"]))
+            if DEFAULT_QUERY_ENGINE == "sqlite":
+                sqlite_file = f"{self.name}-{generation}.sqlite"
+                tables = build_rollups(data, self.rollups, logger)
+                try:
+                    write_sqlite_file(data, os.path.join(self.directory, sqlite_file), tables=tables)
+                    manifest["sqlite"] = sqlite_file
+                    manifest["rollups"] = rollup_catalogue(tables, self.rollups)
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to write shared SQLite file for {self.name}, workers build their own store: {e}")
+
+        tmp_path = f"{self.manifest_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        self._prune(generation)
+        return self.attach(manifest, logger)
+
+    def attach(self, manifest: Dict[str, Any], logger) -> DatasetSnapshot:
+        """Open a published generation read-only and return its snapshot."""
+        generation = manifest["generation"]
+        if not manifest.get("arrow"):
+            return DatasetSnapshot(pd.DataFrame(), None, generation)
+
+        table = read_arrow_table(os.path.join(self.directory, manifest["arrow"]))
+        data = table.to_pandas(types_mapper=arrow_types_mapper(self.types_mapper), split_blocks=True)
+        if manifest.get("sqlite"):
+            store = SQLiteFileStore(os.path.join(self.directory, manifest["sqlite"]))
+            rollups = manifest.get("rollups", [])
+        else:
+            # No shared database: every worker builds its own rollups along with its store
+            tables = build_rollups(data, self.rollups, logger)
+            store = create_store(data, logger, tables=tables)
+            rollups = rollup_catalogue(tables, self.rollups)
+        return DatasetSnapshot(data, store, generation, rollups)
+
+    def _prune(self, generation: int):
+        """Delete generation files older than the ones kept (open mappings stay valid)."""
+        for filename in os.listdir(self.directory):
+            match = self._file_pattern.match(filename)
+            if match and int(match.group(1)) <= generation - SHARED_DATASET_KEEP_GENERATIONS:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except FileNotFoundError:
+                    pass
+
+    def request_refresh(self):
+        """Ask the refresher process for a forced refresh."""
+        with open(self.request_path, "w") as f:
+            f.write(str(os.getpid()))
+
+    def take_refresh_request(self) -> bool:
+        """Consume a pending refresh request; returns whether there was one."""
+        try:
+            os.remove(self.request_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def refresh_requested(self) -> bool:
+        return os.path.exists(self.request_path)
+
+
+class SharedRefreshCoordinator:
+    """Takes the place of RefreshHandler in every worker when datasets are shared.
+
+    In the refresher it runs a RefreshHandler and hands it the refresh
+    requests other workers leave in the shared directory. In the other
+    workers it attaches the handlers to new generations, forwards refresh
+    requests, and retries the election so a worker takes over when the
+    refresher exits.
+    """
+
+    def __init__(self, logger, jira_handler, freshservice_handler, election: RefresherElection):
+        self.logger = logger
+        self.handlers = {"jira": jira_handler, "freshservice": freshservice_handler}
+        self.election = election
+        self.refresh_handler: Optional[RefreshHandler] = None
+        self._stopping = threading.Event()
+
+        self._become_refresher()
+        if self.refresh_handler is None:
+            self.logger.info(f"🔗 Serving shared datasets published by refresher pid {self.election.refresher_pid()}")
+        self._thread = threading.Thread(target=self._watch, daemon=True, name="SharedDatasets")
+        self._thread.start()
+
+    @property
+    def role(self) -> str:
+        return "refresher" if self.refresh_handler is not None else "follower"
+
+    def _become_refresher(self):
+        if self.refresh_handler is None and self.election.try_acquire():
+            self.logger.info(f"👑 Process {os.getpid()} is the shared dataset refresher")
+            for handler in self.handlers.values():
+                handler.attach_shared()  # Continue from whatever the previous refresher published
+            self.refresh_handler = RefreshHandler(
+                self.logger, self.handlers["jira"], self.handlers["freshservice"], queue_initial_load=True
+            )
+
+    def _watch(self):
+        while not self._stopping.wait(SHARED_DATASET_POLL_SECONDS):
+            try:
+                if self.refresh_handler is None:
+                    for handler in self.handlers.values():
+                        handler.attach_shared()
+                    self._become_refresher()
+                else:
+                    for name, handler in self.handlers.items():
+                        if handler.shared.take_refresh_request():
+                            self.refresh_handler._queue_refresh(name, force=True)
+            except Exception as e:
+                self.logger.error(f"Error syncing shared datasets: {e}")
+
+    def _queue_refresh(self, name: str, force: bool) -> str:
+        if self.refresh_handler is not None:
+            return self.refresh_handler._queue_refresh(name, force)
+        label = SOURCE_LABELS[name]
+        try:
+            self.handlers[name].shared.request_refresh()
+        except OSError as e:
+            return f"❌ Failed to queue {label} refresh: {e}"
+        self.logger.info(f"🔄 {label} refresh requested from the refresher process")
+        return f"✅ {label} refresh requested from the refresher process. Check status with get_data_status()."
+
+    def queue_jira_refresh(self, force: bool = True) -> str:
+        """Queue a JIRA refresh request."""
+        return self._queue_refresh("jira", force)
+
+    def queue_freshservice_refresh(self, force: bool = True) -> str:
+        """Queue a Freshservice refresh request."""
+        return self._queue_refresh("freshservice", force)
+
+    def get_queue_status(self) -> dict:
+        """Refresh queue status of the refresher, or the forwarded requests of this worker."""
+        if self.refresh_handler is not None:
+            status = self.refresh_handler.get_queue_status()
+        else:
+            requested = {name: handler.shared.refresh_requested() for name, handler in self.handlers.items()}
+            status = {
+                "size": sum(requested.values()),
+                "items": [{"source": name, "force": True} for name, pending in requested.items() if pending],
+                "jira_queued": requested["jira"],
+                "freshservice_queued": requested["freshservice"],
+                "sources": {},
+            }
+        status["role"] = self.role
+        status["refresher_pid"] = self.election.refresher_pid()
+        return status
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop syncing and, in the refresher, the refresh workers; then give up the role."""
+        self._stopping.set()
+        self._thread.join(timeout)
+        if self.refresh_handler is not None:
+            self.refresh_handler.shutdown(timeout)
+        self.election.release()
@@ -0,0 +1,310 @@
+"""In-process metrics registry exposed in the Prometheus text format at ``/api/metrics``.
+
+Counters, gauges and histograms are plain Python objects guarded by one lock
+per metric, so recording a value costs a dictionary lookup and an addition.
+Every worker process keeps its own registry; with several uvicorn workers each
+scrape reaches one of them, so scrape the workers individually or aggregate
+by instance.
+
+Usage::
+
+    from metrics import TOOL_SECONDS
+
+    with TOOL_SECONDS.labels(tool="query_jira_demands", outcome="ok").time():
+        ...
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Bucket upper bounds in seconds: fast (SQL, JWT) through slow (LLM rounds, refreshes)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (100, 1_000, 5_000, 10_000, 20_000, 50_000, 100_000, 500_000, 1_000_000)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child holding the value(s) for one combination of label values."""
+
+    def labels(self, **labels: str):
+        """Return the child metric for one combination of label values."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every child."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from ``function`` at collection time instead."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback when scraped."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            try:
+                value = child.value
+            except Exception:
+                continue  # A failing callback must never break the scrape
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of the ``with`` block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets (cumulative when rendered)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics, rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+# Chat requests
+CHAT_REQUESTS = registry.counter(
+    "tamkeen_chat_requests", "Chat requests by endpoint and outcome", ("endpoint", "outcome")
+)
+CHAT_REQUEST_SECONDS = registry.histogram(
+    "tamkeen_chat_request_seconds", "End-to-end chat request duration", ("endpoint",)
+)
+TIME_TO_FIRST_TOKEN_SECONDS = registry.histogram(
+    "tamkeen_stream_time_to_first_token_seconds", "Time from request to the first streamed frame on /api/chat/stream"
+)
+LLM_ROUND_SECONDS = registry.histogram(
+    "tamkeen_llm_round_seconds", "Duration of one model call (round), including streaming", ("endpoint",)
+)
+LLM_ROUNDS_PER_REQUEST = registry.histogram(
+    "tamkeen_llm_rounds_per_request", "Model calls needed to answer one chat request", ("endpoint",),
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 11),
+)
+
+# Tools
+TOOL_SECONDS = registry.histogram(
+    "tamkeen_tool_seconds", "Tool execution time by tool and outcome (ok, error, timeout)", ("tool", "outcome")
+)
+TOOL_RESULT_BYTES = registry.histogram(
+    "tamkeen_tool_result_bytes", "Size of tool results returned to the model", ("tool",), buckets=SIZE_BUCKETS
+)
+
+# Datasets
+SQL_QUERY_SECONDS = registry.histogram(
+    "tamkeen_sql_query_seconds", "SQL execution time per handler (result cache misses only)", ("handler",)
+)
+SQL_QUERY_CACHE = registry.counter(
+    "tamkeen_sql_query_cache", "SQL queries per handler by result cache outcome (hit, miss)", ("handler", "result")
+)
+DATASET_RECORDS = registry.gauge(
+    "tamkeen_dataset_records", "Records in the currently published dataset", ("source",)
+)
+DATASET_GENERATION = registry.gauge(
+    "tamkeen_dataset_generation", "Generation of the currently published dataset", ("source",)
+)
+REFRESH_SECONDS = registry.histogram(
+    "tamkeen_refresh_seconds", "Data refresh duration by source and outcome (ok, error)", ("source", "outcome")
+)
+REFRESH_QUEUE_DEPTH = registry.gauge(
+    "tamkeen_refresh_queue_depth", "Refresh requests waiting per source", ("source",)
+)
+REFRESH_IN_PROGRESS = registry.gauge(
+    "tamkeen_refresh_in_progress", "1 while a refresh of the source is running", ("source",)
+)
+
+# Auth
+JWT_VALIDATION_SECONDS = registry.histogram(
+    "tamkeen_jwt_validation_seconds", "Azure AD token validation time by outcome (ok, cached, invalid)", ("outcome",)
+)
@@ -0,0 +1,125 @@
+"""Background application startup with per-phase timings and a readiness signal.
+
+The server starts accepting connections immediately; the expensive work runs
+afterwards as phases on worker threads:
+
+1. ``handlers``: import the tools module and create the (empty) data handlers
+2. ``jira_cache`` / ``freshservice_cache`` / ``ai_service`` / ``auth_keys``: load
+   both dataset caches, build the AI service and prefetch the Azure AD signing
+   keys, all concurrently
+3. ``refresh_workers``: start the background refresh workers
+
+The app is ready once every phase has finished without error.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from logger_config import setup_logging
+
+logger = setup_logging("tamkeen.startup", use_color=True)
+
+
+class StartupPhase:
+    """Timing and outcome of one startup phase."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "pending"
+        self.started_at: Optional[str] = None
+        self.duration_ms: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+def _create_handlers():
+    from ai import mcp_tools
+    mcp_tools.create_handlers(load_caches=False)
+
+
+def _load_cache(name: str):
+    from ai import mcp_tools
+    handler = getattr(mcp_tools, name)
+    if handler is not None:
+        handler.load_cache()
+
+
+def _build_ai_service():
+    from ai.routes import get_ai_service
+    get_ai_service()
+
+
+def _prefetch_signing_keys():
+    from auth.azure_auth import start_signing_key_refresh
+    start_signing_key_refresh()
+
+
+def _start_refresh_workers():
+    from ai import mcp_tools
+    mcp_tools.start_refresh_workers()
+
+
+class Startup:
+    """Runs the startup phases and reports their progress."""
+
+    def __init__(self):
+        self.phases: Dict[str, StartupPhase] = {
+            name: StartupPhase(name)
+            for name in ("handlers", "jira_cache", "freshservice_cache", "ai_service", "auth_keys", "refresh_workers")
+        }
+        self._started = time.monotonic()
+        self.total_ms: Optional[int] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(phase.status == "done" for phase in self.phases.values())
+
+    async def _run_phase(self, name: str, fn: Callable[[], None]):
+        phase = self.phases[name]
+        phase.status = "running"
+        phase.started_at = datetime.now(timezone.utc).isoformat()
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(fn)
+            phase.status = "done"
+        except Exception as e:
+            phase.status = "failed"
+            phase.error = str(e)
+            logger.error(f"❌ Startup phase {name} failed: {e}")
+        finally:
+            phase.duration_ms = int((time.monotonic() - started) * 1000)
+
+    async def run(self):
+        """Run every phase; failures are recorded and leave the app not ready."""
+        await self._run_phase("handlers", _create_handlers)
+        await asyncio.gather(
+            self._run_phase("jira_cache", lambda: _load_cache("jira_handler")),
+            self._run_phase("freshservice_cache", lambda: _load_cache("freshservice_handler")),
+            self._run_phase("ai_service", _build_ai_service),
+            self._run_phase("auth_keys", _prefetch_signing_keys),
+        )
+        await self._run_phase("refresh_workers", _start_refresh_workers)
+
+        self.total_ms = int((time.monotonic() - self._started) * 1000)
+        timings = ", ".join(f"{p.name}={p.duration_ms}ms" for p in self.phases.values())
+        if self.ready:
+            logger.info(f"🚀 Ready after {self.total_ms}ms ({timings})")
+        else:
+            logger.warning(f"⚠️ Startup finished with errors after {self.total_ms}ms ({timings})")
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.monotonic() - self._started, 3),
+            "startup_ms": self.total_ms,
+            "phases": {name: phase.as_dict() for name, phase in self.phases.items()},
+        }
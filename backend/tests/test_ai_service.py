@@ -0,0 +1,186 @@
+"""AIService rounds against a scripted stand-in model and stand-in tools."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessageChunk, ToolMessage
+from langchain_core.tools import StructuredTool
+
+import tracing
+from ai import service as service_module
+from ai.models import ChatServiceError
+from ai.service import AIService
+from metrics import TOOL_SECONDS
+
+
+class ScriptedModel:
+    """Stands in for the tool-bound model; each ``astream`` call plays the next scripted round."""
+
+    def __init__(self, *rounds):
+        self.rounds = list(rounds)
+        self.calls = []
+
+    async def astream(self, messages):
+        self.calls.append(list(messages))
+        chunks = self.rounds.pop(0)
+        for chunk in chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    return AIService()
+
+
+def malformed_tool_call():
+    return AIMessageChunk(
+        content="", tool_call_chunks=[{"name": "get_data_status", "args": "source=jira", "id": "call_1", "index": 0}]
+    )
+
+
+def retried_tool_results(model):
+    return [m for m in model.calls[1] if isinstance(m, ToolMessage)]
+
+
+def test_malformed_tool_calls_get_another_round(service):
+    model = ScriptedModel([malformed_tool_call()], [AIMessageChunk(content="Sorry, here it is.")])
+    service.llm_with_tools = model
+    assert asyncio.run(service.generate_response("status?")) == "Sorry, here it is."
+    (result,) = retried_tool_results(model)
+    assert result.tool_call_id == "call_1" and "could not parse arguments" in str(result.content)
+
+
+def test_malformed_tool_calls_get_another_streamed_round(service):
+    model = ScriptedModel([malformed_tool_call()], [AIMessageChunk(content="Sorry, here it is.")])
+    service.llm_with_tools = model
+
+    async def consume():
+        return [frame async for frame in service.stream_response("status?")]
+
+    frames = "".join(asyncio.run(consume()))
+    assert "Sorry, here it is." in frames
+    (result,) = retried_tool_results(model)
+    assert result.tool_call_id == "call_1"
+
+
+def run_traced(coroutine_factory):
+    async def traced():
+        trace = tracing.start_trace("test")
+        await coroutine_factory()
+        return trace
+
+    return asyncio.run(traced())
+
+
+def test_failed_round_closes_its_span(service):
+    service.llm_with_tools = ScriptedModel([AIMessageChunk(content="Let me"), RuntimeError("overloaded")])
+
+    async def respond():
+        with pytest.raises(ChatServiceError):
+            await service.generate_response("hi")
+
+    trace = run_traced(respond)
+    (round_span,) = trace.root.children
+    assert round_span.name == "llm.round" and round_span.ended is not None
+    assert round_span.attrs["completed"] is False
+
+
+def test_failed_streamed_round_closes_its_span(service):
+    service.llm_with_tools = ScriptedModel([AIMessageChunk(content="Let me"), RuntimeError("overloaded")])
+
+    async def consume():
+        return [frame async for frame in service.stream_response("hi")]
+
+    trace = run_traced(consume)
+    (round_span,) = trace.root.children
+    assert round_span.ended is not None and round_span.attrs["completed"] is False
+
+
+class StubTools:
+    """Async stand-in tools that finish after a set delay and record cancellation."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.started = asyncio.Event()
+        self.cancelled = []
+
+    def install(self, service):
+        tools = [self._make(name, delay) for name, delay in self.delays.items()]
+        service.tools = tools
+        service.tool_map = {t.name: t for t in tools}
+
+    def _make(self, name, delay):
+        async def run() -> str:
+            self.started.set()
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            return f"{name} done"
+
+        return StructuredTool.from_function(coroutine=run, name=name, description=f"Stub tool {name}.")
+
+
+def tool_calls(*names):
+    return [{"name": name, "args": {}, "id": f"call_{name}"} for name in names]
+
+
+def test_tool_results_stream_as_tools_finish_but_return_in_call_order(service):
+    StubTools({"slow_tool": 0.2, "fast_tool": 0.01}).install(service)
+
+    async def collect():
+        return [item async for item in service._stream_tools(tool_calls("slow_tool", "fast_tool"), 0)]
+
+    items = asyncio.run(collect())
+    events = [json.loads(item) for item in items[:-1]]
+    assert [e["name"] for e in events if e["type"] == "tool_call"] == ["slow_tool", "fast_tool"]
+    assert [e["name"] for e in events if e["type"] == "tool_result"] == ["fast_tool", "slow_tool"]
+    messages = items[-1]
+    assert [(m.tool_call_id, m.content) for m in messages] == [
+        ("call_slow_tool", "slow_tool done"),
+        ("call_fast_tool", "fast_tool done"),
+    ]
+
+
+def test_slow_tool_times_out(service, monkeypatch):
+    monkeypatch.setattr(service_module, "TOOL_TIMEOUT_SECONDS", 0.05)
+    stubs = StubTools({"stuck_tool": 5})
+    stubs.install(service)
+    timeouts = TOOL_SECONDS.labels(tool="stuck_tool", outcome="timeout").count
+
+    async def collect():
+        return [item async for item in service._stream_tools(tool_calls("stuck_tool"), 0)]
+
+    items = asyncio.run(collect())
+    (result,) = [json.loads(item) for item in items[:-1] if json.loads(item)["type"] == "tool_result"]
+    assert result["is_error"]
+    assert "timed out" in items[-1][0].content
+    assert TOOL_SECONDS.labels(tool="stuck_tool", outcome="timeout").count == timeouts + 1
+    assert stubs.cancelled == ["stuck_tool"]  # wait_for cancels the coroutine it gave up on
+
+
+def test_closing_the_stream_cancels_running_tools(service):
+    stubs = StubTools({"long_tool": 5, "other_tool": 5})
+    stubs.install(service)
+
+    async def disconnect_while_tools_run():
+        stream = service._stream_tools(tool_calls("long_tool", "other_tool"), 0)
+        # Start markers and tool_call events for both tools come out before any result
+        for _ in range(4):
+            await stream.__anext__()
+        waiting = asyncio.ensure_future(stream.__anext__())
+        await stubs.started.wait()
+        waiting.cancel()  # The client went away while the round waited on its tools
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        # Checked before asyncio.run tears the loop down, which would cancel leftovers anyway
+        return sorted(stubs.cancelled)
+
+    assert asyncio.run(disconnect_while_tools_run()) == ["long_tool", "other_tool"]
@@ -0,0 +1,60 @@
+"""Dataset cache files: atomic Parquet and Arrow writes."""
+
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data import arrow_cache
+
+OLD = pa.table({"n": [1, 2]})
+NEW = pa.table({"n": [3, 4, 5]})
+
+
+@pytest.fixture
+def arrow_format(monkeypatch):
+    monkeypatch.setattr(arrow_cache, "CACHE_FORMAT", "arrow")
+
+
+def test_cache_is_replaced_with_the_new_table(tmp_path, arrow_format):
+    path = str(tmp_path / "cache.parquet")
+    arrow_cache.write_cache_table(OLD, path)
+    arrow_cache.write_cache_table(NEW, path)
+
+    assert pq.read_table(path).equals(NEW)
+    assert arrow_cache.read_cache_frame(path)["n"].tolist() == [3, 4, 5]
+    assert sorted(os.listdir(tmp_path)) == ["cache.arrow", "cache.parquet"]
+
+
+def test_failed_parquet_write_keeps_the_previous_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.parquet")
+    arrow_cache.write_cache_table(OLD, path)
+
+    def crash(table, where):
+        with open(where, "wb") as f:
+            f.write(b"PAR1 truncated")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(arrow_cache.pq, "write_table", crash)
+    with pytest.raises(OSError):
+        arrow_cache.write_cache_table(NEW, path)
+
+    assert pq.read_table(path).equals(OLD)
+    assert os.listdir(tmp_path) == ["cache.parquet"]
+
+
+def test_failed_arrow_write_keeps_the_previous_copy(tmp_path, arrow_format, monkeypatch):
+    path = str(tmp_path / "cache.arrow")
+    arrow_cache.write_arrow_table(OLD, path)
+
+    def crash(sink, schema):
+        sink.write(b"ARROW1 truncated")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(arrow_cache.ipc, "new_file", crash)
+    with pytest.raises(OSError):
+        arrow_cache.write_arrow_table(NEW, path)
+
+    assert arrow_cache.read_arrow_table(path).equals(OLD)
+    assert os.listdir(tmp_path) == ["cache.arrow"]
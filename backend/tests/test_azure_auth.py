@@ -0,0 +1,92 @@
+"""Token validation against a local stand-in JWKS server."""
+
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from auth import azure_auth as auth_module
+from benchmarks.auth import CLIENT_ID, ISSUER, StandInJWKS, make_token
+
+
+@pytest.fixture
+def jwks():
+    server = StandInJWKS(delay=0.05)
+    server.add_key("key-1")
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def azure_auth(jwks, monkeypatch):
+    monkeypatch.setattr(auth_module, "AZURE_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(auth_module, "AZURE_ISSUER", ISSUER)
+    monkeypatch.setattr(auth_module, "signing_keys", auth_module.SigningKeyStore(jwks.url))
+    auth_module.token_cache.clear()
+    yield auth_module
+    auth_module.token_cache.clear()
+
+
+def rejected(validate, token: str) -> bool:
+    try:
+        validate(token)
+    except HTTPException as e:
+        return e.status_code == 401
+    return False
+
+
+def test_valid_token_is_accepted_with_one_key_fetch(azure_auth, jwks):
+    claims = azure_auth.validate_token(make_token(jwks.private_keys["key-1"], "key-1"))
+    assert claims["oid"] == "user-1"
+    assert jwks.requests == 1
+
+
+def test_repeated_validation_is_served_from_the_cache(azure_auth, jwks):
+    token = make_token(jwks.private_keys["key-1"], "key-1")
+    claims = azure_auth.validate_token(token)
+    hits = azure_auth.token_cache.stats()["hits"]
+    assert azure_auth.validate_token(token) is claims
+    assert azure_auth.token_cache.stats()["hits"] == hits + 1
+
+
+def test_tampered_signature_is_rejected(azure_auth, jwks):
+    header, payload, signature = make_token(jwks.private_keys["key-1"], "key-1").split(".")
+    tampered = ".".join([header, payload, signature[:-4] + ("BBBB" if signature.endswith("AAAA") else "AAAA")])
+    assert rejected(azure_auth.validate_token, tampered)
+
+
+def test_wrong_audience_is_rejected(azure_auth, jwks):
+    assert rejected(azure_auth.validate_token, make_token(jwks.private_keys["key-1"], "key-1", aud="someone-else"))
+
+
+def test_cached_claims_are_dropped_once_the_token_expires(azure_auth, jwks):
+    # exp is whole seconds, so a 2s lifetime stays valid for at least 1s after issue
+    short_lived = make_token(jwks.private_keys["key-1"], "key-1", lifetime=2)
+    azure_auth.validate_token(short_lived)
+    time.sleep(2.1)
+    assert rejected(azure_auth.validate_token, short_lived)
+
+
+def test_rotated_key_is_picked_up_with_a_single_shared_fetch(azure_auth, jwks):
+    azure_auth.validate_token(make_token(jwks.private_keys["key-1"], "key-1"))
+    key2 = jwks.add_key("key-2")
+    rotated = [make_token(key2, "key-2", oid=f"user-{i}") for i in range(20)]
+    azure_auth.signing_keys.fetched_at = None  # Allow the on-demand refresh right away
+    before = jwks.requests
+
+    async def validate_all():
+        return await asyncio.gather(*(azure_auth.validate_token_async(token) for token in rotated))
+
+    results = asyncio.run(validate_all())
+    assert [claims["oid"] for claims in results] == [f"user-{i}" for i in range(20)]
+    assert jwks.requests - before == 1
+
+
+def test_unknown_key_ids_are_rejected_without_refetching(azure_auth, jwks):
+    azure_auth.validate_token(make_token(jwks.private_keys["key-1"], "key-1"))
+    foreign = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    before = jwks.requests
+    assert all(rejected(azure_auth.validate_token, make_token(foreign, f"bogus-{i}")) for i in range(5))
+    assert jwks.requests == before
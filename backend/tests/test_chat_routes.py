@@ -0,0 +1,177 @@
+"""Chat endpoints against a stand-in AI service: request metrics and traces."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk
+
+import tracing
+from ai import routes
+from ai.models import ChatRequest
+from ai.service import AIService
+from metrics import CHAT_REQUEST_SECONDS, CHAT_REQUESTS
+
+
+class StandInService:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def generate_response(self, message, conversation_history=None):
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return f"echo: {message}"
+
+    async def stream_response(self, message, conversation_history=None):
+        for word in message.split():
+            yield json.dumps({"type": "content", "content": word})
+        yield json.dumps({"type": "done", "usage": {}})
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(routes.ai_router)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        yield client
+
+
+def counts():
+    return (
+        CHAT_REQUESTS.labels(endpoint="chat", outcome="ok").value,
+        CHAT_REQUESTS.labels(endpoint="chat", outcome="error").value,
+        CHAT_REQUEST_SECONDS.labels(endpoint="chat").count,
+    )
+
+
+def test_successful_chat_is_counted(client, monkeypatch):
+    monkeypatch.setattr(routes, "_ai_service", StandInService())
+    ok, error, observed = counts()
+    response = client.post("/api/chat", json={"message": "hi"})
+    assert response.status_code == 200
+    assert response.json()["response"] == "echo: hi"
+    assert counts() == (ok + 1, error, observed + 1)
+
+
+class FailingModel:
+    """Stands in for the model during an outage."""
+
+    async def astream(self, messages):
+        raise RuntimeError("model unavailable")
+        yield
+
+
+class ToolLoopModel:
+    """Asks for the current time on every round, so the service runs out of rounds."""
+
+    async def astream(self, messages):
+        yield AIMessageChunk(
+            content="", tool_call_chunks=[{"name": "get_current_time", "args": "{}", "id": f"call_{len(messages)}", "index": 0}]
+        )
+
+
+@pytest.fixture
+def real_service(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    service = AIService()
+    monkeypatch.setattr(routes, "_ai_service", service)
+    return service
+
+
+def stream_counts():
+    return (
+        CHAT_REQUESTS.labels(endpoint="stream", outcome="ok").value,
+        CHAT_REQUESTS.labels(endpoint="stream", outcome="error").value,
+    )
+
+
+def test_failed_chat_is_counted_as_an_error(client, real_service, monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    real_service.llm_with_tools = FailingModel()
+    ok, error, observed = counts()
+    response = client.post("/api/chat", json={"message": "hi", "trace": True})
+    # The user still gets the service's apology
+    assert response.status_code == 200
+    assert response.json()["response"] == "I encountered an error: model unavailable"
+    assert response.json()["trace"]["root"]["attrs"]["error"] == "model unavailable"
+    assert counts() == (ok, error + 1, observed + 1)
+
+
+def test_failed_stream_is_counted_as_an_error(client, real_service, monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    real_service.llm_with_tools = FailingModel()
+    ok, error = stream_counts()
+    response = client.post("/api/chat/stream", json={"message": "hi", "trace": True})
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: {")]
+    assert events[0] == {"type": "error", "content": "model unavailable"}
+    assert stream_counts() == (ok, error + 1)
+    (trace,) = finished_traces(tmp_path / "traces.jsonl")
+    assert trace["root"]["attrs"]["error"] == "model unavailable"
+
+
+def test_failed_final_round_is_counted_as_an_error(client, real_service, monkeypatch):
+    real_service.llm_with_tools = ToolLoopModel()
+    real_service.llm = FailingModel()
+    ok, error = stream_counts()
+    response = client.post("/api/chat/stream", json={"message": "what time is it?"})
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: {")]
+    assert events[-2]["content"] == "Sorry, I encountered an error. Please try again."
+    assert events[-1]["type"] == "done" and events[-1]["error"] == "model unavailable"
+    assert stream_counts() == (ok, error + 1)
+
+
+def test_successful_stream_is_counted(client, monkeypatch):
+    monkeypatch.setattr(routes, "_ai_service", StandInService())
+    ok, error = stream_counts()
+    assert client.post("/api/chat/stream", json={"message": "one two"}).status_code == 200
+    assert stream_counts() == (ok + 1, error)
+
+
+def finished_traces(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_failed_chat_finishes_its_trace(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(routes, "_ai_service", StandInService(fail=True))
+    assert client.post("/api/chat", json={"message": "hi", "trace": True}).status_code == 500
+    (trace,) = finished_traces(tmp_path / "traces.jsonl")
+    assert trace["root"]["attrs"]["error"] == "model unavailable"
+
+
+def test_disconnected_stream_finishes_its_trace(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(routes, "_ai_service", StandInService())
+
+    async def disconnect_after_first_frame():
+        response = await routes.chat_with_ai_stream(ChatRequest(message="one two three", trace=True), None, None)
+        frames = response.body_iterator
+        await frames.__anext__()
+        await frames.aclose()
+
+    asyncio.run(disconnect_after_first_frame())
+    (trace,) = finished_traces(tmp_path / "traces.jsonl")
+    assert trace["root"]["attrs"] == {"disconnected": True}
+    (sse,) = trace["root"]["children"]
+    assert sse["name"] == "sse" and sse["attrs"]["frames"] == 1
+
+
+def test_completed_stream_sends_and_writes_its_trace_once(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(routes, "_ai_service", StandInService())
+    response = client.post("/api/chat/stream", json={"message": "one two", "trace": True})
+    events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    # The bundled client stops reading at done, so the trace has to come first
+    assert events[-1] == "[DONE]"
+    assert [json.loads(event)["type"] for event in events[:-1]] == ["content", "content", "trace", "done"]
+    (trace,) = finished_traces(tmp_path / "traces.jsonl")
+    assert trace["root"]["children"][0]["attrs"]["frames"] == 2
+
+
+def test_untraced_stream_keeps_done_last(client, monkeypatch):
+    monkeypatch.setattr(routes, "_ai_service", StandInService())
+    response = client.post("/api/chat/stream", json={"message": "one two"})
+    events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [json.loads(event)["type"] for event in events[:-1]] == ["content", "content", "done"]
@@ -0,0 +1,91 @@
+"""Content frame coalescing: size, age and the flush before tool calls."""
+
+import asyncio
+import json
+
+from langchain_core.messages import AIMessageChunk
+
+from ai import streaming
+from ai.streaming import ContentCoalescer, StreamedRound
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+class ChunkModel:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+
+    async def astream(self, messages):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def content(frame):
+    return json.loads(frame)["content"]
+
+
+def test_first_delta_is_released_immediately():
+    coalescer = ContentCoalescer(max_chars=100, max_delay=10)
+    assert content(coalescer.add("Hi")) == "Hi"
+    assert coalescer.add(" there") is None
+
+
+def test_frames_are_released_by_size():
+    coalescer = ContentCoalescer(max_chars=5, max_delay=10)
+    coalescer.add("a")
+    assert coalescer.add("bc") is None
+    assert content(coalescer.add("def")) == "bcdef"
+    assert coalescer.flush() is None
+
+
+def test_frames_are_released_by_age(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(streaming.time, "monotonic", clock.monotonic)
+    coalescer = ContentCoalescer(max_chars=100, max_delay=0.04)
+    coalescer.add("a")
+    assert coalescer.add("b") is None
+    clock.now += 0.05
+    assert content(coalescer.add("c")) == "bc"
+
+
+def test_age_is_checked_on_chunks_without_text(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(streaming.time, "monotonic", clock.monotonic)
+    coalescer = ContentCoalescer(max_chars=100, max_delay=0.04)
+    coalescer.add("a")
+    coalescer.add("b")
+    assert coalescer.add("") is None
+    clock.now += 0.05
+    assert content(coalescer.add("")) == "b"
+    assert coalescer.add("") is None
+
+
+def test_text_is_flushed_when_a_tool_call_starts():
+    chunks = [
+        AIMessageChunk(content="Let me"),
+        AIMessageChunk(content=" check."),
+        AIMessageChunk(content="", tool_call_chunks=[{"name": "get_data_status", "args": "", "id": "call_1", "index": 0}]),
+        AIMessageChunk(content="", tool_call_chunks=[{"name": None, "args": "{}", "id": None, "index": 0}]),
+    ]
+    model = ChunkModel(chunks)
+    round_ = StreamedRound(ContentCoalescer(max_chars=100, max_delay=10))
+    frames = []
+
+    async def collect():
+        async for frame in round_.run(model, []):
+            frames.append((content(frame), model.sent))
+
+    asyncio.run(collect())
+
+    # The second frame is released by the first tool-call chunk, not at the end of the round
+    assert frames == [("Let me", 1), (" check.", 3)]
+    assert round_.text == "Let me check."
+    assert round_.message.tool_calls[0]["name"] == "get_data_status"
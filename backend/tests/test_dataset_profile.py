@@ -0,0 +1,76 @@
+"""Column profiles behind describe_dataset."""
+
+import pandas as pd
+import pyarrow as pa
+
+from mcp_handlers.dataset_profile import SQL_NOTES, profile_column, profile_dataset
+
+
+def by_name(profile):
+    return {column["name"]: column for column in profile["columns"]}
+
+
+def test_numeric_columns_report_range_and_top_values():
+    column = profile_column("points", pd.Series([3, 5, None, 5], dtype="float64"))
+    assert column["type"] == "real"
+    assert column["nulls"] == 0.25
+    assert column["distinct"] == 2
+    assert (column["min"], column["max"]) == (3.0, 5.0)
+    assert column["top"] == [[5.0, 2], [3.0, 1]]
+
+    assert profile_column("id", pd.Series([1, 2, 3]))["type"] == "integer"
+
+
+def test_categorical_columns_list_their_most_common_values():
+    column = profile_column("status", pd.Series(["Open", "Done", "Open", None], dtype="category"))
+    assert column["type"] == "text"
+    assert column["distinct"] == 2
+    assert column["top"] == [["Open", 2], ["Done", 1]]
+    assert "min" not in column
+
+
+def test_datetime_columns_report_iso_range_without_top_values():
+    created = pd.to_datetime(pd.Series(["2024-06-02T10:00:00Z", None, "2024-06-01T08:00:00Z"]), utc=True)
+    column = profile_column("created", created)
+    assert column["type"] == "timestamp"
+    assert column["min"] == "2024-06-01T08:00:00+00:00"
+    assert column["max"] == "2024-06-02T10:00:00+00:00"
+    assert "top" not in column
+
+
+def test_list_columns_count_items():
+    labels = pd.Series(
+        pa.array([["a", "b"], [], None, ["a"]], type=pa.list_(pa.string())),
+        dtype=pd.ArrowDtype(pa.list_(pa.string())),
+    )
+    column = profile_column("labels", labels)
+    assert column["type"] == "list"
+    assert column["nulls"] == 0.5
+    assert column["top"] == [["a", 2], ["b", 1]]
+
+
+def test_high_cardinality_text_gets_an_example():
+    column = profile_column("summary", pd.Series([f"Issue {i} " + "x" * 100 for i in range(40)]))
+    assert column["distinct"] == 40
+    assert "top" not in column
+    assert column["example"].startswith("Issue 0") and column["example"].endswith("…")
+
+
+def test_all_null_and_placeholder_columns_are_listed_as_empty():
+    df = pd.DataFrame(
+        {"status": ["Open", "Done"], "nothing": [None, None], "legacy": ["", "[]"]},
+        index=pd.Index(["DMD-1", "DMD-2"], name="Key"),
+    )
+    profile = profile_dataset(df)
+    assert profile["rows"] == 2
+    assert [column["name"] for column in profile["columns"]] == ["Key", "status"]
+    assert profile["empty_columns"] == ["nothing", "legacy"]
+    assert profile["notes"] == SQL_NOTES
+
+
+def test_empty_dataframe():
+    assert profile_dataset(pd.DataFrame()) == {"rows": 0, "columns": [], "empty_columns": [], "notes": SQL_NOTES}
+
+    profile = profile_dataset(pd.DataFrame({"status": pd.Series([], dtype=object)}))
+    assert by_name(profile)["status"] == {"name": "status", "type": "text", "nulls": 0.0, "distinct": 0}
+    assert profile["empty_columns"] == []
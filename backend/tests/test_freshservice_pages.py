@@ -0,0 +1,39 @@
+"""Paginated Freshservice fetches: pages requested ahead past the end of the listing."""
+
+import pytest
+
+import freshservice
+
+PER_PAGE = freshservice.PER_PAGE
+
+
+def serve(monkeypatch, last_page, failing):
+    """Serve ``last_page`` pages of numbered records; pages in ``failing`` come back as errors."""
+
+    def fetch_page(endpoint, params, page, gate):
+        if page in failing:
+            return None, False
+        if page > last_page:
+            return [], False
+        records = [{"id": (page - 1) * PER_PAGE + i} for i in range(PER_PAGE)]
+        return records, page < last_page
+
+    monkeypatch.setattr(freshservice, "fetch_page", fetch_page)
+
+
+def test_errors_beyond_the_last_page_are_ignored(monkeypatch):
+    serve(monkeypatch, last_page=3, failing={5, 6})
+    df = freshservice.get_api("tickets", max_workers=4, strict=True)
+    assert df["id"].tolist() == list(range(3 * PER_PAGE))
+
+
+def test_error_within_the_listing_fails_a_strict_fetch(monkeypatch):
+    serve(monkeypatch, last_page=3, failing={2})
+    with pytest.raises(RuntimeError):
+        freshservice.get_api("tickets", max_workers=4, strict=True)
+
+
+def test_error_within_the_listing_truncates_a_lenient_fetch(monkeypatch):
+    serve(monkeypatch, last_page=3, failing={2})
+    df = freshservice.get_api("tickets", max_workers=4)
+    assert df["id"].tolist() == list(range(PER_PAGE))
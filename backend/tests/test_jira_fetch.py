@@ -0,0 +1,53 @@
+"""Sharded JIRA fetch against a stand-in JIRA with page latency."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks import synthetic
+from benchmarks.jira_fetch import JQL, NoCountJira, ShardableJira, keys
+from data import jira_issues
+
+MAX_SHARD = 100
+
+
+@pytest.fixture(scope="module")
+def issues():
+    return synthetic.generate_jira_issues(2000, 7)
+
+
+@pytest.fixture(scope="module")
+def serial_keys(issues):
+    return sorted(keys(jira_issues.fetch_all_issues(ShardableJira(issues, 0, 0), JQL, fields="key")))
+
+
+def fetch_sharded(jira):
+    return keys(jira_issues.fetch_sharded_issues(jira, JQL, fields="key", workers=4, max_shard_issues=MAX_SHARD))
+
+
+def test_sharded_fetch_returns_the_serial_issues_once(issues, serial_keys):
+    sharded = fetch_sharded(ShardableJira(issues, latency=0.001, count_latency=0))
+    assert sorted(sharded) == serial_keys
+    assert len(sharded) == len(set(sharded))
+
+
+def test_shards_stay_near_the_size_target(issues):
+    jira = ShardableJira(issues, latency=0, count_latency=0)
+    with ThreadPoolExecutor(4) as pool:
+        shards = jira_issues.plan_created_shards(jira, JQL, pool, MAX_SHARD, 4)
+        sizes = [len(jira.matching(shard)) for shard in shards]
+        assert len(shards) > 1
+        assert sum(sizes) == len(issues) and max(sizes) <= MAX_SHARD
+        assert jira_issues.plan_created_shards(jira, JQL, pool, len(issues), 4) == [JQL]
+
+
+def test_even_split_without_the_count_endpoint_is_complete(issues, serial_keys):
+    assert sorted(fetch_sharded(NoCountJira(issues, latency=0.001, count_latency=0))) == serial_keys
+
+
+def test_429_on_one_shard_pauses_every_shard(issues, serial_keys):
+    jira = ShardableJira(issues, latency=0.01, count_latency=0)
+    jira.fail_request, jira.retry_after = 12, 0.5
+    assert sorted(fetch_sharded(jira)) == serial_keys
+    failed_at = jira.requests[jira.fail_request - 1] + jira.latency
+    assert not [t for t in jira.requests if failed_at + 0.05 < t < failed_at + jira.retry_after - 0.05]
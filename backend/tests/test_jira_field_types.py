@@ -0,0 +1,89 @@
+"""Typed JIRA columns: flattening raw field values and inferring column types."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from data import jira_issues
+from data.jira_issues import flatten_field_value, type_field_column
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ({"displayName": "Ana", "emailAddress": "ana@example.com"}, "Ana"),
+        ({"value": "Option A", "id": "1001"}, "Option A"),
+        ({"name": "In Progress", "id": "3"}, "In Progress"),
+        ({"key": "DMD-7", "id": "7"}, "DMD-7"),
+        ({"type": {"name": "Blocks"}, "outwardIssue": {"key": "DMD-9"}}, "DMD-9"),
+        ({"self": "https://x", "id": "5"}, json.dumps({"self": "https://x", "id": "5"})),
+        ([{"name": "Backend"}, {"value": "Mobile"}], ["Backend", "Mobile"]),
+        (["urgent", None, 3], ["urgent", "3"]),
+        ([], []),
+        ("text", "text"),
+        (4.5, 4.5),
+        (True, True),
+    ],
+)
+def test_flatten_field_value(value, expected):
+    assert flatten_field_value(value) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, check",
+    [
+        # Option objects become categoricals of their labels
+        (
+            [{"value": "High"}, None, {"value": "Low"}, {"value": "High"}],
+            lambda s: isinstance(s.dtype, pd.CategoricalDtype)
+            and s.iloc[0] == "High"
+            and pd.isna(s.iloc[1])
+            and sorted(s.cat.categories) == ["High", "Low"],
+        ),
+        # ISO timestamps and dates become UTC datetimes
+        (
+            ["2024-06-01T10:15:00.000+0300", None, "2024-06-02"],
+            lambda s: str(s.dtype) == "datetime64[ns, UTC]"
+            and s.iloc[0] == pd.Timestamp("2024-06-01T07:15:00Z")
+            and pd.isna(s.iloc[1])
+            and s.iloc[2] == pd.Timestamp("2024-06-02T00:00:00Z"),
+        ),
+        # Array fields become Arrow lists of labels, keeping nulls apart from empty lists
+        (
+            [[{"name": "a"}, {"name": "b"}], [], None],
+            lambda s: s.dtype == jira_issues.STRING_LIST_DTYPE
+            and s.iloc[0] == ["a", "b"]
+            and s.iloc[1] == []
+            and pd.isna(s.iloc[2]),
+        ),
+        # Flags become nullable booleans
+        ([True, None, False], lambda s: s.dtype == "boolean" and s.tolist()[0] is True and pd.isna(s.iloc[1])),
+        # Numbers become numeric columns
+        ([1, 2, None], lambda s: s.dtype == "float64" and s.iloc[1] == 2),
+        ([1, 2, 3], lambda s: s.dtype == "int64"),
+        # Plain strings stay text
+        (["Fix login", None], lambda s: s.dtype == object and s.tolist() == ["Fix login", None]),
+        # All-null fields stay untyped
+        ([None, float("nan")], lambda s: s.dtype == object and s.isna().all()),
+    ],
+    ids=["categorical", "datetime", "list", "boolean", "float", "int", "text", "all-null"],
+)
+def test_type_field_column(raw, check):
+    assert check(type_field_column(pd.Series(raw, index=[f"DMD-{i}" for i in range(len(raw))], dtype=object)))
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (["abc", 5], ["abc", "5"]),
+        (["2024-06-01", "soon"], ["2024-06-01", "soon"]),
+        ([["a"], "b", None], ['["a"]', "b", None]),
+        ([True, 1], ["true", "1"]),
+    ],
+    ids=["text-and-number", "date-and-text", "list-and-text", "bool-and-number"],
+)
+def test_mixed_shapes_fall_back_to_text(raw, expected):
+    column = type_field_column(pd.Series(raw, dtype=object))
+    assert column.dtype == object
+    assert column.tolist() == expected
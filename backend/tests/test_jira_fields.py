@@ -0,0 +1,66 @@
+"""JIRA field projection against a stand-in JIRA."""
+
+import os
+
+import pytest
+
+from benchmarks.jira_fields import SPARSE_FIELD, StandInJira, padded_issues
+from data import jira_issues
+
+JQL = "project = DMD"
+AUTO_SPEC = f"auto,{SPARSE_FIELD[1]}"
+
+
+@pytest.fixture
+def jira(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Field catalogue and cache files are written to the working directory
+    issues, catalogue = padded_issues(1000, seed=7, empty_fields=20)
+    return StandInJira(issues, catalogue)
+
+
+def test_field_catalogue_is_cached_on_disk_until_its_ttl(jira):
+    jira_issues.get_field_id_map(jira)
+    jira_issues.get_field_id_map(jira)
+    assert jira.catalogue_calls == 1
+    assert os.path.exists(jira_issues.FIELD_CATALOGUE_FILE)
+    jira_issues.get_field_id_map(jira, max_age_hours=0)
+    assert jira.catalogue_calls == 2
+
+
+def test_allow_list_resolves_ids_and_names(jira):
+    field_map = jira_issues.get_field_id_map(jira)
+    resolved = jira_issues.resolve_allow_list(["summary", "demand type", "Status", "no such field"], field_map)
+    assert resolved == ["summary", "customfield_10346", "status"]
+
+
+def test_allow_list_projection_always_includes_updated(jira):
+    allow = jira_issues.resolve_field_projection(jira, JQL, {}, spec="summary, Demand Type")
+    assert allow["fields"] == ["customfield_10346", "summary", "updated"]
+
+
+def test_fetch_all_issues_stops_at_max_issues(jira):
+    assert len(jira_issues.fetch_all_issues(jira, JQL, batch_size=100, max_issues=250)) == 250
+
+
+def test_auto_projection_probes_a_sample_and_drops_empty_fields(jira):
+    fields = jira_issues.resolve_field_projection(jira, JQL, {}, spec=AUTO_SPEC)["fields"]
+    assert 0 < jira.issues_served <= jira_issues.JIRA_FIELD_PROBE_ISSUES
+    assert "customfield_20000" not in fields
+    assert {"summary", "customfield_10346", SPARSE_FIELD[0], "updated"} <= set(fields)
+
+
+def test_recent_probe_is_reused_without_fetching(jira):
+    auto = jira_issues.resolve_field_projection(jira, JQL, {}, spec=AUTO_SPEC)
+    jira.reset()
+    metadata = {"jql": JQL, "watermark": "2024-01-01T00:00:00+00:00", **auto}
+    assert jira_issues.resolve_field_projection(jira, JQL, metadata, spec=AUTO_SPEC) == auto
+    assert jira.issues_served == 0
+
+
+def test_changed_projection_forces_a_full_sync(jira):
+    auto = jira_issues.resolve_field_projection(jira, JQL, {}, spec=AUTO_SPEC)
+    allow = jira_issues.resolve_field_projection(jira, JQL, {}, spec="summary, Demand Type")
+    metadata = {"jql": JQL, "watermark": "2024-01-01T00:00:00+00:00", **auto}
+    open(jira_issues.CACHE_FILE, "w").close()
+    assert jira_issues.can_sync_incrementally(JQL, metadata, auto["fields"])
+    assert not jira_issues.can_sync_incrementally(JQL, metadata, allow["fields"])
@@ -0,0 +1,107 @@
+"""Incremental JIRA sync: the updated-since JQL window."""
+
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from data import jira_issues
+
+
+def test_window_is_relative_to_the_watermark(monkeypatch):
+    monkeypatch.setattr(jira_issues, "JIRA_SYNC_OVERLAP_MINUTES", 5)
+    now = datetime(2024, 6, 1, 12, 0, 30, tzinfo=timezone.utc)
+    jql = jira_issues.updated_since_jql("project = DMD ORDER BY created DESC", "2024-06-01T11:00:00+00:00", now)
+    assert jql == '(project = DMD) AND updated >= "-66m" ORDER BY updated ASC'
+
+
+def test_naive_watermark_is_read_as_utc(monkeypatch):
+    monkeypatch.setattr(jira_issues, "JIRA_SYNC_OVERLAP_MINUTES", 0)
+    now = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+    assert '"-120m"' in jira_issues.updated_since_jql("project = DMD", "2024-06-01T10:00:00", now)
+
+
+def test_watermark_ahead_of_the_clock_keeps_the_overlap(monkeypatch):
+    monkeypatch.setattr(jira_issues, "JIRA_SYNC_OVERLAP_MINUTES", 5)
+    now = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+    assert '"-5m"' in jira_issues.updated_since_jql("project = DMD", "2024-06-01T12:03:00+00:00", now)
+
+
+def _prepared(keys, **raw_columns):
+    """Typed frame as prepare_dataset builds it for the given raw field values."""
+    index = pd.Index(keys, name="Key")
+    return pd.DataFrame(
+        {name: jira_issues.type_field_column(pd.Series(values, index=index)) for name, values in raw_columns.items()},
+        index=index,
+    )
+
+
+@pytest.mark.parametrize(
+    "delta_value, expected",
+    [
+        (7, "7"),
+        ("2024-01-02", "2024-01-02T00:00:00+00:00"),
+        (True, "true"),
+        (["x", "y"], '["x", "y"]'),
+    ],
+)
+def test_delta_is_turned_to_text_when_the_cached_column_is_text(tmp_path, delta_value, expected):
+    cached = _prepared(["A-1", "A-2"], Ref=["abc", 5])
+    assert cached["Ref"].tolist() == ["abc", "5"]
+    changed = _prepared(["A-3"], Ref=[delta_value])
+
+    merged = jira_issues.merge_issues(cached, changed)
+
+    assert merged["Ref"].tolist() == ["abc", "5", expected]
+    jira_issues.write_issues_cache(merged, str(tmp_path / "cache.parquet"))
+
+
+def test_typed_cache_column_falls_back_to_text_when_the_delta_disagrees(tmp_path):
+    cached = _prepared(["A-1"], Due=["2024-01-02"])
+    changed = _prepared(["A-2"], Due=["soon"])
+
+    merged = jira_issues.merge_issues(cached, changed)
+
+    assert merged["Due"].tolist() == ["2024-01-02T00:00:00+00:00", "soon"]
+    jira_issues.write_issues_cache(merged, str(tmp_path / "cache.parquet"))
+
+
+def test_merge_restores_typed_columns():
+    status = {"name": "Open"}
+    cached = _prepared(
+        ["A-1", "A-2"],
+        Status=[status, {"name": "Done"}],
+        Points=[3, 5],
+        Created=["2024-01-01T10:00:00.000+0000", "2024-01-02T10:00:00.000+0000"],
+        Flagged=[True, False],
+        Labels=[["a"], []],
+    )
+    changed = _prepared(
+        ["A-2", "A-3"],
+        Status=[{"name": "Blocked"}, None],
+        Points=[None, None],
+        Created=[None, "2024-01-03T10:00:00.000+0000"],
+        Flagged=[None, True],
+        Labels=[["b"], None],
+    )
+
+    merged = jira_issues.merge_issues(cached, changed)
+
+    assert merged.index.tolist() == ["A-1", "A-2", "A-3"]
+    assert isinstance(merged["Status"].dtype, pd.CategoricalDtype)
+    assert merged["Status"].tolist()[:2] == ["Open", "Blocked"]
+    assert pd.api.types.is_numeric_dtype(merged["Points"])
+    assert merged["Points"].tolist()[0] == 3
+    assert pd.api.types.is_datetime64_any_dtype(merged["Created"])
+    assert merged["Flagged"].dtype == "boolean"
+    assert merged["Labels"].dtype == jira_issues.STRING_LIST_DTYPE
+    assert merged["Labels"].tolist()[1] == ["b"]
+
+
+def test_merge_keeps_integer_and_float_deltas_numeric():
+    cached = _prepared(["A-1"], Points=[3])
+    changed = _prepared(["A-2"], Points=[2.5])
+
+    merged = jira_issues.merge_issues(cached, changed)
+
+    assert merged["Points"].tolist() == [3.0, 2.5]
@@ -0,0 +1,29 @@
+"""Metrics registry: exposition format and the metric base class."""
+
+import pytest
+
+from metrics import MetricsRegistry, _Metric
+
+
+def test_metric_subclass_must_implement_children_and_samples():
+    class Incomplete(_Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("tamkeen_incomplete", "Missing overrides")
+
+
+def test_counter_and_histogram_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("tamkeen_test_requests", "Requests", ("outcome",))
+    seconds = registry.histogram("tamkeen_test_seconds", "Durations", buckets=(0.1, 1))
+    requests.labels(outcome="ok").inc()
+    requests.labels(outcome="error").inc(2)
+    seconds.observe(0.5)
+
+    text = registry.render()
+    assert 'tamkeen_test_requests_total{outcome="ok"} 1' in text
+    assert 'tamkeen_test_requests_total{outcome="error"} 2' in text
+    assert 'tamkeen_test_seconds_bucket{le="0.1"} 0' in text
+    assert 'tamkeen_test_seconds_bucket{le="1"} 1' in text
+    assert "tamkeen_test_seconds_count 1" in text
@@ -0,0 +1,81 @@
+"""Prompt-cache breakpoints in the request payload sent to Anthropic."""
+
+import pytest
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+from ai import prompt_cache
+from ai.prompt_cache import cacheable_tools, cached_system_message, with_cache_breakpoint
+
+
+@tool
+def count_tickets(status: str) -> str:
+    """Count tickets with a status."""
+    return "0"
+
+
+@tool
+def count_demands(status: str) -> str:
+    """Count demands with a status."""
+    return "0"
+
+
+def payload(messages):
+    """The request body for ``messages``, built the way the service sends a round."""
+    llm = ChatAnthropic(model="claude-sonnet-4-20250514", anthropic_api_key="test")
+    bound = llm.bind_tools(cacheable_tools([count_tickets, count_demands]))
+    return bound.bound._get_request_payload(with_cache_breakpoint(messages), **bound.kwargs)
+
+
+def cache_markers(node, path=()):
+    """Sorted paths of every block in a payload that carries ``cache_control``."""
+    if isinstance(node, dict):
+        found = [path] if "cache_control" in node else []
+        for key, value in node.items():
+            found += cache_markers(value, path + (key,))
+        return sorted(found)
+    if isinstance(node, list):
+        return sorted(marker for i, item in enumerate(node) for marker in cache_markers(item, path + (i,)))
+    return []
+
+
+def conversation(*messages):
+    return [cached_system_message("You answer questions about tickets."), HumanMessage(content="How many open tickets?"), *messages]
+
+
+def tool_round(*results):
+    calls = [{"name": "count_tickets", "args": {"status": "Open"}, "id": f"call_{i}"} for i in range(len(results))]
+    return [
+        AIMessage(content="Let me count them.", tool_calls=calls),
+        *(ToolMessage(content=result, tool_call_id=call["id"]) for call, result in zip(calls, results)),
+    ]
+
+
+def test_plain_text_last_message():
+    body = payload(conversation())
+    assert cache_markers(body) == [("messages", 0, "content", 0), ("system", 0), ("tools", 1)]
+    assert body["messages"][0]["content"][0]["text"] == "How many open tickets?"
+
+
+def test_only_the_last_tool_result_of_a_round_is_marked():
+    body = payload(conversation(*tool_round("12", "3")))
+    assert cache_markers(body) == [("messages", 2, "content", 1), ("system", 0), ("tools", 1)]
+    marked = body["messages"][2]["content"][1]
+    assert marked["type"] == "tool_result" and marked["tool_use_id"] == "call_1"
+
+
+def test_empty_last_ai_message_falls_back_to_an_earlier_message():
+    body = payload(conversation(AIMessage(content="")))
+    assert cache_markers(body) == [("messages", 0, "content", 0), ("system", 0), ("tools", 1)]
+
+
+def test_kept_conversation_is_not_modified():
+    messages = conversation(*tool_round("12"))
+    payload(messages)
+    assert messages[-1].content == "12"
+
+
+def test_prompt_cache_off_sends_no_breakpoints(monkeypatch):
+    monkeypatch.setattr(prompt_cache, "PROMPT_CACHE_ENABLED", False)
+    assert cache_markers(payload(conversation(*tool_round("12", "3")))) == []
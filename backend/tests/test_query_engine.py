@@ -0,0 +1,49 @@
+"""Query stores: engine parity and the abstract base."""
+
+import gc
+import os
+
+import pandas as pd
+import pytest
+
+from mcp_handlers import query_engine
+from mcp_handlers.query_engine import ENGINES, QueryStore, create_store
+
+DF = pd.DataFrame({"status": ["Open", "Closed", "Open"], "priority": [1, 2, 3]})
+
+
+def test_query_store_requires_query():
+    class Incomplete(QueryStore):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engines_return_the_same_rows(engine):
+    store = create_store(DF, engine=engine)
+    assert store.engine == engine
+    result = store.query("SELECT status, COUNT(*) AS n FROM df GROUP BY status ORDER BY status")
+    assert result.values.tolist() == [["Closed", 1], ["Open", 2]]
+
+
+def test_sqlite_readers_share_one_database_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_engine, "QUERY_TEMP_DIR", str(tmp_path))
+    store = query_engine.SQLiteStore(DF, max_readers=2)
+    readers = [store._acquire(), store._acquire()]
+    files = {conn.execute("PRAGMA database_list").fetchone()[2] for conn in readers}
+    assert files == {store.path}
+    for conn in readers:
+        store._release(conn)
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_sqlite_database_file_is_removed_with_the_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_engine, "QUERY_TEMP_DIR", str(tmp_path))
+    store = query_engine.SQLiteStore(DF)
+    assert store.query("SELECT COUNT(*) AS n FROM df")["n"].tolist() == [3]
+    path = store.path
+    del store
+    gc.collect()
+    assert not os.path.exists(path)
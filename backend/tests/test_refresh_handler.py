@@ -0,0 +1,159 @@
+"""Per-source refresh workers driven with stand-in JIRA and Freshservice handlers."""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from mcp_handlers.refresh_handler import RefreshHandler
+
+LOGGER = logging.getLogger("tamkeen.tests.refresh")
+
+
+class StubHandler:
+    """Records refreshes; each one blocks until ``gate`` is set."""
+
+    def __init__(self, duration=0.0, error=None):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.duration = duration
+        self.error = error
+        self.refreshes = []
+
+    def refresh_data(self, force=True):
+        self.refreshes.append(force)
+        self.started.set()
+        self.gate.wait(5)
+        time.sleep(self.duration)
+        if self.error:
+            raise RuntimeError(self.error)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def make_handler(monkeypatch):
+    handlers = []
+
+    def make(jira=None, freshservice=None, jira_interval=3600, freshservice_interval=3600, initial=False):
+        monkeypatch.setenv("JIRA_REFRESH_INTERVAL", str(jira_interval))
+        monkeypatch.setenv("FRESHSERVICE_REFRESH_INTERVAL", str(freshservice_interval))
+        handler = RefreshHandler(LOGGER, jira or StubHandler(), freshservice or StubHandler(), queue_initial_load=initial)
+        handlers.append(handler)
+        return handler
+
+    yield make
+    for handler in handlers:
+        for stub in (handler.jira_handler, handler.freshservice_handler):
+            stub.gate.set()
+        handler.shutdown(timeout=5)
+
+
+def test_initial_loads_use_the_cache(make_handler):
+    jira, freshservice = StubHandler(), StubHandler()
+    make_handler(jira, freshservice, initial=True)
+    assert wait_for(lambda: jira.refreshes == [False] and freshservice.refreshes == [False])
+
+
+def test_forced_request_absorbs_a_pending_one(make_handler):
+    jira = StubHandler()
+    jira.gate.clear()
+    handler = make_handler(jira)
+
+    handler._queue_refresh("jira", force=False)
+    assert jira.started.wait(5)  # The first request is running; the next ones wait behind it
+
+    assert "queued (after the refresh in progress)" in handler._queue_refresh("jira", force=False)
+    assert "already queued" in handler._queue_refresh("jira", force=False)
+    assert "queued" in handler.queue_jira_refresh(force=True)
+    assert "already queued" in handler.queue_jira_refresh(force=True)
+
+    status = handler.get_queue_status()
+    assert status["size"] == 1
+    assert status["items"] == [{"source": "jira", "force": True}]
+    assert status["sources"]["jira"]["running"]
+    assert not status["freshservice_queued"]
+
+    jira.gate.set()
+    assert wait_for(lambda: handler.get_queue_status()["sources"]["jira"]["refresh_count"] == 2)
+    assert jira.refreshes == [False, True]
+
+
+def test_sources_refresh_independently(make_handler):
+    jira, freshservice = StubHandler(), StubHandler()
+    jira.gate.clear()
+    handler = make_handler(jira, freshservice)
+
+    handler.queue_jira_refresh()
+    assert jira.started.wait(5)
+    handler.queue_freshservice_refresh()
+    assert wait_for(lambda: freshservice.refreshes == [True])
+    assert handler.get_queue_status()["sources"]["jira"]["running"]
+
+
+def test_periodic_refresh_is_scheduled_one_interval_after_the_last(make_handler):
+    jira, freshservice = StubHandler(), StubHandler()
+    handler = make_handler(jira, freshservice, freshservice_interval=1)
+
+    status = handler.get_queue_status()["sources"]["freshservice"]
+    assert 0 < status["next_due_in_seconds"] <= 1
+    assert wait_for(lambda: freshservice.refreshes == [False], timeout=3)
+    assert jira.refreshes == []
+
+    status = handler.get_queue_status()["sources"]["freshservice"]
+    assert status["next_due_in_seconds"] > 0.5
+    assert handler.get_queue_status()["sources"]["jira"]["next_due_in_seconds"] > 3000
+
+
+def test_status_reports_wait_duration_and_errors(make_handler):
+    jira, freshservice = StubHandler(), StubHandler(duration=0.1, error="API down")
+    jira.gate.clear()
+    handler = make_handler(jira, freshservice)
+
+    handler.queue_jira_refresh()
+    assert jira.started.wait(5)
+    handler.queue_jira_refresh()
+    time.sleep(0.1)
+    assert handler.get_queue_status()["sources"]["jira"]["queued_for_seconds"] >= 0.1
+    jira.gate.set()
+    handler.queue_freshservice_refresh()
+
+    assert wait_for(lambda: handler.get_queue_status()["sources"]["jira"]["refresh_count"] == 2)
+    assert wait_for(lambda: handler.get_queue_status()["sources"]["freshservice"]["refresh_count"] == 1)
+    sources = handler.get_queue_status()["sources"]
+    # The second JIRA request waited behind the first for at least the 0.1s slept above
+    assert sources["jira"]["last_wait_seconds"] >= 0.1
+    assert sources["jira"]["last_error"] is None
+    assert sources["jira"]["last_finished_at"]
+    assert sources["freshservice"]["last_duration_seconds"] >= 0.1
+    assert sources["freshservice"]["last_error"] == "API down"
+
+
+def test_shutdown_finishes_the_running_refresh_and_drops_pending_ones(make_handler):
+    jira = StubHandler()
+    jira.gate.clear()
+    handler = make_handler(jira)
+    handler.queue_jira_refresh()
+    assert jira.started.wait(5)
+    handler.queue_jira_refresh()
+
+    stopper = threading.Thread(target=handler.shutdown, kwargs={"timeout": 5})
+    stopper.start()
+    time.sleep(0.05)
+    assert stopper.is_alive()  # Waits for the refresh in progress
+    jira.gate.set()
+    stopper.join(5)
+
+    assert not stopper.is_alive()
+    assert all(not source.thread.is_alive() for source in handler.sources.values())
+    assert jira.refreshes == [True]
+    assert handler.get_queue_status()["size"] == 0
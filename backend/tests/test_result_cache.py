@@ -0,0 +1,86 @@
+"""Query result cache: SQL normalization, generation keys, TTL and LRU eviction."""
+
+import pandas as pd
+import pytest
+
+from mcp_handlers import result_cache
+from mcp_handlers.result_cache import QueryResultCache, normalize_sql
+
+RESULT = pd.DataFrame({"n": [1]})
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("SELECT status FROM df", "select  STATUS\n  from df"),
+        ("SELECT * FROM df WHERE id = 1;", "select * from df where id=1"),
+        ("SELECT * FROM df -- latest\nLIMIT 5", "SELECT * FROM df /* page */ LIMIT 5"),
+        ("SELECT * FROM df LIMIT 10", "SELECT * FROM df LIMIT 010"),
+        ("SELECT * FROM df WHERE p > 1.50", "SELECT * FROM df WHERE p > 1.5"),
+        ("SELECT * FROM df WHERE p > 1e2", "SELECT * FROM df WHERE p > 100.0"),
+    ],
+)
+def test_equivalent_queries_share_a_key(a, b):
+    assert normalize_sql(a) == normalize_sql(b)
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("SELECT * FROM df WHERE status = 'A'", "SELECT * FROM df WHERE status = 'a'"),
+        ("SELECT * FROM df WHERE status = 'In  Progress'", "SELECT * FROM df WHERE status = 'In Progress'"),
+        ("SELECT * FROM df WHERE s = '-- x'", "SELECT * FROM df WHERE s = ''"),
+        ('SELECT "Status" FROM df', 'SELECT "status" FROM df'),
+        ("SELECT * FROM df WHERE p > 1", "SELECT * FROM df WHERE p > 1.0"),
+        ("SELECT * FROM df LIMIT 1", "SELECT * FROM df LIMIT 10"),
+    ],
+)
+def test_different_queries_keep_different_keys(a, b):
+    assert normalize_sql(a) != normalize_sql(b)
+
+
+def test_string_literals_are_kept_byte_for_byte():
+    sql = "SELECT * FROM df WHERE summary = 'It''s  DONE -- /* not a comment */'"
+    assert normalize_sql(sql) == "select*from df where summary='It''s  DONE -- /* not a comment */'"
+
+
+def test_keys_include_the_generation():
+    cache = QueryResultCache()
+    cache.put(QueryResultCache.make_key(1, "SELECT 1"), RESULT)
+    assert cache.get(QueryResultCache.make_key(1, "select 1"))[0]
+    assert cache.get(QueryResultCache.make_key(2, "SELECT 1")) == (False, None)
+
+
+def test_empty_results_are_cached():
+    cache = QueryResultCache()
+    cache.put("k", None)
+    assert cache.get("k") == (True, None)
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = QueryResultCache(ttl_seconds=10)
+    cache.put("k", RESULT)
+    now[0] += 9
+    assert cache.get("k")[0]
+    now[0] += 1
+    assert cache.get("k") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = QueryResultCache(max_entries=2)
+    cache.put("a", RESULT)
+    cache.put("b", RESULT)
+    cache.get("a")
+    cache.put("c", RESULT)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] and cache.get("c")[0]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_results_over_the_row_limit_are_not_cached():
+    cache = QueryResultCache(max_rows=1)
+    cache.put("k", pd.DataFrame({"n": [1, 2]}))
+    assert cache.get("k") == (False, None)
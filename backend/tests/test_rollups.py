@@ -0,0 +1,30 @@
+"""Rollup tables: week and month buckets."""
+
+import numpy as np
+import pandas as pd
+
+from mcp_handlers.rollups import Rollup, build_rollup
+
+WEEKLY = Rollup("resolved_weekly", "Resolved per week", [("status", "status")], "tickets", bucket=("week", "resolved_at", "week"))
+
+
+def test_weekly_bucket_starts_on_monday_and_skips_missing_timestamps():
+    df = pd.DataFrame({
+        "status": ["Closed", "Closed", "Open", "Resolved"] * 500,
+        "resolved_at": ["2024-06-05T10:00:00Z", "2024-06-09T23:00:00+00:00", None, "2024-06-10T08:00:00Z"] * 500,
+    })
+    with np.errstate(all="raise"):
+        table = build_rollup(df, WEEKLY)
+    assert table.to_dict("records") == [
+        {"week": "2024-06-03", "status": "Closed", "tickets": 1000},
+        {"week": "2024-06-10", "status": "Resolved", "tickets": 500},
+    ]
+
+
+def test_monthly_bucket_of_typed_timestamps():
+    monthly = Rollup("created_monthly", "Created per month", [("status", "status")], "tickets", bucket=("month", "created_at", "month"))
+    df = pd.DataFrame({
+        "status": ["Open", "Open", "Closed"],
+        "created_at": pd.to_datetime(["2024-05-31T23:00:00Z", "2024-06-01T00:00:00Z", None], utc=True),
+    })
+    assert build_rollup(df, monthly)[["month", "tickets"]].values.tolist() == [["2024-05", 1], ["2024-06", 1]]
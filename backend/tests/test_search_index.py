@@ -0,0 +1,134 @@
+"""Full-text ticket search index on synthetic Freshservice tickets."""
+
+import json
+import logging
+
+import pandas as pd
+import pytest
+
+import freshservice
+from benchmarks import synthetic
+from benchmarks.run import serve_freshservice_pages
+from benchmarks.search_index import CHANGED_FRACTION, refreshed
+from mcp_handlers import FreshserviceHandler
+from mcp_handlers.search_index import SearchIndex
+
+
+@pytest.fixture(scope="module")
+def tickets():
+    agents = synthetic.generate_freshservice_agents(20, 7)
+    records = synthetic.generate_freshservice_tickets(2000, len(agents), 7)
+    with serve_freshservice_pages(freshservice, {"tickets": records, "agents": agents}):
+        return freshservice.fetch_freshservice_tickets()
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The index file is written to the working directory
+    return FreshserviceHandler(logging.getLogger("tamkeen.tests"), load_cache=False)
+
+
+@pytest.fixture
+def refreshed_handler(handler, tickets):
+    """A handler that published the tickets and then a refresh of them."""
+    handler._publish_data(tickets)
+    handler._publish_data(refreshed(tickets))
+    return handler
+
+
+def ranked_keys(result):
+    return [row["ticket_id"] for row in result["results"]]
+
+
+def test_sync_rewrites_only_changed_tickets(handler, tickets):
+    index = handler.search_index
+    assert index.sync(tickets)["added"] == len(tickets)
+    assert index.sync(tickets)["unchanged"] == len(tickets)
+    after = refreshed(tickets)
+    changed = max(1, int(len(tickets) * CHANGED_FRACTION))
+    assert index.sync(after) == {"added": 1, "updated": changed, "removed": changed, "unchanged": len(after) - changed - 1}
+
+
+@pytest.mark.parametrize("query", ["quarantined phishing", "laptop vpn", "printer"])
+def test_incremental_and_fresh_indexes_agree(refreshed_handler, tickets, query):
+    index = refreshed_handler.search_index
+    after = refreshed(tickets)
+    fresh = SearchIndex("fresh.sqlite", index.key, index.title, index.body, index.columns)
+    fresh.sync(after)
+    incremental, rebuilt = index.search(after, query, top_k=20), fresh.search(after, query, top_k=20)
+    assert ranked_keys(incremental) == ranked_keys(rebuilt)
+    assert incremental["total_matches"] == rebuilt["total_matches"]
+
+
+def test_refresh_drops_deleted_and_adds_new_tickets(refreshed_handler, tickets):
+    deleted = tickets["ticket_id"].iloc[0]
+    assert deleted not in ranked_keys(refreshed_handler.search(str(tickets["subject"].iloc[0]), top_k=50))
+    assert ranked_keys(refreshed_handler.search("zeppelin", top_k=5)) == [tickets["ticket_id"].max() + 1]
+
+
+def test_filters_match_case_insensitively(refreshed_handler):
+    filtered = refreshed_handler.search("laptop", {"status": ["open", "PENDING"], "priority": 3}, top_k=50)
+    assert filtered["results"]
+    assert all(row["status"] in ("Open", "Pending") and row["priority"] == 3 for row in filtered["results"])
+
+
+def test_list_columns_stored_as_json_text_filter_on_any_item(refreshed_handler, tickets):
+    tags = dict(zip(tickets["ticket_id"], tickets["tags"]))
+    tagged = refreshed_handler.search("laptop", {"tags": "vpn"}, top_k=50)
+    assert tagged["results"]
+    assert all("vpn" in json.loads(tags[row["ticket_id"]]) for row in tagged["results"])
+
+
+def test_fts5_syntax_in_a_query_is_treated_as_words(refreshed_handler):
+    result = refreshed_handler.search('laptop" OR subject:* NEAR(', top_k=5)
+    assert "error" not in result and result["results"]
+
+
+def test_unknown_filter_column_is_reported(refreshed_handler):
+    assert "error" in refreshed_handler.search("laptop", {"nope": 1})
+
+
+def small_tickets(rows):
+    return pd.DataFrame(rows, columns=["ticket_id", "subject", "description", "status"])
+
+
+@pytest.fixture
+def shared_index(tmp_path):
+    """The refresher's index and a follower's view of the same index file."""
+    path = str(tmp_path / "search.sqlite")
+    return tuple(SearchIndex(path, "ticket_id", "subject", "description", ["status"]) for _ in range(2))
+
+
+def test_follower_never_maps_a_reused_id_to_another_ticket(shared_index):
+    refresher, follower = shared_index
+    first = small_tickets([
+        (1, "printer jam", "paper stuck", "Open"),
+        (2, "laptop slow", "fan noise", "Open"),
+        (3, "email bounce", "mailbox full", "Open"),
+    ])
+    refresher.sync(first)
+    assert ranked_keys(follower.search(first, "printer")) == [1]  # Caches the follower's id map
+
+    refresher.sync(small_tickets([
+        (1, "printer jam", "paper stuck", "Open"),
+        (2, "laptop slow", "fan noise", "Open"),
+        (4, "vpn down", "vpn gateway timeout", "Open"),
+    ]))
+
+    # The follower still serves the first generation, which has no ticket about the gateway
+    assert follower.search(first, "gateway") == {"query": "gateway", "total_matches": 0, "results": []}
+
+
+def test_total_matches_counts_only_rows_the_dataset_has(shared_index):
+    refresher, follower = shared_index
+    first = small_tickets([
+        (1, "printer jam", "tray", "Open"),
+        (2, "printer offline", "network", "Open"),
+    ])
+    refresher.sync(first)
+    follower.search(first, "printer")
+    refresher.sync(pd.concat([first, small_tickets([(3, "printer printer printer", "printer", "Open")])]))
+
+    result = follower.search(first, "printer", top_k=2)
+    assert result["total_matches"] == 2
+    assert sorted(ranked_keys(result)) == [1, 2]
@@ -0,0 +1,145 @@
+"""Shared datasets: refresher election, generations on disk and forwarded refresh requests."""
+
+import logging
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from mcp_handlers import shared_datasets
+from mcp_handlers.shared_datasets import RefresherElection, SharedDataset, SharedRefreshCoordinator
+
+LOGGER = logging.getLogger("tamkeen.tests.shared")
+DF = pd.DataFrame({"status": ["Open", "Closed", "Open"], "priority": [1, 2, 3]})
+
+
+def to_table(df):
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@pytest.fixture
+def election(tmp_path):
+    election = RefresherElection(str(tmp_path))
+    yield election
+    election.release()
+
+
+def dataset(tmp_path, election):
+    return SharedDataset(str(tmp_path), "tickets", election, to_table)
+
+
+class StubHandler:
+    """Handler stand-in: attaches to shared generations and counts refreshes."""
+
+    def __init__(self, shared):
+        self.shared = shared
+        self.generation = 0
+        self.refreshes = []
+
+    def attach_shared(self):
+        manifest = self.shared.read_manifest()
+        if manifest is None or manifest["generation"] <= self.generation:
+            return False
+        self.generation = manifest["generation"]
+        return True
+
+    def refresh_data(self, force=True):
+        self.refreshes.append(force)
+
+
+def test_second_process_cannot_take_the_refresher_lock(tmp_path, election):
+    assert election.try_acquire()
+    other = RefresherElection(str(tmp_path))
+    assert not other.try_acquire()
+    assert not other.is_refresher
+    assert other.refresher_pid() == os.getpid()
+
+    election.release()
+    assert other.try_acquire()
+    other.release()
+
+
+def test_published_generation_is_attached_by_another_process(tmp_path, election):
+    publisher = dataset(tmp_path, election)
+    snapshot = publisher.publish(DF, LOGGER)
+
+    reader = dataset(tmp_path, RefresherElection(str(tmp_path)))
+    manifest = reader.read_manifest()
+    attached = reader.attach(manifest, LOGGER)
+
+    assert manifest["generation"] == snapshot.generation == attached.generation == 1
+    assert manifest["records"] == 3
+    assert attached.data.to_dict("list") == DF.to_dict("list")
+    result = attached.store.query("SELECT status, COUNT(*) AS n FROM df GROUP BY status ORDER BY status")
+    assert result.values.tolist() == [["Closed", 1], ["Open", 2]]
+
+
+def test_empty_publish_is_a_generation_without_files(tmp_path, election):
+    shared = dataset(tmp_path, election)
+    snapshot = shared.publish(pd.DataFrame(), LOGGER)
+    assert snapshot.generation == 1
+    assert snapshot.record_count == 0
+    assert sorted(os.listdir(tmp_path)) == ["tickets.json"]
+
+
+def test_old_generations_are_pruned(tmp_path, election, monkeypatch):
+    monkeypatch.setattr(shared_datasets, "SHARED_DATASET_KEEP_GENERATIONS", 2)
+    shared = dataset(tmp_path, election)
+    for _ in range(5):
+        shared.publish(DF, LOGGER)
+
+    files = sorted(name for name in os.listdir(tmp_path) if name.startswith("tickets-"))
+    assert files == ["tickets-4.arrow", "tickets-4.sqlite", "tickets-5.arrow", "tickets-5.sqlite"]
+    assert shared.read_manifest()["generation"] == 5
+
+
+def test_refresh_requests_are_handed_over_once(tmp_path, election):
+    follower = dataset(tmp_path, RefresherElection(str(tmp_path)))
+    refresher = dataset(tmp_path, election)
+    assert not refresher.take_refresh_request()
+
+    follower.request_refresh()
+    assert refresher.refresh_requested()
+    assert refresher.take_refresh_request()
+    assert not refresher.take_refresh_request()
+    assert not follower.refresh_requested()
+
+
+def test_follower_forwards_requests_and_takes_over_after_release(tmp_path, election, monkeypatch):
+    monkeypatch.setattr(shared_datasets, "SHARED_DATASET_POLL_SECONDS", 0.05)
+    assert election.try_acquire()
+    follower_election = RefresherElection(str(tmp_path))
+    handlers = [StubHandler(SharedDataset(str(tmp_path), name, follower_election, to_table)) for name in ("jira", "freshservice")]
+    # The current refresher publishes a Freshservice generation
+    SharedDataset(str(tmp_path), "freshservice", election, to_table).publish(DF, LOGGER)
+
+    coordinator = SharedRefreshCoordinator(LOGGER, *handlers, follower_election)
+    try:
+        assert coordinator.role == "follower"
+        assert wait_for(lambda: handlers[1].generation == 1)
+
+        assert "requested from the refresher" in coordinator.queue_jira_refresh()
+        status = coordinator.get_queue_status()
+        assert status["jira_queued"] and not status["freshservice_queued"]
+        assert status["role"] == "follower"
+
+        election.release()
+        assert wait_for(lambda: coordinator.role == "refresher")
+        assert coordinator.get_queue_status()["refresher_pid"] == os.getpid()
+        # The new refresher runs the initial loads and picks up the forwarded request
+        assert wait_for(lambda: handlers[0].refreshes.count(True) == 1)
+        assert not handlers[0].shared.refresh_requested()
+    finally:
+        coordinator.shutdown(timeout=5)
+    assert not follower_election.is_refresher
@@ -0,0 +1,101 @@
+"""Lazy startup: cheap route imports and the readiness endpoint."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import startup as startup_module
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(startup_module.__file__))
+
+
+def test_importing_the_routes_builds_nothing():
+    check = (
+        "import sys\n"
+        "import ai.routes as routes\n"
+        "assert routes._ai_service is None\n"
+        "loaded = [m for m in ('ai.service', 'ai.mcp_tools', 'mcp_handlers', 'langchain_anthropic') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    result = subprocess.run([sys.executable, "-c", check], cwd=BACKEND_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture
+def phases(monkeypatch):
+    """Replaces the startup phases with stand-ins; cache loads wait for ``gate``."""
+    gate = threading.Event()
+    calls = []
+
+    def phase(name, wait=False):
+        def run(*args):
+            calls.append(name)
+            if wait:
+                gate.wait(5)
+        return run
+
+    monkeypatch.setattr(startup_module, "_create_handlers", phase("handlers"))
+    monkeypatch.setattr(startup_module, "_load_cache", phase("cache", wait=True))
+    monkeypatch.setattr(startup_module, "_build_ai_service", phase("ai_service"))
+    monkeypatch.setattr(startup_module, "_prefetch_signing_keys", phase("auth_keys"))
+    monkeypatch.setattr(startup_module, "_start_refresh_workers", phase("refresh_workers"))
+    yield gate, calls
+    gate.set()
+
+
+def wait_for_status(client, code, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/api/ready")
+        if response.status_code == code or time.monotonic() > deadline:
+            return response
+        time.sleep(0.01)
+
+
+def test_ready_only_after_every_phase_finished(phases):
+    import main
+
+    gate, calls = phases
+    with TestClient(main.app) as client:
+        assert client.get("/api/health").json()["ready"] is False
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["phases"]["refresh_workers"]["status"] == "pending"
+
+        gate.set()
+        response = wait_for_status(client, 200)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True
+        assert all(phase["status"] == "done" for phase in body["phases"].values())
+        assert body["startup_ms"] is not None
+        assert calls[0] == "handlers" and calls[-1] == "refresh_workers"
+        assert client.get("/api/health").json()["ready"] is True
+
+
+def test_failed_phase_keeps_the_app_not_ready(phases, monkeypatch):
+    import main
+
+    gate, _ = phases
+    gate.set()
+
+    def broken():
+        raise RuntimeError("ANTHROPIC_API_KEY not found")
+
+    monkeypatch.setattr(startup_module, "_build_ai_service", broken)
+    with TestClient(main.app) as client:
+        deadline = time.monotonic() + 5
+        while client.get("/api/ready").json()["startup_ms"] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["phases"]["ai_service"] == {
+            **response.json()["phases"]["ai_service"],
+            "status": "failed",
+            "error": "ANTHROPIC_API_KEY not found",
+        }
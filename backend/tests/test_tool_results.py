@@ -0,0 +1,89 @@
+"""Query tool result shaping: row and byte budgets, paging and the result cache."""
+
+import json
+import logging
+
+import pandas as pd
+import pytest
+
+from ai import mcp_tools
+
+
+@pytest.fixture(autouse=True)
+def budgets(monkeypatch):
+    monkeypatch.setattr(mcp_tools, "TOOL_RESULT_MAX_ROWS", 10)
+    monkeypatch.setattr(mcp_tools, "TOOL_RESULT_MAX_BYTES", 2000)
+    monkeypatch.setattr(mcp_tools, "TOOL_RESULT_MAX_CELL_CHARS", 500)
+    monkeypatch.setattr(mcp_tools, "_result_cache", type(mcp_tools._result_cache)())
+    monkeypatch.setattr(mcp_tools, "logger", logging.getLogger("tamkeen.tools.test"))
+
+
+def shaped(df, **kwargs):
+    return json.loads(mcp_tools.shape_result(df, **kwargs))
+
+
+def fetch(result_id, offset):
+    return json.loads(mcp_tools.fetch_query_results.invoke({"result_id": result_id, "offset": offset}))
+
+
+def test_small_result_is_returned_whole():
+    payload = shaped(pd.DataFrame({"status": ["Open", "Closed"], "n": [2, 1]}))
+    assert payload["columns"] == ["status", "n"]
+    assert payload["rows"] == [["Open", 2], ["Closed", 1]]
+    assert "result_id" not in payload
+
+
+def test_pages_are_capped_by_rows():
+    payload = shaped(pd.DataFrame({"n": range(25)}))
+    assert payload["returned_rows"] == 10
+    assert payload["total_rows"] == 25
+    assert payload["next_offset"] == 10
+    assert payload["result_id"]
+
+
+def test_pages_are_capped_by_bytes():
+    payload = shaped(pd.DataFrame({"text": ["x" * 300] * 10}))
+    encoded = json.dumps(payload["columns"]) + "".join(json.dumps(row) + "," for row in payload["rows"])
+    assert 0 < payload["returned_rows"] < 10
+    assert len(encoded.encode("utf-8")) <= mcp_tools.TOOL_RESULT_MAX_BYTES
+    assert payload["next_offset"] == payload["returned_rows"]
+
+
+def test_a_wide_first_row_is_clipped_to_fit():
+    df = pd.DataFrame({f"field_{i}": ["y" * 400] for i in range(20)})
+    payload = shaped(df)
+    assert payload["returned_rows"] == 1
+    assert len(mcp_tools.shape_result(df).encode("utf-8")) < 2 * mcp_tools.TOOL_RESULT_MAX_BYTES
+    assert all(cell.endswith("…[truncated]") for cell in payload["rows"][0])
+
+
+def test_a_row_that_cannot_fit_asks_for_fewer_columns():
+    df = pd.DataFrame({f"field_{i}": [i] for i in range(400)})
+    payload = shaped(df)
+    assert "rows" not in payload
+    assert "fewer columns" in payload["error"]
+    assert payload["column_count"] == 400
+
+
+def test_fetch_query_results_pages_through_the_rest():
+    df = pd.DataFrame({"n": range(25)})
+    first = shaped(df)
+    seen = [row[0] for row in first["rows"]]
+    page = first
+    while "next_offset" in page:
+        page = fetch(first["result_id"], page["next_offset"])
+        assert page.get("result_id", first["result_id"]) == first["result_id"]
+        seen += [row[0] for row in page["rows"]]
+    assert seen == list(range(25))
+
+
+def test_cached_results_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mcp_tools.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(mcp_tools, "RESULT_CACHE_TTL_SECONDS", 60)
+    result_id = shaped(pd.DataFrame({"n": range(25)}))["result_id"]
+
+    now[0] += 59
+    assert fetch(result_id, 10)["returned_rows"] == 10
+    now[0] += 2
+    assert "expired" in fetch(result_id, 10)["error"]
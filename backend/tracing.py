@@ -0,0 +1,154 @@
+"""Opt-in per-request timing traces.
+
+A chat request is traced when it asks for it (``"trace": true`` in the body or
+an ``X-Trace: 1`` header) or when ``TRACE_ALL=on``. The trace is a tree of
+spans: model rounds, tool calls (with an args hash and the result size), SQL
+execution inside the handlers and SSE emission. Requests that asked for it get
+the tree, with token usage, as a final ``{"type": "trace"}`` SSE event (or the
+``trace`` field of ``/api/chat``); with ``TRACE_FILE`` set every trace is also
+appended to that file as one JSON line for offline analysis.
+
+The active trace and span live in context variables, so spans opened in tool
+threads (which run in a copy of the request's context) and in the handlers
+attach to the right request without passing anything around. Without an
+active trace, ``span()`` does nothing.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+# Trace every request (the SSE event is still only sent to clients that ask for it)
+TRACE_ALL = os.getenv("TRACE_ALL", "off").lower() in ("1", "true", "on", "yes")
+# JSONL file that receives every finished trace; empty disables
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+_file_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(self, trace: "Trace", name: str, attrs: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        self.children: List["Span"] = []
+
+    def set(self, **attrs: Any):
+        """Add attributes to the span."""
+        self.attrs.update(attrs)
+
+    def child(self, name: str, **attrs: Any) -> "Span":
+        """Start a child span; call ``end()`` on it when the operation finishes."""
+        span = Span(self.trace, name, attrs)
+        with self.trace.lock:
+            self.children.append(span)
+        return span
+
+    def end(self):
+        if self.ended is None:
+            self.ended = time.perf_counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        origin = self.trace.root.started
+        ended = self.ended if self.ended is not None else time.perf_counter()
+        with self.trace.lock:
+            children = list(self.children)
+        node = {
+            "name": self.name,
+            "start_ms": round((self.started - origin) * 1000, 3),
+            "duration_ms": round((ended - self.started) * 1000, 3),
+        }
+        if self.attrs:
+            node["attrs"] = self.attrs
+        if children:
+            node["children"] = [child.as_dict() for child in sorted(children, key=lambda span: span.started)]
+        return node
+
+
+class Trace:
+    """Span tree of one request."""
+
+    def __init__(self, name: str, **attrs: Any):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self.lock = threading.Lock()
+        self.root = Span(self, name, attrs)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"trace_id": self.trace_id, "created_at": self.created_at, "root": self.root.as_dict()}
+
+
+def trace_requested(flag: Optional[bool], header: Optional[str]) -> bool:
+    """Return True if a request asked for its trace via the body flag or the ``X-Trace`` header."""
+    return bool(flag) or (header or "").strip().lower() in ("1", "true", "on", "yes")
+
+
+def start_trace(name: str, **attrs: Any) -> Trace:
+    """Start a trace and make it (and its root span) current in this context."""
+    trace = Trace(name, **attrs)
+    _current_span.set(trace.root)
+    return trace
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span of the active trace, or None when not tracing."""
+    return _current_span.get()
+
+
+def start_span(name: str, **attrs: Any) -> Optional[Span]:
+    """Start a child of the current span without making it current (for spans across ``yield``)."""
+    parent = _current_span.get()
+    return parent.child(name, **attrs) if parent is not None else None
+
+
+def annotate(**attrs: Any):
+    """Add attributes to the current span, if tracing."""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time the ``with`` block as a child of the current span (no-op without a trace)."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attrs)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end()
+        _current_span.reset(token)
+
+
+def args_hash(args: Any) -> str:
+    """Short stable hash of tool arguments, to group identical calls without logging them."""
+    encoded = json.dumps(args, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def finish_trace(trace: Trace) -> Dict[str, Any]:
+    """End the trace, append it to ``TRACE_FILE`` if configured and return it as a dict."""
+    trace.root.end()
+    payload = trace.as_dict()
+    if TRACE_FILE:
+        line = json.dumps(payload, default=str, ensure_ascii=False)
+        with _file_lock:
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    return payload